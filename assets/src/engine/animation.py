@@ -0,0 +1,33 @@
+import pygame
+
+from typing import Sequence
+
+
+class AnimationClip:
+    def __init__(self, frames: Sequence[pygame.Surface], frame_duration: float, loop: bool = True):
+        """A sequence of (already scaled) frames that is shared between all `Animation Component`s that play it.
+
+        Params:
+            frames (Sequence[pygame.Surface]): The frames of the clip.
+            frame_duration (float): How long each frame is shown, in seconds.
+            loop (bool): If `False` the clip stops on its last frame.
+        """
+        assert len(frames) > 0
+        self.frames = tuple(frames)
+        self.frame_duration = frame_duration
+        self.loop = loop
+        self._flipped_frames: tuple[pygame.Surface, ...] | None = None
+
+    def get_frame_count(self) -> int:
+        return len(self.frames)
+
+    def get_duration(self) -> float:
+        return len(self.frames) * self.frame_duration
+
+    def get_frames(self, flip_x: bool = False) -> tuple[pygame.Surface, ...]:
+        """Get the frames, or their horizontally flipped copies. The flipped copies are created once, on first use."""
+        if not flip_x:
+            return self.frames
+        if self._flipped_frames is None:
+            self._flipped_frames = tuple(pygame.transform.flip(frame, True, False) for frame in self.frames)
+        return self._flipped_frames
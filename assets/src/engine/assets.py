@@ -1,22 +1,180 @@
+import os
 import pygame
 import pathlib
+import threading
+from collections import OrderedDict
 from engine.color import Color
 from engine.graphics import Graphics
 
+from typing import Iterable
+
+
+ImageKey = tuple[str, tuple[int, int, int, int] | None, float]  # (absolute path, colorkey, graphics scale)
+
+
+class ImageCacheEntry:
+    __slots__ = ("surface", "ref_count", "byte_size")
+
+    def __init__(self, surface: pygame.Surface):
+        self.surface = surface
+        self.ref_count = 0
+        self.byte_size = surface.get_pitch() * surface.get_height()
+
+
+class ImageCacheStats:
+    def __init__(self, hits: int, misses: int, evictions: int, entries: int, byte_size: int, byte_budget: int):
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.entries = entries
+        self.byte_size = byte_size
+        self.byte_budget = byte_budget
+
+    def __str__(self):
+        return (f"[ImageCacheStats: hits={self.hits} | misses={self.misses} | evictions={self.evictions} | "
+                f"entries={self.entries} | bytes={self.byte_size}/{self.byte_budget}]")
+
 
 class Assets:
+    """The image cache can be used from worker threads (see `Streaming`). Images are decoded outside of the lock."""
+    _lock = threading.RLock()
+    _image_cache: "OrderedDict[ImageKey, ImageCacheEntry]" = OrderedDict()  # Least recently used first
+    _image_cache_bytes = 0
+    _image_cache_budget = 64 * 1024 * 1024
+    _image_cache_hits = 0
+    _image_cache_misses = 0
+    _image_cache_evictions = 0
+
+    @staticmethod
+    def init(image_cache_budget: int):
+        """
+        Params:
+            image_cache_budget (int): The size in bytes above which unreferenced images are evicted from the cache.
+        """
+        Assets._image_cache_budget = image_cache_budget
+
     @staticmethod
-    def load_image(path: str | pathlib.Path, colorkey: Color | None = None) -> pygame.Surface:
+    def load_image(path: str | pathlib.Path, colorkey: Color | None = None, take_reference: bool = False) -> pygame.Surface:
         """
         Load an image as a Pygame Surface with fast blitting and optional transparency.
 
+        Images are cached by (path, colorkey, `Graphics.scale`), so loading the same image again returns the same Surface.
+        Do not modify the returned Surface. Unreferenced images are evicted when the cache is over its budget.
+        The returned Surface stays valid after that, but loading the image again decodes it again.
+
         Args:
             path: File path to the image.
             colorkey: Optional color to treat as transparent in addition to any alpha channel.
+            take_reference: Keep the image cached until the reference is given back with `release_image()`,
+                e.g. from the teardown of the level that uses it.
 
         Returns:
             pygame.Surface ready for blitting
         """
+        entry = Assets._get_cache_entry(path, colorkey, take_reference)
+        with Assets._lock:
+            Assets._evict_unreferenced_images()
+        return entry.surface
+
+    @staticmethod
+    def load_images(directory: str | pathlib.Path, colorkey: Color | None = None, take_reference: bool = False) -> list[pygame.Surface]:
+        """
+        Load all images in a directory, sorted by file name.
+
+        Args:
+            directory: Path to the directory.
+            colorkey: Optional color to treat as transparent in addition to any alpha channel.
+            take_reference: Take a reference to each image, see `load_image()`.
+
+        Returns:
+            list of pygame.Surface ready for blitting
+        """
+        paths = sorted(pathlib.Path(directory).glob("*.png"))
+        return [Assets.load_image(path, colorkey, take_reference) for path in paths]
+
+    @staticmethod
+    def preload_images(paths: Iterable[str | pathlib.Path], colorkey: Color | None = None):
+        """
+        Decode images into the cache without taking references, e.g. during a level load.
+        They stay cached until they are evicted to stay within the cache budget.
+        """
+        for path in paths:
+            Assets._get_cache_entry(path, colorkey, take_reference=False)
+        with Assets._lock:
+            Assets._evict_unreferenced_images()
+
+    @staticmethod
+    def release_image(path: str | pathlib.Path, colorkey: Color | None = None):
+        """Give back a reference taken by `load_image(take_reference=True)`. Unreferenced images can be evicted from the cache."""
+        with Assets._lock:
+            entry = Assets._image_cache[Assets._get_image_key(path, colorkey)]
+            assert entry.ref_count > 0
+            entry.ref_count -= 1
+            if entry.ref_count == 0:
+                Assets._evict_unreferenced_images()
+
+    @staticmethod
+    def clear_image_cache():
+        """Evict all unreferenced images"""
+        with Assets._lock:
+            for key in [key for key, entry in Assets._image_cache.items() if entry.ref_count == 0]:
+                Assets._evict_image(key)
+
+    @staticmethod
+    def get_image_cache_stats() -> ImageCacheStats:
+        with Assets._lock:
+            return ImageCacheStats(Assets._image_cache_hits, Assets._image_cache_misses, Assets._image_cache_evictions,
+                                   len(Assets._image_cache), Assets._image_cache_bytes, Assets._image_cache_budget)
+
+    @staticmethod
+    def _get_image_key(path: str | pathlib.Path, colorkey: Color | None) -> ImageKey:
+        return (os.path.abspath(path), tuple(colorkey) if colorkey is not None else None, Graphics.scale)
+
+    @staticmethod
+    def _get_cache_entry(path: str | pathlib.Path, colorkey: Color | None, take_reference: bool) -> ImageCacheEntry:
+        key = Assets._get_image_key(path, colorkey)
+        with Assets._lock:
+            entry = Assets._image_cache.get(key)
+            if entry is not None:
+                Assets._image_cache_hits += 1
+                Assets._image_cache.move_to_end(key)
+                entry.ref_count += take_reference
+                return entry
+
+        surface = Assets._decode_image(path, colorkey)
+        with Assets._lock:
+            entry = Assets._image_cache.get(key)
+            if entry is not None:
+                # Another thread decoded the same image in the meantime
+                Assets._image_cache_hits += 1
+                entry.ref_count += take_reference
+                return entry
+
+            Assets._image_cache_misses += 1
+            entry = ImageCacheEntry(surface)
+            entry.ref_count += take_reference
+            Assets._image_cache[key] = entry
+            Assets._image_cache_bytes += entry.byte_size
+            return entry
+
+    @staticmethod
+    def _evict_unreferenced_images():
+        if Assets._image_cache_bytes <= Assets._image_cache_budget:
+            return
+
+        for key in [key for key, entry in Assets._image_cache.items() if entry.ref_count == 0]:
+            Assets._evict_image(key)
+            if Assets._image_cache_bytes <= Assets._image_cache_budget:
+                break
+
+    @staticmethod
+    def _evict_image(key: ImageKey):
+        entry = Assets._image_cache.pop(key)
+        Assets._image_cache_bytes -= entry.byte_size
+        Assets._image_cache_evictions += 1
+
+    @staticmethod
+    def _decode_image(path: str | pathlib.Path, colorkey: Color | None) -> pygame.Surface:
         image = pygame.image.load(path)
 
         if image.get_alpha() is not None:
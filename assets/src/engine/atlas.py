@@ -0,0 +1,147 @@
+import json
+import pygame
+import pathlib
+from engine.color import Color
+from engine.graphics import Graphics
+
+from typing import Any
+
+
+ATLAS_VERSION = 1
+ATLAS_PAGE_SIZE = 1024
+ATLAS_PADDING = 1  # Transparent pixels between packed images
+
+
+class SpriteAtlas:
+    def __init__(self, pages: list[pygame.Surface], regions: dict[str, tuple[int, pygame.Rect]]):
+        """A set of large pages that contain many small pre-scaled images.
+
+        Images are looked up by their path relative to the atlas root, without the file extension
+        (e.g. `"entities/player/idle/00"`), and are returned as subsurfaces of the pages.
+        """
+        self._pages = pages
+        self._images: dict[str, pygame.Surface] = dict()
+        self._folders: dict[str, list[pygame.Surface]] = dict()
+        for key in sorted(regions):
+            page_index, rect = regions[key]
+            image = pages[page_index].subsurface(rect)
+            self._images[key] = image
+            folder = key.rpartition("/")[0]
+            self._folders.setdefault(folder, list()).append(image)
+
+    def get_image(self, key: str) -> pygame.Surface:
+        return self._images[key]
+
+    def get_images(self, folder: str) -> list[pygame.Surface]:
+        """Get the images in a folder, sorted by file name"""
+        return self._folders[folder]
+
+    def get_page_count(self) -> int:
+        return len(self._pages)
+
+    @staticmethod
+    def build(name: str, root: str | pathlib.Path, folders: dict[str, Color | None], cache_dir: str | pathlib.Path) -> "SpriteAtlas":
+        """
+        Pack the PNG images of the given folders into atlas pages, or load the pages from the cache
+        if none of the source files changed and `Graphics.scale` is the same.
+
+        Args:
+            name: The name of the atlas. Used for the cache file names.
+            root: The directory the folders are relative to.
+            folders: The folders to pack (relative to `root`), with an optional colorkey for each.
+            cache_dir: The directory where the packed pages and their index are stored.
+
+        Returns:
+            SpriteAtlas
+        """
+        root = pathlib.Path(root)
+        cache_dir = pathlib.Path(cache_dir)
+
+        sources: dict[str, pathlib.Path] = dict()
+        colorkeys: dict[str, Color | None] = dict()
+        for folder, colorkey in folders.items():
+            for path in sorted(root.joinpath(folder).glob("*.png")):
+                key = path.relative_to(root).with_suffix("").as_posix()
+                sources[key] = path
+                colorkeys[key] = colorkey
+
+        signature = {
+            "version": ATLAS_VERSION,
+            "scale": Graphics.scale,
+            "sources": {key: [path.stat().st_mtime_ns, SpriteAtlas._colorkey_to_json(colorkeys[key])] for key, path in sources.items()},
+        }
+
+        index_path = cache_dir.joinpath(f"{name}.json")
+        if index_path.exists():
+            with open(index_path, "r") as file_stream:
+                index = json.load(file_stream)
+            if index["signature"] == signature:
+                return SpriteAtlas._load(name, cache_dir, index)
+
+        atlas, index = SpriteAtlas._pack(sources, colorkeys)
+        index["signature"] = signature
+        SpriteAtlas._save(name, cache_dir, atlas._pages, index)
+        return atlas
+
+    @staticmethod
+    def _pack(sources: dict[str, pathlib.Path], colorkeys: dict[str, Color | None]) -> tuple["SpriteAtlas", dict[str, Any]]:
+        images: dict[str, pygame.Surface] = dict()
+        for key, path in sources.items():
+            image = pygame.image.load(path)
+            if colorkeys[key] is not None:
+                image.set_colorkey(colorkeys[key])
+            image = image.convert_alpha()
+            if Graphics.scale != 1.0:
+                image = pygame.transform.scale_by(image, Graphics.scale)
+            images[key] = image
+
+        # Shelf packing: tallest images first, left to right in rows
+        pages: list[pygame.Surface] = list()
+        regions: dict[str, tuple[int, pygame.Rect]] = dict()
+        x = y = shelf_height = 0
+        for key in sorted(images, key=lambda key: images[key].get_height(), reverse=True):
+            width, height = images[key].get_size()
+            if width > ATLAS_PAGE_SIZE or height > ATLAS_PAGE_SIZE:
+                raise ValueError(f"Image is larger than an atlas page: {sources[key]}")
+
+            if x + width > ATLAS_PAGE_SIZE:
+                x = 0
+                y += shelf_height + ATLAS_PADDING
+                shelf_height = 0
+            if not pages or y + height > ATLAS_PAGE_SIZE:
+                page = pygame.Surface((ATLAS_PAGE_SIZE, ATLAS_PAGE_SIZE), pygame.SRCALPHA).convert_alpha()
+                page.fill(Color.none())
+                pages.append(page)
+                x = y = shelf_height = 0
+
+            rect = pygame.Rect(x, y, width, height)
+            pages[-1].blit(images[key], rect)
+            regions[key] = (len(pages) - 1, rect)
+            x += width + ATLAS_PADDING
+            shelf_height = max(shelf_height, height)
+
+        # Crop the last page to the used area
+        last_page_height = y + shelf_height
+        if pages and last_page_height < ATLAS_PAGE_SIZE:
+            pages[-1] = pages[-1].subsurface((0, 0, ATLAS_PAGE_SIZE, last_page_height)).copy()
+
+        index = {"pages": len(pages), "regions": {key: [page_index, *rect] for key, (page_index, rect) in regions.items()}}
+        return SpriteAtlas(pages, regions), index
+
+    @staticmethod
+    def _load(name: str, cache_dir: pathlib.Path, index: dict[str, Any]) -> "SpriteAtlas":
+        pages = [pygame.image.load(cache_dir.joinpath(f"{name}_{i}.png")).convert_alpha() for i in range(index["pages"])]
+        regions = {key: (region[0], pygame.Rect(region[1:])) for key, region in index["regions"].items()}
+        return SpriteAtlas(pages, regions)
+
+    @staticmethod
+    def _save(name: str, cache_dir: pathlib.Path, pages: list[pygame.Surface], index: dict[str, Any]):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for i, page in enumerate(pages):
+            pygame.image.save(page, cache_dir.joinpath(f"{name}_{i}.png"))
+        with open(cache_dir.joinpath(f"{name}.json"), "w") as file_stream:
+            json.dump(index, file_stream)
+
+    @staticmethod
+    def _colorkey_to_json(colorkey: Color | None) -> list[int] | None:
+        return list(colorkey) if colorkey is not None else None
@@ -0,0 +1,172 @@
+import pygame
+import pathlib
+
+
+class SoundBankEntry:
+    __slots__ = ("sound", "voice_limit", "volume", "voices")
+
+    def __init__(self, sound: pygame.mixer.Sound, voice_limit: int, volume: float):
+        self.sound = sound
+        self.voice_limit = voice_limit
+        self.volume = volume
+        self.voices: list[pygame.mixer.Channel] = list()  # The channels playing the sound, oldest first
+
+
+class AudioStats:
+    def __init__(self, active_voices: int, channels: int, sounds: int, plays: int, merged: int, stolen: int, dropped: int):
+        self.active_voices = active_voices
+        self.channels = channels
+        self.sounds = sounds
+        self.plays = plays
+        self.merged = merged
+        self.stolen = stolen
+        self.dropped = dropped
+
+    def __str__(self):
+        return (f"[AudioStats: voices={self.active_voices}/{self.channels} | sounds={self.sounds} | plays={self.plays} | "
+                f"merged={self.merged} | stolen={self.stolen} | dropped={self.dropped}]")
+
+
+class Audio:
+    """Plays the sounds of a bank that is decoded up front, on a fixed pool of mixer channels.
+
+    `play()` only records a request. The requests are resolved once per frame, so plays of the same sound
+    in the same frame are merged into one voice. Each sound has a voice limit: when it is reached, the sound's
+    oldest voice is restarted instead of taking another channel. When all channels are busy the play is dropped.
+    If the mixer is not available (e.g. no audio device), all plays are ignored.
+    """
+    enabled: bool
+    default_voice_limit: int
+
+    _channels: list[pygame.mixer.Channel] = list()
+    _sound_bank: dict[str, SoundBankEntry] = dict()
+    _play_requests: dict[str, float] = dict()  # Sound name -> volume, for the current frame
+    _play_count = 0
+    _merged_count = 0
+    _stolen_count = 0
+    _dropped_count = 0
+
+    @staticmethod
+    def init(channel_count: int, default_voice_limit: int, buffer_size: int):
+        """
+        Params:
+            channel_count (int): The size of the channel pool, i.e. the max number of voices.
+            default_voice_limit (int): The max number of voices of a sound, unless set when it is loaded.
+            buffer_size (int): The mixer buffer size in samples. Smaller buffers lower the latency.
+        """
+        Audio.default_voice_limit = default_voice_limit
+        Audio._sound_bank = dict()
+        Audio._play_requests = dict()
+        try:
+            pygame.mixer.quit()
+            pygame.mixer.init(buffer=buffer_size)
+        except pygame.error:
+            Audio.enabled = False
+            Audio._channels = list()
+            return
+
+        Audio.enabled = True
+        pygame.mixer.set_num_channels(channel_count)
+        Audio._channels = [pygame.mixer.Channel(i) for i in range(channel_count)]
+
+    @staticmethod
+    def load_sound(name: str, path: str | pathlib.Path, voice_limit: int | None = None, volume: float = 1.0):
+        """
+        Decode a sound into the bank. Loading a name again replaces the sound.
+
+        Args:
+            name: The name the sound is played by.
+            path: File path to the sound.
+            voice_limit: The max number of voices of the sound. Defaults to `default_voice_limit`.
+            volume: The volume of the sound, multiplied with the volume of each play.
+        """
+        if not Audio.enabled:
+            return
+        voice_limit = voice_limit if voice_limit is not None else Audio.default_voice_limit
+        Audio._sound_bank[name] = SoundBankEntry(pygame.mixer.Sound(path), voice_limit, volume)
+
+    @staticmethod
+    def load_sounds(directory: str | pathlib.Path, voice_limit: int | None = None):
+        """
+        Decode all .wav and .ogg files in a directory into the bank, named by their file name without the extension.
+
+        Args:
+            directory: Path to the directory.
+            voice_limit: The max number of voices of each sound. Defaults to `default_voice_limit`.
+        """
+        for path in sorted(pathlib.Path(directory).iterdir()):
+            if path.suffix in (".wav", ".ogg"):
+                Audio.load_sound(path.stem, path, voice_limit)
+
+    @staticmethod
+    def has_sound(name: str) -> bool:
+        return name in Audio._sound_bank
+
+    @staticmethod
+    def play(name: str, volume: float = 1.0):
+        """Play a sound of the bank at the end of the frame. Plays of the same sound in a frame are merged
+        into one, at the loudest of their volumes."""
+        if not Audio.enabled:
+            return
+        if name not in Audio._sound_bank:
+            raise KeyError(f"Sound not loaded: {name}")
+
+        previous_volume = Audio._play_requests.get(name)
+        if previous_volume is None:
+            Audio._play_requests[name] = volume
+        else:
+            Audio._play_requests[name] = max(previous_volume, volume)
+            Audio._merged_count += 1
+
+    @staticmethod
+    def stop(name: str):
+        """Stop all voices of a sound"""
+        entry = Audio._sound_bank.get(name)
+        if entry is None:
+            return
+        for channel in entry.voices:
+            if channel.get_sound() is entry.sound:
+                channel.stop()
+        entry.voices.clear()
+        Audio._play_requests.pop(name, None)
+
+    @staticmethod
+    def get_active_voice_count() -> int:
+        return sum(channel.get_busy() for channel in Audio._channels)
+
+    @staticmethod
+    def get_stats() -> AudioStats:
+        return AudioStats(Audio.get_active_voice_count(), len(Audio._channels), len(Audio._sound_bank),
+                          Audio._play_count, Audio._merged_count, Audio._stolen_count, Audio._dropped_count)
+
+    @staticmethod
+    def _tick():
+        """Resolve the play requests of the frame"""
+        if not Audio._play_requests:
+            return
+
+        for name, volume in Audio._play_requests.items():
+            entry = Audio._sound_bank[name]
+            entry.voices = [channel for channel in entry.voices if channel.get_busy() and channel.get_sound() is entry.sound]
+            if len(entry.voices) >= entry.voice_limit:
+                channel = entry.voices.pop(0)  # Restart the oldest voice
+                Audio._stolen_count += 1
+            else:
+                channel = Audio._find_free_channel()
+                if channel is None:
+                    Audio._dropped_count += 1
+                    continue
+
+            channel.set_volume(entry.volume * volume)
+            channel.play(entry.sound)
+            entry.voices.append(channel)
+            Audio._play_count += 1
+
+        Audio._play_requests.clear()
+
+    @staticmethod
+    def _find_free_channel() -> pygame.mixer.Channel | None:
+        for channel in Audio._channels:
+            if not channel.get_busy():
+                return channel
+        return None
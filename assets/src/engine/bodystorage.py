@@ -0,0 +1,104 @@
+import numpy as np
+from engine.math import Vec2
+
+
+class BodyStorage:
+    """Structure-of-arrays storage for the state of rigid bodies, used by the vectorized physics mode.
+
+    Each rigid body in play owns a slot (a row) in the position, velocity and acceleration arrays.
+    The whole used range is integrated in one batched operation, masked so that only the bodies of ticking entities move,
+    like in scalar mode. Free slots are zeroed and not ticking.
+    """
+    snapshot_fields = ("_positions", "_prev_positions", "_velocities", "_accelerations")
+
+    enabled: bool
+
+    _positions: np.ndarray
+    _prev_positions: np.ndarray
+    _velocities: np.ndarray
+    _accelerations: np.ndarray
+    _ticking: np.ndarray  # Whether the entity of a slot is ticking, as a `(capacity, 1)` bool column
+    _size: int  # Number of rows in use, including free slots below the highest allocated one
+    _free_slots: set[int]  # A set, so that shrinking the used range checks membership in constant time
+    _moved_slots: np.ndarray  # The slots moved by the last integration, taken by the `Broadphase`
+
+    @staticmethod
+    def init(enabled: bool, capacity: int = 256):
+        BodyStorage.enabled = enabled
+        BodyStorage._positions = np.zeros((capacity, 2))
+        BodyStorage._prev_positions = np.zeros((capacity, 2))
+        BodyStorage._velocities = np.zeros((capacity, 2))
+        BodyStorage._accelerations = np.zeros((capacity, 2))
+        BodyStorage._ticking = np.zeros((capacity, 1), dtype=bool)
+        BodyStorage._size = 0
+        BodyStorage._free_slots = set()
+        BodyStorage._moved_slots = np.zeros(0, dtype=np.intp)
+
+    @staticmethod
+    def get_body_count() -> int:
+        return BodyStorage._size - len(BodyStorage._free_slots)
+
+    @staticmethod
+    def _allocate(position: Vec2, prev_position: Vec2, is_ticking: bool) -> int:
+        if BodyStorage._free_slots:
+            slot = BodyStorage._free_slots.pop()
+        else:
+            if BodyStorage._size == len(BodyStorage._positions):
+                BodyStorage._grow()
+            slot = BodyStorage._size
+            BodyStorage._size += 1
+
+        BodyStorage._positions[slot] = position
+        BodyStorage._prev_positions[slot] = prev_position
+        BodyStorage._ticking[slot] = is_ticking
+        return slot
+
+    @staticmethod
+    def _set_ticking(slot: int, is_ticking: bool):
+        BodyStorage._ticking[slot] = is_ticking
+
+    @staticmethod
+    def _free(slot: int):
+        BodyStorage._positions[slot] = 0.0
+        BodyStorage._prev_positions[slot] = 0.0
+        BodyStorage._velocities[slot] = 0.0
+        BodyStorage._accelerations[slot] = 0.0
+        BodyStorage._ticking[slot] = False
+        BodyStorage._free_slots.add(slot)
+
+        # Shrink the used range, so that trailing free slots are not integrated
+        free_slots = BodyStorage._free_slots
+        while BodyStorage._size > 0 and (BodyStorage._size - 1) in free_slots:
+            BodyStorage._size -= 1
+            free_slots.remove(BodyStorage._size)
+
+    @staticmethod
+    def _grow():
+        capacity = len(BodyStorage._positions) * 2
+        for name in ("_positions", "_prev_positions", "_velocities", "_accelerations", "_ticking"):
+            array = np.zeros((capacity, getattr(BodyStorage, name).shape[1]), dtype=getattr(BodyStorage, name).dtype)
+            array[:BodyStorage._size] = getattr(BodyStorage, name)[:BodyStorage._size]
+            setattr(BodyStorage, name, array)
+
+    @staticmethod
+    def _store_prev_positions():
+        """Called at the start of each physics tick, so that rendering can interpolate from the previous tick"""
+        size = BodyStorage._size
+        np.copyto(BodyStorage._prev_positions[:size], BodyStorage._positions[:size], where=BodyStorage._ticking[:size])
+
+    @staticmethod
+    def _integrate(fixed_delta_time: float):
+        """Semi-implicit Euler integration of the bodies of the ticking entities"""
+        size = BodyStorage._size
+        ticking = BodyStorage._ticking[:size]
+        velocities = BodyStorage._velocities[:size]
+        positions = BodyStorage._positions[:size]
+        np.add(velocities, BodyStorage._accelerations[:size] * fixed_delta_time, out=velocities, where=ticking)
+        np.add(positions, velocities * fixed_delta_time, out=positions, where=ticking)
+        BodyStorage._moved_slots = np.flatnonzero(ticking[:, 0] & velocities.any(axis=1))
+
+    @staticmethod
+    def _take_moved_slots() -> np.ndarray:
+        moved_slots = BodyStorage._moved_slots
+        BodyStorage._moved_slots = np.zeros(0, dtype=np.intp)
+        return moved_slots
@@ -0,0 +1,206 @@
+import pygame
+from engine.math import Vec2
+from engine.events import EventHook
+from engine.bodystorage import BodyStorage
+
+from typing import Generic, Hashable, Iterable, TypeVar, TYPE_CHECKING
+if TYPE_CHECKING:
+    from engine.components import RigidBodyComponent
+
+
+TItem = TypeVar("TItem", bound=Hashable)
+CellRange = tuple[int, int, int, int]  # (min_x, min_y, max_x, max_y), inclusive
+
+
+class SpatialHash(Generic[TItem]):
+    def __init__(self, cell_size: float):
+        """A uniform grid that buckets items by the cells their rects overlap.
+
+        Params:
+            cell_size (float): The size of a grid cell in world space. Should be around the size of a typical item.
+        """
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], list[TItem]] = dict()
+        self._rects: dict[TItem, pygame.FRect] = dict()
+        self._cell_ranges: dict[TItem, CellRange] = dict()
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __contains__(self, item: TItem) -> bool:
+        return item in self._rects
+
+    def insert(self, item: TItem, rect: pygame.FRect):
+        cell_range = self._get_cell_range(rect)
+        self._rects[item] = rect
+        self._cell_ranges[item] = cell_range
+        self._add_to_cells(item, cell_range)
+
+    def remove(self, item: TItem):
+        self._remove_from_cells(item, self._cell_ranges.pop(item))
+        del self._rects[item]
+
+    def update(self, item: TItem, rect: pygame.FRect):
+        """Update the rect of an item. The item is re-bucketed only if the range of cells it overlaps has changed."""
+        self._rects[item] = rect
+        cell_range = self._get_cell_range(rect)
+        prev_cell_range = self._cell_ranges[item]
+        if cell_range != prev_cell_range:
+            self._remove_from_cells(item, prev_cell_range)
+            self._add_to_cells(item, cell_range)
+            self._cell_ranges[item] = cell_range
+
+    def get_rect(self, item: TItem) -> pygame.FRect:
+        return self._rects[item]
+
+    def query_aabb(self, rect: pygame.FRect | pygame.Rect) -> list[TItem]:
+        """Get the items whose rects overlap `rect`"""
+        result: list[TItem] = list()
+        seen: set[TItem] = set()
+        min_x, min_y, max_x, max_y = self._get_cell_range(rect)
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                cell = self._cells.get((cell_x, cell_y))
+                if cell is None:
+                    continue
+                for item in cell:
+                    if item not in seen:
+                        seen.add(item)
+                        if self._rects[item].colliderect(rect):
+                            result.append(item)
+        return result
+
+    def query_point(self, point: Vec2 | tuple[float, float]) -> list[TItem]:
+        """Get the items whose rects contain `point`"""
+        cell = self._cells.get((int(point[0] // self.cell_size), int(point[1] // self.cell_size)))
+        if cell is None:
+            return list()
+        return [item for item in cell if self._rects[item].collidepoint(point)]
+
+    def get_overlapping_pairs(self) -> list[tuple[TItem, TItem]]:
+        """Get all pairs of items whose rects overlap. Each pair is reported once."""
+        pairs: list[tuple[TItem, TItem]] = list()
+        seen: set[tuple[int, int]] = set()
+        for cell in self._cells.values():
+            count = len(cell)
+            if count < 2:
+                continue
+            for i in range(count - 1):
+                item_a = cell[i]
+                rect_a = self._rects[item_a]
+                for j in range(i + 1, count):
+                    item_b = cell[j]
+                    if not rect_a.colliderect(self._rects[item_b]):
+                        continue
+                    key = (id(item_a), id(item_b)) if id(item_a) < id(item_b) else (id(item_b), id(item_a))
+                    if key not in seen:
+                        seen.add(key)
+                        pairs.append((item_a, item_b))
+        return pairs
+
+    def clear(self):
+        self._cells.clear()
+        self._rects.clear()
+        self._cell_ranges.clear()
+
+    def _get_cell_range(self, rect: pygame.FRect | pygame.Rect) -> CellRange:
+        cell_size = self.cell_size
+        return (int(rect.left // cell_size), int(rect.top // cell_size),
+                int(rect.right // cell_size), int(rect.bottom // cell_size))
+
+    def _add_to_cells(self, item: TItem, cell_range: CellRange):
+        min_x, min_y, max_x, max_y = cell_range
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                cell = self._cells.get((cell_x, cell_y))
+                if cell is None:
+                    cell = self._cells[(cell_x, cell_y)] = list()
+                cell.append(item)
+
+    def _remove_from_cells(self, item: TItem, cell_range: CellRange):
+        min_x, min_y, max_x, max_y = cell_range
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                cell = self._cells[(cell_x, cell_y)]
+                cell.remove(item)
+                if not cell:
+                    del self._cells[(cell_x, cell_y)]
+
+
+class Broadphase:
+    """Tracks the rigid bodies in play in a `SpatialHash`.
+
+    Only the bodies that moved since the last physics tick are re-bucketed: a `TransformComponent` marks the bodies
+    of its `Entity` when its position is set, and the vectorized integration reports the slots it moved.
+    """
+    on_overlap = EventHook()  # Invoked with (body_a, body_b) for each overlapping pair after every physics tick
+
+    _spatial_hash: "SpatialHash[RigidBodyComponent]"
+    _moved_bodies: "dict[RigidBodyComponent, None]"  # An insertion-ordered set
+    _bodies_by_slot: "dict[int, RigidBodyComponent]"  # The bodies that live in a `BodyStorage` slot
+
+    @staticmethod
+    def init(cell_size: float):
+        Broadphase._spatial_hash = SpatialHash(cell_size)
+        Broadphase._moved_bodies = dict()
+        Broadphase._bodies_by_slot = dict()
+
+    @staticmethod
+    def query_aabb(rect: pygame.FRect | pygame.Rect) -> "list[RigidBodyComponent]":
+        """Get the rigid bodies that overlap `rect` (world space)"""
+        return Broadphase._spatial_hash.query_aabb(rect)
+
+    @staticmethod
+    def query_point(point: Vec2 | tuple[float, float]) -> "list[RigidBodyComponent]":
+        """Get the rigid bodies that contain `point` (world space)"""
+        return Broadphase._spatial_hash.query_point(point)
+
+    @staticmethod
+    def get_bodies() -> "Iterable[RigidBodyComponent]":
+        return Broadphase._spatial_hash._rects.keys()
+
+    @staticmethod
+    def _add_body(body: "RigidBodyComponent"):
+        Broadphase._spatial_hash.insert(body, body.get_rect())
+        if body._body_slot is not None:
+            Broadphase._bodies_by_slot[body._body_slot] = body
+
+    @staticmethod
+    def _remove_body(body: "RigidBodyComponent"):
+        Broadphase._spatial_hash.remove(body)
+        Broadphase._moved_bodies.pop(body, None)
+        if body._body_slot is not None:
+            del Broadphase._bodies_by_slot[body._body_slot]
+
+    @staticmethod
+    def _mark_moved(body: "RigidBodyComponent"):
+        Broadphase._moved_bodies[body] = None
+
+    @staticmethod
+    def _mark_all_moved():
+        """Re-bucket every body on the next update, e.g. after a `Snapshot` restored the positions"""
+        Broadphase._moved_bodies.update(dict.fromkeys(Broadphase._spatial_hash._rects))
+
+    @staticmethod
+    def _update():
+        moved_bodies = Broadphase._moved_bodies
+        if BodyStorage.enabled:
+            bodies_by_slot = Broadphase._bodies_by_slot
+            for slot in BodyStorage._take_moved_slots().tolist():
+                body = bodies_by_slot.get(slot)
+                if body is not None:
+                    moved_bodies[body] = None
+        if not moved_bodies:
+            return
+
+        spatial_hash = Broadphase._spatial_hash
+        for body in moved_bodies:
+            spatial_hash.update(body, body.get_rect())
+        moved_bodies.clear()
+
+    @staticmethod
+    def _dispatch_overlaps():
+        for body_a, body_b in Broadphase._spatial_hash.get_overlapping_pairs():
+            Broadphase.on_overlap.invoke(body_a, body_b)
+            body_a.on_overlap.invoke(body_b)
+            body_b.on_overlap.invoke(body_a)
@@ -0,0 +1,79 @@
+import math
+import pygame
+from engine.math import Vec2
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from engine.components import TransformComponent
+
+
+class Camera:
+    def __init__(self, size: Vec2):
+        """A `Camera` defines which part of the world is visible on the screen.
+
+        Params:
+            size (Vec2): The size of the view in world space. Usually the size of the screen.
+        """
+        self._position = Vec2.zero()  # The top-left corner of the view in world space
+        self._size = size
+        self._target: "TransformComponent | None" = None
+        self._target_offset = Vec2.zero()
+        self.smoothing = 0.0  # The time in seconds the camera takes to catch up with ~63% of the distance to its target
+        self.bounds: pygame.Rect | None = None  # The view is kept inside these world space bounds
+
+    def follow(self, target: "TransformComponent | None", offset: Vec2 | None = None, smoothing: float = 0.0):
+        """Keep `target` (plus `offset`) at the center of the view. Pass `None` to stop following."""
+        self._target = target
+        self._target_offset = offset if offset is not None else Vec2.zero()
+        self.smoothing = smoothing
+
+    def get_position(self) -> Vec2:
+        return self._position
+
+    def set_position(self, position: Vec2):
+        self._position = self._clamp_to_bounds(position)
+
+    def get_size(self) -> Vec2:
+        return self._size
+
+    def get_view_rect(self) -> pygame.Rect:
+        """The world space rect that is visible on the screen"""
+        return pygame.Rect(self.get_offset(), self._size)
+
+    def get_offset(self) -> tuple[int, int]:
+        """The world to screen offset, rounded to whole pixels so that static content does not shimmer while scrolling"""
+        return (round(self._position.x), round(self._position.y))
+
+    def world_to_screen(self, position: Vec2) -> Vec2:
+        offset = self.get_offset()
+        return Vec2(position.x - offset[0], position.y - offset[1])
+
+    def screen_to_world(self, position: Vec2) -> Vec2:
+        offset = self.get_offset()
+        return Vec2(position.x + offset[0], position.y + offset[1])
+
+    def _update(self, delta_time: float, interpolation_fraction: float):
+        if self._target is None:
+            return
+
+        target_position = self._target.get_prev_position().lerp(self._target.get_position(), interpolation_fraction)
+        desired_position = target_position + self._target_offset - self._size / 2
+        if self.smoothing > 0.0:
+            alpha = 1.0 - math.exp(-delta_time / self.smoothing)
+            desired_position = self._position.lerp(desired_position, alpha)
+        self._position = self._clamp_to_bounds(desired_position)
+
+    def _clamp_to_bounds(self, position: Vec2) -> Vec2:
+        if self.bounds is None:
+            return position
+
+        x, y = position
+        if self.bounds.width <= self._size.x:
+            x = self.bounds.centerx - self._size.x / 2
+        else:
+            x = min(max(x, self.bounds.left), self.bounds.right - self._size.x)
+        if self.bounds.height <= self._size.y:
+            y = self.bounds.centery - self._size.y / 2
+        else:
+            y = min(max(y, self.bounds.top), self.bounds.bottom - self._size.y)
+        return Vec2(x, y)
@@ -1,7 +1,15 @@
 import pygame
 from engine.math import Vec2
+from engine.events import EventHook
+from engine.broadphase import Broadphase
+from engine.bodystorage import BodyStorage
 from engine.input import Input, InputEvent, InputEventType
-from engine.graphics import Display, RenderStruct
+from engine.graphics import Display, RenderProxy, RenderBatch, DEFAULT_RENDER_LAYER
+from engine.tilemap import Tilemap
+from engine.tilecollision import TileCollision, TileContact
+from engine.animation import AnimationClip
+from engine.particles import ParticleEmitter, ParticleSystem
+from engine.parallax import ParallaxLayer
 
 from typing import Callable, TYPE_CHECKING
 if TYPE_CHECKING:
@@ -10,6 +18,7 @@ if TYPE_CHECKING:
 
 ActionDelegate = Callable[[], None]
 AxisDelegate = Callable[[float], None]
+AnimationEventDelegate = Callable[[], None]
 
 
 class ComponentPriority:
@@ -20,6 +29,8 @@ class ComponentPriority:
 
 
 class Component(object):
+    snapshot_fields: tuple[str, ...] = ()  # The attributes saved by a `Snapshot`, in addition to those of the base classes
+
     def __init__(self, priority: int = ComponentPriority.DEFAULT_COMPONENT):
         """The base component class for all components.
 
@@ -44,6 +55,14 @@ class Component(object):
     def _render_tick(self, delta_time: float):
         pass
 
+    def _reset(self):
+        """Called when the `Entity` is recycled by an `EntityPool`. Restore the state that was set in `__init__()`."""
+        pass
+
+    def _set_ticking(self, is_ticking: bool):
+        """Called when the `Entity` starts or stops ticking while it is in play"""
+        pass
+
     def _set_entity(self, entity: "Entity | None"):
         self._entity = entity
 
@@ -57,45 +76,461 @@ class Component(object):
 
 
 class TransformComponent(Component):
+    snapshot_fields = ("_position", "_prev_position")  # Stale while bound to a `BodyStorage` slot, which is saved instead
+
     def __init__(self, priority: int = ComponentPriority.TRANSFORM_COMPONENT):
-        """A `Transform Component` stores an `Entity`'s position. An `Entity` always has a `Transform Component`."""
+        """A `Transform Component` stores an `Entity`'s position. An `Entity` always has a `Transform Component`.
+
+        In vectorized physics mode the position of an `Entity` with a `RigidBody Component` lives in the `BodyStorage`,
+        and the getters return copies of its slot. Otherwise they return the stored vectors without copying,
+        so do not modify them, use `set_position()` instead. The setters replace the stored vectors rather than
+        changing them, so a returned vector keeps its value.
+        """
         super().__init__(priority)
         self._position = Vec2.zero()
         self._prev_position = Vec2.zero()
+        self._body_slot: int | None = None
+        self._broadphase_bodies: "list[RigidBodyComponent]" = list()  # Marked as moved in the `Broadphase` by the setters
 
     def get_prev_position(self) -> Vec2:
+        if self._body_slot is not None:
+            return Vec2(*BodyStorage._prev_positions[self._body_slot])
         return self._prev_position
 
     def get_position(self) -> Vec2:
+        if self._body_slot is not None:
+            return Vec2(*BodyStorage._positions[self._body_slot])
         return self._position
 
     def set_position(self, position: Vec2):
+        if self._body_slot is not None:
+            # The previous position is stored by the `BodyStorage` at the start of each physics tick
+            BodyStorage._positions[self._body_slot] = position
+            self._mark_moved()
+            return
+        if position.x != self._position.x or position.y != self._position.y:
+            self._mark_moved()
         self._prev_position = self._position
-        self._position = position
+        self._position = position.copy()
+
+    def teleport(self, position: Vec2):
+        """Set the position without interpolating from the old one"""
+        self._mark_moved()
+        if self._body_slot is not None:
+            BodyStorage._positions[self._body_slot] = position
+            BodyStorage._prev_positions[self._body_slot] = position
+            return
+        self._prev_position = position.copy()
+        self._position = position.copy()
+
+    def _reset(self):
+        super()._reset()
+        self.teleport(Vec2.zero())
+
+    def _mark_moved(self):
+        for body in self._broadphase_bodies:
+            Broadphase._mark_moved(body)
+
+    def _bind_body_slot(self, slot: int):
+        self._body_slot = slot
+
+    def _unbind_body_slot(self):
+        assert self._body_slot is not None
+        self._position = Vec2(*BodyStorage._positions[self._body_slot])
+        self._prev_position = Vec2(*BodyStorage._prev_positions[self._body_slot])
+        self._body_slot = None
 
 
 class RigidBodyComponent(Component):
-    def __init__(self, priority: int = ComponentPriority.DEFAULT_COMPONENT):
-        """A `RigidBody Component` controls an `Entity`'s position through physics simulation."""
+    snapshot_fields = ("_velocity", "_acceleration", "_tile_contacts")
+
+    def __init__(self, size: Vec2, offset: Vec2 | None = None, collides_with_tiles: bool = False,
+                 priority: int = ComponentPriority.DEFAULT_COMPONENT):
+        """A `RigidBody Component` controls an `Entity`'s position through physics simulation.
+
+        While in play the body is tracked by the `Broadphase`, so it can be found with `Broadphase.query_aabb()`
+        and `Broadphase.query_point()`. `on_overlap` is invoked with the other body after every physics tick
+        in which the two bodies overlap. The `Broadphase` picks up a change of `size` or `offset` when the body next moves.
+
+        The body is moved by its velocity and acceleration every physics tick. When `BodyStorage.enabled` is set,
+        the state lives in the shared `BodyStorage` arrays and all bodies are integrated in one batch by `Physics`.
+
+        A body that collides with tiles is moved one axis at a time against the solid cells of the `TileCollision` tilemap.
+        The velocity along a blocked axis is zeroed. The contacts of all the physics ticks of the last frame that ran any
+        are gathered for `get_tile_contacts()`, so a contact is not lost when a later tick of the same frame moves freely.
+        Colliding bodies are always moved individually, also in vectorized physics mode.
+
+        Params:
+            size (Vec2): The size of the body's bounding box.
+            offset (Vec2): The offset of the bounding box's top-left corner from the `Entity`'s position.
+            collides_with_tiles (bool): Stop the body at solid tiles.
+        """
         super().__init__(priority)
+        self.size = size
+        self.offset = offset if offset is not None else Vec2.zero()
+        self.collides_with_tiles = collides_with_tiles
+        self.on_overlap = EventHook()
+        self._velocity = Vec2.zero()
+        self._acceleration = Vec2.zero()
+        self._tile_contacts = 0  # `TileContact` flags
+        self._tile_contacts_frame = -1  # The `TileCollision` frame the contacts were gathered in
+        self._body_slot: int | None = None
+
+    def _enter_play(self):
+        super()._enter_play()
+        if BodyStorage.enabled and not self.collides_with_tiles:
+            transform = self.get_entity_transform()
+            self._body_slot = BodyStorage._allocate(transform.get_position(), transform.get_prev_position(), self.get_entity().is_ticking())
+            BodyStorage._velocities[self._body_slot] = self._velocity
+            BodyStorage._accelerations[self._body_slot] = self._acceleration
+            transform._bind_body_slot(self._body_slot)
+        Broadphase._add_body(self)
+        self.get_entity_transform()._broadphase_bodies.append(self)
+
+    def _exit_play(self):
+        super()._exit_play()
+        self.get_entity_transform()._broadphase_bodies.remove(self)
+        Broadphase._remove_body(self)
+        if self._body_slot is not None:
+            self._velocity = self.get_velocity()
+            self._acceleration = self.get_acceleration()
+            self.get_entity_transform()._unbind_body_slot()
+            BodyStorage._free(self._body_slot)
+            self._body_slot = None
+
+    def _set_ticking(self, is_ticking: bool):
+        super()._set_ticking(is_ticking)
+        if self._body_slot is not None:
+            BodyStorage._set_ticking(self._body_slot, is_ticking)
+
+    def _physics_tick(self, delta_time: float):
+        super()._physics_tick(delta_time)
+        if self._body_slot is None:
+            self._velocity.x += self._acceleration.x * delta_time
+            self._velocity.y += self._acceleration.y * delta_time
+            transform = self.get_entity_transform()
+            position = transform.get_position()
+            dx = self._velocity.x * delta_time
+            dy = self._velocity.y * delta_time
+            if self.collides_with_tiles:
+                allowed_dx, allowed_dy, contacts = TileCollision._move(
+                    position.x + self.offset.x, position.y + self.offset.y, self.size.x, self.size.y, dx, dy)
+                if self._tile_contacts_frame != TileCollision._frame:
+                    self._tile_contacts_frame = TileCollision._frame
+                    self._tile_contacts = 0
+                self._tile_contacts |= contacts
+                if allowed_dx != dx:
+                    self._velocity.x = 0.0
+                if allowed_dy != dy:
+                    self._velocity.y = 0.0
+                dx, dy = allowed_dx, allowed_dy
+            transform.set_position(Vec2(position.x + dx, position.y + dy))
+
+    def _reset(self):
+        super()._reset()
+        self.set_velocity(Vec2.zero())
+        self.set_acceleration(Vec2.zero())
+        self._tile_contacts = 0
+
+    def get_tile_contacts(self) -> TileContact:
+        """The tiles the body ran into during the physics ticks of the last frame"""
+        return TileContact(self._tile_contacts)
+
+    def is_grounded(self) -> bool:
+        return (self._tile_contacts & TileContact.GROUND) != 0
+
+    def get_velocity(self) -> Vec2:
+        if self._body_slot is not None:
+            return Vec2(*BodyStorage._velocities[self._body_slot])
+        return self._velocity.copy()
+
+    def set_velocity(self, velocity: Vec2):
+        if self._body_slot is not None:
+            BodyStorage._velocities[self._body_slot] = velocity
+        else:
+            self._velocity.update(velocity)
+
+    def get_acceleration(self) -> Vec2:
+        if self._body_slot is not None:
+            return Vec2(*BodyStorage._accelerations[self._body_slot])
+        return self._acceleration.copy()
+
+    def set_acceleration(self, acceleration: Vec2):
+        if self._body_slot is not None:
+            BodyStorage._accelerations[self._body_slot] = acceleration
+        else:
+            self._acceleration.update(acceleration)
+
+    def get_rect(self) -> pygame.FRect:
+        """The world space bounding box of the body"""
+        position = self.get_entity_transform().get_position()
+        return pygame.FRect(position.x + self.offset.x, position.y + self.offset.y, self.size.x, self.size.y)
 
 
 class ImageComponent(Component):
-    def __init__(self, image: pygame.Surface | None = None, priority: int = ComponentPriority.RENDER_COMPONENT):
-        """An `Image Component` renders an image on the screen.
+    def __init__(self, image: pygame.Surface | None = None, layer: str = DEFAULT_RENDER_LAYER,
+                 priority: int = ComponentPriority.RENDER_COMPONENT):
+        """An `Image Component` renders an image on the screen through a render proxy that is owned by the component.
 
         Params:
             image (pygame.Surface): The image to render.
+            layer (str): The render layer of the image.
         """
         super().__init__(priority)
         self.image = image
+        self._layer = layer
+        self._render_proxy = RenderProxy()
+
+    def _enter_play(self):
+        super()._enter_play()
+        Display.add_render_proxy(self._render_proxy, self._layer, self.get_entity().get_priority())
+
+    def _exit_play(self):
+        super()._exit_play()
+        Display.remove_render_proxy(self._render_proxy)
 
     def _render_tick(self, delta_time: float):
         super()._render_tick(delta_time)
+        self._render_proxy.set_surface(self.image)
         if self.image:
             transform = self.get_entity_transform()
-            render_struct = RenderStruct(self.image, transform.get_position(), transform.get_prev_position())
-            Display.deferred_blit(render_struct)
+            self._render_proxy.set_position(transform.get_position(), transform.get_prev_position())
+
+
+class AnimationComponent(Component):
+    def __init__(self, clips: dict[str, AnimationClip], clip_name: str, layer: str = DEFAULT_RENDER_LAYER,
+                 priority: int = ComponentPriority.RENDER_COMPONENT):
+        """An `Animation Component` renders the frames of the `AnimationClip` that is playing.
+
+        The clip advances by the (time scaled) delta time of `_render_tick()`, which only swaps the surface
+        of a render proxy that is owned by the component, so playing an animation allocates no surfaces.
+
+        Params:
+            clips (dict[str, AnimationClip]): The clips that can be played, by name.
+            clip_name (str): The clip that starts playing.
+            layer (str): The render layer of the frames.
+        """
+        super().__init__(priority)
+        self.speed = 1.0
+        self.flip_x = False
+        self.on_clip_finished = EventHook()  # Invoked with the clip name when a non-looping clip reaches its end
+        self._clips = clips
+        self._initial_clip_name = clip_name
+        self._clip_name = clip_name
+        self._clip = clips[clip_name]
+        self._time = 0.0
+        self._frame_index = 0
+        self._elapsed_frames = -1  # The number of frames reached minus one. The first advance reaches frame 0
+        self._is_finished = False
+        self._frame_events: dict[tuple[str, int], list[AnimationEventDelegate]] = dict()
+        self._layer = layer
+        self._render_proxy = RenderProxy(self._clip.frames[0])
+
+    def _enter_play(self):
+        super()._enter_play()
+        Display.add_render_proxy(self._render_proxy, self._layer, self.get_entity().get_priority())
+
+    def _exit_play(self):
+        super()._exit_play()
+        Display.remove_render_proxy(self._render_proxy)
+
+    def _render_tick(self, delta_time: float):
+        super()._render_tick(delta_time)
+        if not self._is_finished:
+            self._advance(delta_time * self.speed)
+
+        transform = self.get_entity_transform()
+        render_proxy = self._render_proxy
+        render_proxy.set_surface(self._clip.get_frames(self.flip_x)[self._frame_index])
+        render_proxy.set_position(transform.get_position(), transform.get_prev_position())
+
+    def _advance(self, delta_time: float):
+        clip = self._clip
+        self._time += delta_time
+        frame_count = len(clip.frames)
+        elapsed_frames = int(self._time / clip.frame_duration)
+        if not clip.loop and elapsed_frames >= frame_count:
+            elapsed_frames = frame_count - 1
+            self._is_finished = True
+
+        # Dispatch the events of every frame reached since the last advance, also of the frames that were skipped
+        for elapsed_frame in range(self._elapsed_frames + 1, elapsed_frames + 1):
+            self._elapsed_frames = elapsed_frame
+            self._frame_index = elapsed_frame % frame_count
+            callbacks = self._frame_events.get((self._clip_name, self._frame_index))
+            if callbacks is not None:
+                for callback in callbacks:
+                    callback()
+                if self._elapsed_frames != elapsed_frame:
+                    return  # A callback played a clip
+
+        if self._is_finished:
+            self.on_clip_finished.invoke(self._clip_name)
+
+    def _reset(self):
+        super()._reset()
+        self.speed = 1.0
+        self.flip_x = False
+        self.play(self._initial_clip_name, restart=True)
+
+    def play(self, clip_name: str, restart: bool = False):
+        """Play a clip from its first frame. If the clip is already playing it continues, unless `restart` is set."""
+        if clip_name == self._clip_name and not restart:
+            return
+
+        self._clip_name = clip_name
+        self._clip = self._clips[clip_name]
+        self._time = 0.0
+        self._frame_index = 0
+        self._elapsed_frames = -1
+        self._is_finished = False
+
+    def get_clip_name(self) -> str:
+        return self._clip_name
+
+    def get_frame_index(self) -> int:
+        return self._frame_index
+
+    def is_finished(self) -> bool:
+        return self._is_finished
+
+    def add_frame_event(self, clip_name: str, frame_index: int, function: AnimationEventDelegate):
+        """Call `function` whenever the clip `clip_name` reaches the frame `frame_index`, also when the clip starts on frame 0.
+        Frames that are skipped by a large delta time still call their functions, in order."""
+        key = (clip_name, frame_index)
+        if key not in self._frame_events:
+            self._frame_events[key] = list()
+        self._frame_events[key].append(function)
+
+    def remove_frame_event(self, clip_name: str, frame_index: int, function: AnimationEventDelegate):
+        self._frame_events[(clip_name, frame_index)].remove(function)
+
+
+class TilemapComponent(Component):
+    def __init__(self, tilemap: Tilemap, tile_layer: str = DEFAULT_RENDER_LAYER, offgrid_layer: str = DEFAULT_RENDER_LAYER,
+                 priority: int = ComponentPriority.RENDER_COMPONENT):
+        """A `Tilemap Component` renders the chunks of a baked `Tilemap` that are visible on the screen.
+
+        Params:
+            tilemap (Tilemap): The tilemap to render. It should already be baked with `Tilemap.bake()`.
+            tile_layer (str): The render layer of the tile chunks.
+            offgrid_layer (str): The render layer of the off-grid decorations. A static layer suits them.
+        """
+        super().__init__(priority)
+        self.tilemap = tilemap
+        self._tile_layer = tile_layer
+        self._offgrid_layer = offgrid_layer
+
+    def _enter_play(self):
+        super()._enter_play()
+        self.tilemap._add_render_proxies(self._tile_layer, self._offgrid_layer, self.get_entity().get_priority())
+
+    def _exit_play(self):
+        super()._exit_play()
+        self.tilemap._remove_render_proxies()
+
+
+class TileColliderComponent(Component):
+    def __init__(self, tilemap: Tilemap, solid_types: list[str], priority: int = ComponentPriority.DEFAULT_COMPONENT):
+        """A `TileCollider Component` makes rigid bodies collide with the solid tiles of a `Tilemap` while it is in play.
+
+        Params:
+            tilemap (Tilemap): The tilemap to collide with.
+            solid_types (list[str]): The tile types that block bodies.
+        """
+        super().__init__(priority)
+        self.tilemap = tilemap
+        self.solid_types = solid_types
+
+    def _enter_play(self):
+        super()._enter_play()
+        TileCollision.set_tilemap(self.tilemap, self.solid_types)
+
+    def _exit_play(self):
+        super()._exit_play()
+        TileCollision.clear(self.tilemap)
+
+
+class ParticleComponent(Component):
+    def __init__(self, emitter: ParticleEmitter, screen_space: bool = False, layer: str = DEFAULT_RENDER_LAYER,
+                 priority: int = ComponentPriority.RENDER_COMPONENT):
+        """A `Particle Component` updates a `ParticleEmitter` and renders its visible particles as a single batch.
+
+        The particles advance by the (time scaled) delta time of `_render_tick()`. Emit them with the emitter's methods.
+
+        Params:
+            emitter (ParticleEmitter): The emitter to update and render.
+            screen_space (bool): If `True` the particle positions are in screen space and the camera is ignored.
+            layer (str): The render layer of the particles. It cannot be static.
+        """
+        super().__init__(priority)
+        self.emitter = emitter
+        self.screen_space = screen_space
+        self._layer = layer
+        self._render_batch = RenderBatch()
+
+    def _enter_play(self):
+        super()._enter_play()
+        ParticleSystem._add_emitter(self.emitter)
+        Display.add_render_proxy(self._render_batch, self._layer, self.get_entity().get_priority())
+
+    def _exit_play(self):
+        super()._exit_play()
+        ParticleSystem._remove_emitter(self.emitter)
+        Display.remove_render_proxy(self._render_batch)
+        self.emitter.clear()
+        self._render_batch.items = list()
+
+    def _render_tick(self, delta_time: float):
+        super()._render_tick(delta_time)
+        self.emitter._update(delta_time)
+        view_rect = None if self.screen_space else Display.get_view_rect()
+        self._render_batch.items = self.emitter._get_render_items(view_rect)
+
+
+class ParallaxComponent(Component):
+    def __init__(self, layers: list[ParallaxLayer], layer: str = DEFAULT_RENDER_LAYER,
+                 priority: int = ComponentPriority.RENDER_COMPONENT):
+        """A `Parallax Component` renders background layers that scroll relative to the camera, back to front.
+
+        Each layer is one screen space render proxy whose surface is a pre-tiled strip, built when the component
+        enters play. Scrolling only moves the proxies, and only when their whole-pixel position changes,
+        so layers that do not move can live in a static render layer.
+
+        Params:
+            layers (list[ParallaxLayer]): The layers, back to front.
+            layer (str): The render layer of the parallax layers.
+        """
+        super().__init__(priority)
+        self.layers = layers
+        self._layer = layer
+        self._render_proxies = [RenderProxy(screen_space=True) for _ in layers]
+        self._screen_positions: list[tuple[int, int] | None] = [None] * len(layers)
+
+    def _enter_play(self):
+        super()._enter_play()
+        screen_size = Display.get_surface().get_size()
+        camera_position = Vec2(Display.get_camera().get_offset())
+        for i, (parallax_layer, render_proxy) in enumerate(zip(self.layers, self._render_proxies)):
+            render_proxy.set_surface(parallax_layer._build_strip(screen_size))
+            self._screen_positions[i] = parallax_layer._get_screen_position(camera_position, 0.0)
+            render_proxy.set_position(Vec2(self._screen_positions[i]))
+            Display.add_render_proxy(render_proxy, self._layer, self.get_entity().get_priority())
+
+    def _exit_play(self):
+        super()._exit_play()
+        for render_proxy in self._render_proxies:
+            Display.remove_render_proxy(render_proxy)
+            render_proxy.set_surface(None)
+
+    def _render_tick(self, delta_time: float):
+        super()._render_tick(delta_time)
+        camera_position = Vec2(Display.get_camera().get_offset())  # Whole pixels, like the world, so the layers do not shimmer
+        for i, parallax_layer in enumerate(self.layers):
+            screen_position = parallax_layer._get_screen_position(camera_position, delta_time)
+            if screen_position != self._screen_positions[i]:
+                self._screen_positions[i] = screen_position
+                self._render_proxies[i].set_position(Vec2(screen_position))
 
 
 class InputComponent(Component):
@@ -129,9 +564,11 @@ class InputComponent(Component):
                     func()
 
     def bind_axis(self, axis_name: str, function: AxisDelegate):
+        """AXIS events are only dispatched when the axis value changes, so `function` is also called with the current value right away"""
         if axis_name not in self._bound_functions_by_axis:
             self._bound_functions_by_axis[axis_name] = list()
         self._bound_functions_by_axis[axis_name].append(function)
+        function(Input.get_axis_value(axis_name))
 
     def unbind_axis(self, axis_name: str, function: AxisDelegate):
         self._bound_functions_by_axis[axis_name].remove(function)
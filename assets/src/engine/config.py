@@ -9,16 +9,57 @@ CONFIG_FILE_PATH = CURRENT_DIRECTORY.joinpath(CONFIG_FILE_NAME)
 # Config sections
 SECTION_GRAPHICS = "graphics"
 SECTION_PHYSICS = "physics"
+SECTION_PACING = "pacing"
+SECTION_PROFILER = "profiler"
+SECTION_ASSETS = "assets"
+SECTION_INPUT = "input"
+SECTION_PARTICLES = "particles"
+SECTION_STREAMING = "streaming"
+SECTION_AUDIO = "audio"
 
 # Graphics keys
 KEY_SCREEN_WIDTH = "screen_width"
 KEY_SCREEN_HEIGHT = "screen_height"
 KEY_TARGET_FPS = "target_fps"
 KEY_GRAPHICS_SCALE = "graphics_scale"
+KEY_RENDER_MODE = "render_mode"
+KEY_DIRTY_RECT_THRESHOLD = "dirty_rect_threshold"
+
+# Pacing keys
+KEY_PACING_MODE = "pacing_mode"
+KEY_PACING_SPIN_THRESHOLD_MS = "pacing_spin_threshold_ms"
+KEY_PACING_STATS_WINDOW = "pacing_stats_window"
 
 # Physics keys
 KEY_PHYSICS_FPS = "physics_fps"
 KEY_PHYSICS_INTERPOLATION = "physics_interpolation"
+KEY_PHYSICS_MAX_SUBSTEPS = "physics_max_substeps"
+KEY_PHYSICS_BROADPHASE_CELL_SIZE = "physics_broadphase_cell_size"
+KEY_PHYSICS_VECTORIZED = "physics_vectorized"
+
+# Input keys
+KEY_CONTINUOUS_AXIS_EVENTS = "continuous_axis_events"
+KEY_EVENT_DRIVEN_INPUT = "event_driven_input"
+
+# Particles keys
+KEY_MAX_PARTICLES = "max_particles"
+
+# Streaming keys
+KEY_STREAMING_SPAWN_BUDGET = "streaming_spawn_budget"
+KEY_STREAMING_WORKER_COUNT = "streaming_worker_count"
+
+# Audio keys
+KEY_AUDIO_CHANNELS = "audio_channels"
+KEY_AUDIO_VOICE_LIMIT = "audio_voice_limit"
+KEY_AUDIO_BUFFER_SIZE = "audio_buffer_size"
+
+# Assets keys
+KEY_IMAGE_CACHE_BUDGET_MB = "image_cache_budget_mb"
+
+# Profiler keys
+KEY_PROFILER_ENABLED = "profiler_enabled"
+KEY_PROFILER_CAPACITY = "profiler_capacity"
+KEY_PROFILER_SHOW_GRAPH = "profiler_show_graph"
 
 
 class EngineConfig:
@@ -27,11 +68,45 @@ class EngineConfig:
     SCREEN_HEIGHT: int
     TARGET_FPS: int
     GRAPHICS_SCALE: float
+    RENDER_MODE: str
+    DIRTY_RECT_THRESHOLD: float
+
+    # Pacing
+    PACING_MODE: str
+    PACING_SPIN_THRESHOLD: float  # In seconds
+    PACING_STATS_WINDOW: int
 
     # Physics
     PHYSICS_FPS: int
     PHYSICS_DELTA_TIME: float
     PHYSICS_INTERPOLATION: bool
+    PHYSICS_MAX_SUBSTEPS: int
+    PHYSICS_BROADPHASE_CELL_SIZE: float
+    PHYSICS_VECTORIZED: bool
+
+    # Input
+    CONTINUOUS_AXIS_EVENTS: bool
+    EVENT_DRIVEN_INPUT: bool
+
+    # Particles
+    MAX_PARTICLES: int
+
+    # Streaming
+    STREAMING_SPAWN_BUDGET: int
+    STREAMING_WORKER_COUNT: int
+
+    # Audio
+    AUDIO_CHANNELS: int
+    AUDIO_VOICE_LIMIT: int
+    AUDIO_BUFFER_SIZE: int
+
+    # Assets
+    IMAGE_CACHE_BUDGET: int  # In bytes
+
+    # Profiler
+    PROFILER_ENABLED: bool
+    PROFILER_CAPACITY: int
+    PROFILER_SHOW_GRAPH: bool
 
     @staticmethod
     def init():
@@ -43,8 +118,42 @@ class EngineConfig:
         EngineConfig.SCREEN_HEIGHT = config.getint(SECTION_GRAPHICS, KEY_SCREEN_HEIGHT)
         EngineConfig.TARGET_FPS = config.getint(SECTION_GRAPHICS, KEY_TARGET_FPS)
         EngineConfig.GRAPHICS_SCALE = config.getfloat(SECTION_GRAPHICS, KEY_GRAPHICS_SCALE)
+        EngineConfig.RENDER_MODE = config.get(SECTION_GRAPHICS, KEY_RENDER_MODE)
+        EngineConfig.DIRTY_RECT_THRESHOLD = config.getfloat(SECTION_GRAPHICS, KEY_DIRTY_RECT_THRESHOLD)
+
+        # Pacing
+        EngineConfig.PACING_MODE = config.get(SECTION_PACING, KEY_PACING_MODE)
+        EngineConfig.PACING_SPIN_THRESHOLD = config.getfloat(SECTION_PACING, KEY_PACING_SPIN_THRESHOLD_MS) / 1000.0
+        EngineConfig.PACING_STATS_WINDOW = config.getint(SECTION_PACING, KEY_PACING_STATS_WINDOW)
 
         # Physics
         EngineConfig.PHYSICS_FPS = config.getint(SECTION_PHYSICS, KEY_PHYSICS_FPS)
         EngineConfig.PHYSICS_DELTA_TIME = 1.0 / EngineConfig.PHYSICS_FPS
         EngineConfig.PHYSICS_INTERPOLATION = config.getboolean(SECTION_PHYSICS, KEY_PHYSICS_INTERPOLATION)
+        EngineConfig.PHYSICS_MAX_SUBSTEPS = config.getint(SECTION_PHYSICS, KEY_PHYSICS_MAX_SUBSTEPS)
+        EngineConfig.PHYSICS_BROADPHASE_CELL_SIZE = config.getfloat(SECTION_PHYSICS, KEY_PHYSICS_BROADPHASE_CELL_SIZE)
+        EngineConfig.PHYSICS_VECTORIZED = config.getboolean(SECTION_PHYSICS, KEY_PHYSICS_VECTORIZED)
+
+        # Input
+        EngineConfig.CONTINUOUS_AXIS_EVENTS = config.getboolean(SECTION_INPUT, KEY_CONTINUOUS_AXIS_EVENTS)
+        EngineConfig.EVENT_DRIVEN_INPUT = config.getboolean(SECTION_INPUT, KEY_EVENT_DRIVEN_INPUT)
+
+        # Particles
+        EngineConfig.MAX_PARTICLES = config.getint(SECTION_PARTICLES, KEY_MAX_PARTICLES)
+
+        # Streaming
+        EngineConfig.STREAMING_SPAWN_BUDGET = config.getint(SECTION_STREAMING, KEY_STREAMING_SPAWN_BUDGET)
+        EngineConfig.STREAMING_WORKER_COUNT = config.getint(SECTION_STREAMING, KEY_STREAMING_WORKER_COUNT)
+
+        # Audio
+        EngineConfig.AUDIO_CHANNELS = config.getint(SECTION_AUDIO, KEY_AUDIO_CHANNELS)
+        EngineConfig.AUDIO_VOICE_LIMIT = config.getint(SECTION_AUDIO, KEY_AUDIO_VOICE_LIMIT)
+        EngineConfig.AUDIO_BUFFER_SIZE = config.getint(SECTION_AUDIO, KEY_AUDIO_BUFFER_SIZE)
+
+        # Assets
+        EngineConfig.IMAGE_CACHE_BUDGET = int(config.getfloat(SECTION_ASSETS, KEY_IMAGE_CACHE_BUDGET_MB) * 1024 * 1024)
+
+        # Profiler
+        EngineConfig.PROFILER_ENABLED = config.getboolean(SECTION_PROFILER, KEY_PROFILER_ENABLED)
+        EngineConfig.PROFILER_CAPACITY = config.getint(SECTION_PROFILER, KEY_PROFILER_CAPACITY)
+        EngineConfig.PROFILER_SHOW_GRAPH = config.getboolean(SECTION_PROFILER, KEY_PROFILER_SHOW_GRAPH)
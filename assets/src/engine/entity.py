@@ -1,7 +1,7 @@
 from sortedcontainers import SortedList, SortedSet
 from engine.components import Component, TransformComponent
 
-from typing import Any, Type, TypeVar, Iterable
+from typing import Any, Generic, Type, TypeVar, Iterable
 
 
 TEntity = TypeVar("TEntity", bound="Entity")
@@ -9,6 +9,8 @@ TComponent = TypeVar("TComponent", bound="Component")
 
 
 class Entity:
+    snapshot_fields: tuple[str, ...] = ()  # The attributes saved by a `Snapshot`, in addition to those of the base classes
+
     def __init__(self, priority: int = 0):
         """Represents an `Entity` in the game.
 
@@ -21,6 +23,9 @@ class Entity:
         self._priority = priority
         self._transform = TransformComponent()
         self._components = SortedList(iterable=[self._transform], key=(lambda comp: comp._priority))
+        self._components_by_type: dict[type, list[Component]] = dict()  # Indexed by every class in the component's MRO
+        self._index_component(self._transform)
+        self._pool: "EntityPool | None" = None  # The pool the entity is returned to when it is destroyed
 
     def _enter_play(self):
         self._is_in_play = True
@@ -44,9 +49,26 @@ class Entity:
         for comp in self._components:
             comp._render_tick(delta_time)
 
+    def _reset(self):
+        """Called when the entity is recycled by an `EntityPool`, after it exits play.
+        Override to restore the state that was set in `__init__()`. The components are reset as well."""
+        for comp in self._components:
+            comp._reset()
+
+    def get_priority(self) -> int:
+        return self._priority
+
     def is_ticking(self) -> bool:
         return self._is_ticking
 
+    def set_ticking(self, is_ticking: bool):
+        """An entity that is in play starts or stops ticking on the next frame"""
+        if is_ticking == self._is_ticking:
+            return
+        self._is_ticking = is_ticking
+        if self.is_in_play():
+            EntitySpawner._entity_ticking_requests.append(self)
+
     def is_in_play(self) -> bool:
         return self._is_in_play
 
@@ -55,29 +77,65 @@ class Entity:
 
     def add_component(self, component: TComponent) -> TComponent:
         self._components.add(component)
+        self._index_component(component)
         component._set_entity(self)
         if self.is_in_play():
+            EntitySpawner._index_component(component)
             component._enter_play()
         return component
 
     def remove_component(self, component: Component):
         self._components.remove(component)
+        self._unindex_component(component)
         component._set_entity(None)
         if self.is_in_play():
+            EntitySpawner._unindex_component(component)
             component._exit_play()
 
-    def get_component(self, component_class: Type[TComponent]):
-        for comp in self._components:
-            if isinstance(comp, component_class):
-                return comp
-        return None
+    def get_component(self, component_class: Type[TComponent]) -> TComponent | None:
+        """Get the first component (by priority) that is an instance of `component_class`"""
+        components = self._components_by_type.get(component_class)
+        return components[0] if components else None  # type: ignore
+
+    def get_components(self, component_class: Type[TComponent]) -> list[TComponent]:
+        """Get all components (by priority) that are instances of `component_class`"""
+        return list(self._components_by_type.get(component_class, ()))  # type: ignore
+
+    def has_component(self, component_class: type) -> bool:
+        return bool(self._components_by_type.get(component_class))
+
+    def _index_component(self, component: Component):
+        for component_class in _get_component_classes(type(component)):
+            components = self._components_by_type.get(component_class)
+            if components is None:
+                components = self._components_by_type[component_class] = list()
+            components.append(component)
+            components.sort(key=(lambda comp: comp._priority))
+
+    def _unindex_component(self, component: Component):
+        for component_class in _get_component_classes(type(component)):
+            self._components_by_type[component_class].remove(component)
+
+
+def _get_component_classes(component_class: type) -> tuple[type, ...]:
+    """The classes a component is indexed by: its class and all its base classes up to `Component`"""
+    return tuple(cls for cls in component_class.__mro__ if issubclass(cls, Component))
+
+
+def _get_entity_classes(entity_class: type) -> tuple[type, ...]:
+    """The classes an entity is indexed by: its class and all its base classes up to `Entity`"""
+    return tuple(cls for cls in entity_class.__mro__ if issubclass(cls, Entity))
 
 
 class EntitySpawner:
     _entities = SortedSet(key=(lambda entity: entity._priority))
-    _tickable_entities: list[Entity] = list()
+    _tickable_entities = SortedList(key=(lambda entity: entity._priority))
+    _generation = 0  # Changes whenever an entity or component enters or exits play
+    _entities_by_class: dict[type, dict[Entity, None]] = dict()  # Insertion-ordered sets, indexed by every class in the entity's MRO
+    _components_by_type: dict[type, dict[Component, None]] = dict()  # The components of the active entities, indexed like `Entity._components_by_type`
     _entity_spawn_requests = SortedList(key=(lambda entity: entity._priority))
     _entity_destroy_requests = SortedList(key=(lambda entity: entity._priority))
+    _entity_ticking_requests: list[Entity] = list()
 
     @staticmethod
     def get_entities() -> Iterable[Entity]:
@@ -87,15 +145,40 @@ class EntitySpawner:
     @staticmethod
     def get_tickable_entities() -> Iterable[Entity]:
         """Get all active entities that are set to tick"""
-        EntitySpawner._tickable_entities.clear()
-        for entity in EntitySpawner._entities:
-            if entity.is_ticking():
-                EntitySpawner._tickable_entities.append(entity)
-
         return EntitySpawner._tickable_entities
 
     @staticmethod
-    def spawn_entity(entity_class: Type[TEntity], priority: int = 0, *args: Any) -> Entity:
+    def get_entities_of_class(entity_class: Type[TEntity]) -> list[TEntity]:
+        """Get all active entities that are instances of `entity_class`"""
+        return list(EntitySpawner._entities_by_class.get(entity_class, ()))  # type: ignore
+
+    @staticmethod
+    def get_components_of_type(component_class: Type[TComponent]) -> list[TComponent]:
+        """Get the components of all active entities that are instances of `component_class`"""
+        return list(EntitySpawner._components_by_type.get(component_class, ()))  # type: ignore
+
+    @staticmethod
+    def query(*component_classes: type) -> list[Entity]:
+        """Get all active entities that have a component of each of the given classes.
+        The cost is proportional to the number of components of the rarest class."""
+        components_by_type = EntitySpawner._components_by_type
+        indexes = [components_by_type.get(component_class, {}) for component_class in component_classes]
+        if not indexes:
+            return list()
+
+        rarest_index = min(indexes, key=len)
+        result: dict[Entity, None] = dict()
+        for component in rarest_index:
+            entity = component.get_entity()
+            assert entity is not None
+            if entity in result:
+                continue
+            if all(entity.has_component(component_class) for component_class in component_classes):
+                result[entity] = None
+        return list(result)
+
+    @staticmethod
+    def spawn_entity(entity_class: Type[TEntity], priority: int = 0, *args: Any) -> TEntity:
         """`entity.enter_play()` will be called on the next frame"""
         entity = entity_class(priority, *args)
         EntitySpawner._entity_spawn_requests.add(entity)
@@ -103,21 +186,171 @@ class EntitySpawner:
 
     @staticmethod
     def destroy_entity(entity: Entity):
-        """`entity.exit_play()` will be called on the next frame"""
-        EntitySpawner._entity_destroy_requests.add(entity)
+        """`entity.exit_play()` will be called on the next frame. Pooled entities are then returned to their pool."""
+        if entity not in EntitySpawner._entity_destroy_requests:
+            EntitySpawner._entity_destroy_requests.add(entity)
 
     @staticmethod
     def _resolve_entity_spawn_requests():
         for entity in EntitySpawner._entity_spawn_requests:
             EntitySpawner._entities.add(entity)
+            EntitySpawner._index_entity(entity)
             entity._enter_play()
 
         EntitySpawner._entity_spawn_requests.clear()
+        EntitySpawner._resolve_entity_ticking_requests()
 
     @staticmethod
     def _resolve_entity_destroy_requests():
         for entity in EntitySpawner._entity_destroy_requests:
             EntitySpawner._entities.remove(entity)
+            EntitySpawner._unindex_entity(entity)
             entity._exit_play()
+            if entity._pool is not None:
+                entity._pool._release(entity)
 
         EntitySpawner._entity_destroy_requests.clear()
+        EntitySpawner._resolve_entity_ticking_requests()
+
+    @staticmethod
+    def _resolve_entity_ticking_requests():
+        # Ticking changes are applied between frames, so the tickable entities never change while they are iterated
+        for entity in EntitySpawner._entity_ticking_requests:
+            if not entity.is_in_play():
+                continue
+            is_indexed = entity in EntitySpawner._tickable_entities
+            if entity.is_ticking() and not is_indexed:
+                EntitySpawner._tickable_entities.add(entity)
+            elif not entity.is_ticking() and is_indexed:
+                EntitySpawner._tickable_entities.remove(entity)
+            else:
+                continue
+            for comp in entity._components:
+                comp._set_ticking(entity.is_ticking())
+
+        EntitySpawner._entity_ticking_requests.clear()
+
+    @staticmethod
+    def _index_entity(entity: Entity):
+        EntitySpawner._generation += 1
+        if entity.is_ticking():
+            EntitySpawner._tickable_entities.add(entity)
+        for entity_class in _get_entity_classes(type(entity)):
+            entities = EntitySpawner._entities_by_class.get(entity_class)
+            if entities is None:
+                entities = EntitySpawner._entities_by_class[entity_class] = dict()
+            entities[entity] = None
+        for component in entity._components:
+            EntitySpawner._index_component(component)
+
+    @staticmethod
+    def _unindex_entity(entity: Entity):
+        EntitySpawner._generation += 1
+        if entity in EntitySpawner._tickable_entities:
+            EntitySpawner._tickable_entities.remove(entity)
+        for entity_class in _get_entity_classes(type(entity)):
+            del EntitySpawner._entities_by_class[entity_class][entity]
+        for component in entity._components:
+            EntitySpawner._unindex_component(component)
+
+    @staticmethod
+    def _index_component(component: Component):
+        EntitySpawner._generation += 1
+        for component_class in _get_component_classes(type(component)):
+            components = EntitySpawner._components_by_type.get(component_class)
+            if components is None:
+                components = EntitySpawner._components_by_type[component_class] = dict()
+            components[component] = None
+
+    @staticmethod
+    def _unindex_component(component: Component):
+        EntitySpawner._generation += 1
+        for component_class in _get_component_classes(type(component)):
+            del EntitySpawner._components_by_type[component_class][component]
+
+
+class EntityPoolStats:
+    def __init__(self, capacity: int, active: int, free: int, high_water_mark: int, created: int, reused: int):
+        self.capacity = capacity
+        self.active = active
+        self.free = free
+        self.high_water_mark = high_water_mark
+        self.created = created
+        self.reused = reused
+
+    def __str__(self):
+        return (f"[EntityPoolStats: capacity={self.capacity} | active={self.active} | free={self.free} | "
+                f"high_water_mark={self.high_water_mark} | created={self.created} | reused={self.reused}]")
+
+
+class EntityPool(Generic[TEntity]):
+    def __init__(self, entity_class: Type[TEntity], capacity: int, priority: int = 0, *args: Any):
+        """An `EntityPool` recycles entities of a single class instead of constructing a new one for every spawn.
+
+        Spawn entities with `pool.spawn()` and destroy them as usual with `EntitySpawner.destroy_entity()`.
+        A destroyed entity exits play, is reset with `Entity._reset()` and is kept for the next `spawn()`.
+        Its ticking state is restored to the one it was constructed with before `_reset()` is called.
+        If more entities are needed than the pool holds, new ones are constructed, and the pool keeps up to
+        `capacity` of them when they are destroyed. The high-water mark tells what capacity would have been enough.
+
+        Params:
+            entity_class (Type[Entity]): The class of the pooled entities.
+            capacity (int): The number of free entities the pool keeps. Also the number created by `prewarm()`.
+            priority (int): The `priority` of the pooled entities.
+            args (Any): Extra arguments passed to the constructor of `entity_class`.
+        """
+        self._entity_class = entity_class
+        self._capacity = capacity
+        self._priority = priority
+        self._args = args
+        self._free_entities: list[TEntity] = list()
+        self._active_count = 0
+        self._high_water_mark = 0
+        self._created_count = 0
+        self._reused_count = 0
+        self._is_entity_ticking = False  # Whether the entities tick when they are constructed
+
+    def prewarm(self, count: int | None = None):
+        """Construct free entities up front (e.g. during a level load), so that `spawn()` does not construct any.
+
+        Params:
+            count (int): The number of free entities to have. Defaults to the capacity of the pool.
+        """
+        count = min(count if count is not None else self._capacity, self._capacity)
+        while len(self._free_entities) < count:
+            self._free_entities.append(self._create_entity())
+
+    def spawn(self) -> TEntity:
+        """Take a free entity (or construct one if there are none) and spawn it. It enters play on the next frame."""
+        if self._free_entities:
+            entity = self._free_entities.pop()
+            self._reused_count += 1
+        else:
+            entity = self._create_entity()
+
+        self._active_count += 1
+        self._high_water_mark = max(self._high_water_mark, self._active_count)
+        EntitySpawner._entity_spawn_requests.add(entity)
+        return entity
+
+    def clear(self):
+        """Drop the free entities"""
+        self._free_entities.clear()
+
+    def get_stats(self) -> EntityPoolStats:
+        return EntityPoolStats(self._capacity, self._active_count, len(self._free_entities),
+                               self._high_water_mark, self._created_count, self._reused_count)
+
+    def _create_entity(self) -> TEntity:
+        entity = self._entity_class(self._priority, *self._args)
+        entity._pool = self
+        self._is_entity_ticking = entity.is_ticking()
+        self._created_count += 1
+        return entity
+
+    def _release(self, entity: TEntity):
+        self._active_count -= 1
+        if len(self._free_entities) < self._capacity:
+            entity._is_ticking = self._is_entity_ticking  # Not in play anymore, so there is nothing to request
+            entity._reset()
+            self._free_entities.append(entity)
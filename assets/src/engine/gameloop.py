@@ -1,53 +1,170 @@
+import os
+import time
 import pygame
 from engine.time import Time
+from engine.pacing import FramePacer, PacingMode
 from engine.input import Input
+from engine.replay import Replay, ReplayMode
 from engine.physics import Physics
-from engine.graphics import Display, Graphics
+from engine.broadphase import Broadphase
+from engine.bodystorage import BodyStorage
+from engine.particles import ParticleSystem
+from engine.graphics import Display, Graphics, RenderMode
 from engine.config import EngineConfig
-from engine.entity import EntitySpawner
+from engine.assets import Assets
+from engine.streaming import Streaming
+from engine.audio import Audio
+from engine.entity import Entity, EntitySpawner
+from engine.profiler import Profiler, ProfilerPhase
+
+from typing import Callable, Iterable
 
 
 class GameLoop:
     @staticmethod
-    def init():
+    def init(headless: bool = False, virtual_delta_time: float | None = None):
+        """
+        Params:
+            headless (bool): Run without a window, using SDL's dummy video and audio drivers.
+                Headless runs use a virtual clock that is not capped to the target fps.
+            virtual_delta_time (float): The fixed delta time of the virtual clock. Defaults to `1 / target_fps` when headless.
+                Can also be set without `headless` to step a windowed game by a fixed delta time.
+        """
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
         pygame.init()
         EngineConfig.init()
-        Time.init(EngineConfig.TARGET_FPS)
-        Display.init(EngineConfig.SCREEN_WIDTH, EngineConfig.SCREEN_HEIGHT)
+        if headless and virtual_delta_time is None:
+            virtual_delta_time = 1.0 / EngineConfig.TARGET_FPS
+        Profiler.init(EngineConfig.PROFILER_ENABLED, EngineConfig.PROFILER_CAPACITY, EngineConfig.PROFILER_SHOW_GRAPH)
+        pacing_mode = PacingMode[EngineConfig.PACING_MODE.upper()]
+        Display.init(EngineConfig.SCREEN_WIDTH, EngineConfig.SCREEN_HEIGHT, vsync=(pacing_mode == PacingMode.VSYNC),
+                     render_mode=RenderMode[EngineConfig.RENDER_MODE.upper()],
+                     dirty_rect_threshold=EngineConfig.DIRTY_RECT_THRESHOLD)
+        if pacing_mode == PacingMode.VSYNC and not Display.is_vsync():
+            pacing_mode = PacingMode.PRECISE
+        FramePacer.init(pacing_mode, EngineConfig.TARGET_FPS, EngineConfig.PACING_SPIN_THRESHOLD, EngineConfig.PACING_STATS_WINDOW)
+        Time.init(EngineConfig.TARGET_FPS, virtual_delta_time)
         Graphics.init(EngineConfig.GRAPHICS_SCALE)
-        Physics.init(EngineConfig.PHYSICS_DELTA_TIME, EngineConfig.PHYSICS_INTERPOLATION)
+        Input.init(EngineConfig.CONTINUOUS_AXIS_EVENTS, EngineConfig.EVENT_DRIVEN_INPUT)
+        Assets.init(EngineConfig.IMAGE_CACHE_BUDGET)
+        Audio.init(EngineConfig.AUDIO_CHANNELS, EngineConfig.AUDIO_VOICE_LIMIT, EngineConfig.AUDIO_BUFFER_SIZE)
+        Streaming.init(EngineConfig.STREAMING_SPAWN_BUDGET, EngineConfig.STREAMING_WORKER_COUNT)
+        Physics.init(EngineConfig.PHYSICS_DELTA_TIME, EngineConfig.PHYSICS_INTERPOLATION, EngineConfig.PHYSICS_MAX_SUBSTEPS)
+        Broadphase.init(EngineConfig.PHYSICS_BROADPHASE_CELL_SIZE)
+        BodyStorage.init(EngineConfig.PHYSICS_VECTORIZED)
+        ParticleSystem.init(EngineConfig.MAX_PARTICLES)
 
     @staticmethod
-    def run():
+    def run(max_frames: int | None = None, stop_predicate: Callable[[], bool] | None = None):
+        """
+        Params:
+            max_frames (int): If set, the loop stops after this many frames.
+            stop_predicate (Callable[[], bool]): If set, it is called at the start of each frame and the loop stops when it returns `True`.
+        """
         running = True
+        frame_count = 0
         while running:
+            profiling = Profiler.enabled
+            if profiling:
+                Profiler._begin_frame()
+
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif Input.event_driven and not Replay.is_playing():
+                    Input._handle_pygame_event(event)
+
+            if max_frames is not None and frame_count >= max_frames:
+                break
+            if stop_predicate is not None and stop_predicate():
+                break
+            if Replay.is_finished():
+                break
+            frame_count += 1
+
+            if profiling:
+                Profiler._mark(ProfilerPhase.EVENTS)
 
-            Time._tick()
+            replaying = Replay.is_playing()
+            Time._tick(Replay._get_delta_time() if replaying else None)
 
+            if profiling:
+                Profiler._mark(ProfilerPhase.TIME)
+
+            Streaming._tick(wait_for_loads=(Replay.get_mode() != ReplayMode.NONE))
             EntitySpawner._resolve_entity_spawn_requests()
             EntitySpawner._resolve_entity_destroy_requests()
 
+            if profiling:
+                Profiler._mark(ProfilerPhase.SPAWN)
+
             delta_time = Time.get_delta_time()
             scaled_delta_time = delta_time * Time.get_time_scale()
 
             # Engine._tick()
-            Input._tick(delta_time)
+            Input._tick(delta_time, Replay._get_pressed_keys_mask() if replaying else None)
+            if Replay.get_mode() != ReplayMode.NONE:
+                Replay._end_frame(delta_time, Input.get_pressed_keys_mask())
+
+            if profiling:
+                Profiler._mark(ProfilerPhase.INPUT)
 
             tickable_entities = EntitySpawner.get_tickable_entities()
-            for entity in tickable_entities:
-                entity._tick(scaled_delta_time)
+            if profiling:
+                GameLoop._profiled_tick(tickable_entities, scaled_delta_time)
+                Profiler._mark(ProfilerPhase.TICK)
+            else:
+                for entity in tickable_entities:
+                    entity._tick(scaled_delta_time)
 
             # Engine._physics_tick()
             Physics._tick(tickable_entities, scaled_delta_time)
 
+            Display.get_camera()._update(scaled_delta_time, Physics.get_interpolation_fraction())
+            Audio._tick()
+
+            if profiling:
+                Profiler._mark(ProfilerPhase.PHYSICS)
+
             # Engine._render_tick()
             entities = EntitySpawner.get_entities()
-            for entity in entities:
-                entity._render_tick(scaled_delta_time)
+            if profiling:
+                GameLoop._profiled_render_tick(entities, scaled_delta_time)
+                Profiler._mark(ProfilerPhase.RENDER_TICK)
+            else:
+                for entity in entities:
+                    entity._render_tick(scaled_delta_time)
 
             Display.render_frame(Physics.get_interpolation_fraction())
 
+            if profiling:
+                if Profiler.show_graph:
+                    graph_rect = Profiler._draw_graph(Display.get_surface(), 1.0 / EngineConfig.TARGET_FPS)
+                    Display.invalidate_rect(graph_rect)
+                Profiler._mark(ProfilerPhase.RENDER)
+
+            Display._present()
+
+            if profiling:
+                Profiler._mark(ProfilerPhase.PRESENT)
+                Profiler._end_frame(Physics.get_substep_count())
+
+        Streaming._shutdown()
         pygame.quit()
+
+    @staticmethod
+    def _profiled_tick(entities: Iterable[Entity], delta_time: float):
+        for entity in entities:
+            start_time = time.perf_counter()
+            entity._tick(delta_time)
+            Profiler._add_entity_time(type(entity).__name__, time.perf_counter() - start_time)
+
+    @staticmethod
+    def _profiled_render_tick(entities: Iterable[Entity], delta_time: float):
+        for entity in entities:
+            start_time = time.perf_counter()
+            entity._render_tick(delta_time)
+            Profiler._add_entity_time(type(entity).__name__, time.perf_counter() - start_time)
@@ -1,5 +1,11 @@
+import enum
 import pygame
+import numpy as np
 from engine.math import Vec2
+from engine.color import Color
+from engine.camera import Camera
+
+from typing import Sequence
 
 
 class Graphics:
@@ -10,33 +16,553 @@ class Graphics:
         Graphics.scale = graphics_scale
 
 
-class RenderStruct:
-    def __init__(self, surface: pygame.Surface, position: Vec2, prev_position: Vec2):
-        self.surface = surface
-        self.position = position
-        self.prev_position = prev_position
+DEFAULT_RENDER_LAYER = "default"
+STATIC_CHUNK_SIZE = 256  # Width and height in pixels of the cached chunks of a static layer
+
+
+class RenderProxy:
+    __slots__ = ("_surface", "_position", "_prev_position", "_screen_space", "_layer", "_slot")
+
+    def __init__(self, surface: pygame.Surface | None = None, position: Vec2 | None = None, screen_space: bool = False):
+        """A persistent render item. Register it once with `Display.add_render_proxy()` and update it in place.
+
+        While it is registered its state is mirrored in the arrays of its `RenderLayer`, so all proxies
+        are interpolated, culled and submitted in one batch.
+
+        Params:
+            surface (pygame.Surface): The surface to blit. `None` hides the proxy.
+            position (Vec2): The position of the top-left corner.
+            screen_space (bool): If `True` the position is in screen space and the camera is ignored.
+        """
+        self._surface = surface
+        self._position = position if position is not None else Vec2.zero()
+        self._prev_position = self._position
+        self._screen_space = screen_space
+        self._layer: "RenderLayer | None" = None
+        self._slot = -1
+
+    def get_surface(self) -> pygame.Surface | None:
+        return self._surface
+
+    def set_surface(self, surface: pygame.Surface | None):
+        if surface is self._surface:
+            return
+        self._surface = surface
+        if self._layer is not None:
+            self._layer._set_surface(self._slot, surface)
+
+    def get_position(self) -> Vec2:
+        return self._position
+
+    def set_position(self, position: Vec2, prev_position: Vec2 | None = None):
+        """
+        Params:
+            position (Vec2): The position of the top-left corner.
+            prev_position (Vec2): The position on the previous physics tick. Used for interpolation. Defaults to `position`.
+        """
+        is_moved = position != self._position
+        self._position = position
+        self._prev_position = prev_position if prev_position is not None else position
+        layer = self._layer
+        if layer is not None:
+            layer._positions[self._slot] = position
+            layer._prev_positions[self._slot] = self._prev_position
+            if layer.static and is_moved:
+                # Static layers are composited at the current positions, so only a move invalidates them
+                layer._is_cache_valid = False
+
+    def is_screen_space(self) -> bool:
+        return self._screen_space
+
+    def get_layer(self) -> "RenderLayer | None":
+        return self._layer
+
+    def is_registered(self) -> bool:
+        return self._layer is not None
+
+
+class RenderBatch:
+    __slots__ = ("items", "_layer", "_slot")
+
+    def __init__(self):
+        """A batch of items that are already in screen space and culled, e.g. the particles of an emitter.
+        Register it once with `Display.add_render_proxy()` and replace `items` every frame.
+        The items are blitted as they are, without interpolation, in the batch's place in the render order.
+        """
+        self.items: list[RenderItem] = list()  # (surface, screen space rect) pairs
+        self._layer: "RenderLayer | None" = None
+        self._slot = -1
+
+    def is_registered(self) -> bool:
+        return self._layer is not None
+
+
+class RenderSort(enum.Enum):
+    NONE = 0  # By the priority the proxies were registered with, then in registration order
+    Y = 1  # By the bottom edge of the proxies, so that lower proxies are drawn in front
+
+
+class RenderMode(enum.Enum):
+    FULL = 0  # Redraw and flip the whole screen every frame
+    DIRTY_RECTS = 1  # Redraw and update only the screen areas that changed since the last frame
+
+
+RenderItem = tuple[pygame.Surface, pygame.Rect | Sequence[int]]
+
+# The per-slot arrays of a `RenderLayer`
+SLOT_ARRAY_NAMES = ("_surfaces", "_positions", "_prev_positions", "_sizes", "_screen_space", "_drawable",
+                    "_is_batch", "_priorities", "_sequences")
+
+
+class RenderLayer:
+    def __init__(self, name: str, depth: int, sort: RenderSort = RenderSort.NONE, static: bool = False, capacity: int = 64):
+        """A `RenderLayer` holds render proxies that are drawn together. Layers are drawn by ascending `depth`.
+
+        A static layer is composited into cached `STATIC_CHUNK_SIZE` x `STATIC_CHUNK_SIZE` chunks, each blitted with
+        a single call, and is recomposited only when one of its proxies is added, removed or changed.
+        Chunks are composited when they come into view and dropped when they are more than a chunk away from it,
+        so the cache's memory follows the screen size, not the size of the level.
+        Use it for content that never moves, like backgrounds and non-animated decorations.
+        Static layers cannot hold render batches, and their proxies must all be in world space or all in screen space.
+
+        Params:
+            name (str): The name proxies are registered with.
+            depth (int): Layers with a lower depth are drawn first.
+            sort (RenderSort): The order of the proxies within the layer. Render batches are drawn in their place
+                in the priority order when the layer is not sorted, and after the proxies when it is.
+            static (bool): Cache the composited layer.
+            capacity (int): The initial size of the proxy arrays. They grow as needed.
+        """
+        self.name = name
+        self.depth = depth
+        self.sort = sort
+        self.static = static
+
+        # A proxy's slot is its index in these arrays. Removing a proxy moves the last one into its slot,
+        # so the slots are not in render order, which is given by the priorities and sequences instead
+        self._proxies: list[RenderProxy | RenderBatch] = list()
+        self._surfaces = np.empty(capacity, dtype=object)  # Objects: pygame.Surface | None
+        self._positions = np.zeros((capacity, 2))
+        self._prev_positions = np.zeros((capacity, 2))
+        self._sizes = np.zeros((capacity, 2), dtype=np.int32)
+        self._screen_space = np.zeros(capacity, dtype=bool)
+        self._drawable = np.zeros(capacity, dtype=bool)  # The slot holds a proxy with a surface
+        self._is_batch = np.zeros(capacity, dtype=bool)
+        self._priorities = np.zeros(capacity, dtype=np.int64)
+        self._sequences = np.zeros(capacity, dtype=np.int64)  # The registration order
+        self._next_sequence = 0
+        self._batch_count = 0
+
+        self._is_cache_valid = False
+        self._cache_surfaces: list[pygame.Surface] = list()  # The drawable proxies in render order, taken when the cache is validated
+        self._cache_positions = np.zeros((0, 2), dtype=np.int32)
+        self._cache_sizes = np.zeros((0, 2), dtype=np.int32)
+        self._cache_screen_space = False
+        self._cache_chunks: dict[tuple[int, int], pygame.Surface | None] = dict()  # `None` for chunks without proxies
+
+    def get_proxy_count(self) -> int:
+        return len(self._proxies)
+
+    def invalidate(self):
+        """Recomposite a static layer on the next frame, e.g. after drawing onto the surface of one of its proxies"""
+        self._is_cache_valid = False
+
+    def _add(self, proxy: RenderProxy | RenderBatch, priority: int):
+        slot = len(self._proxies)
+        if slot == len(self._surfaces):
+            self._grow()
+
+        self._proxies.append(proxy)
+        proxy._layer = self
+        proxy._slot = slot
+        self._priorities[slot] = priority
+        self._sequences[slot] = self._next_sequence
+        self._next_sequence += 1
+        self._is_batch[slot] = isinstance(proxy, RenderBatch)
+        if isinstance(proxy, RenderBatch):
+            assert not self.static, "Static layers cannot hold render batches"
+            self._set_surface(slot, None)
+            self._batch_count += 1
+        else:
+            self._set_surface(slot, proxy._surface)
+            self._positions[slot] = proxy._position
+            self._prev_positions[slot] = proxy._prev_position
+            self._screen_space[slot] = proxy._screen_space
+        self._is_cache_valid = False
+
+    def _remove(self, proxy: RenderProxy | RenderBatch):
+        """The last proxy moves into the slot of `proxy`. Its render order is kept by its priority and sequence."""
+        slot = proxy._slot
+        last_slot = len(self._proxies) - 1
+        if slot != last_slot:
+            for name in SLOT_ARRAY_NAMES:
+                array = getattr(self, name)
+                array[slot] = array[last_slot]
+            moved_proxy = self._proxies[last_slot]
+            self._proxies[slot] = moved_proxy
+            moved_proxy._slot = slot
+        self._proxies.pop()
+        self._surfaces[last_slot] = None
+        self._drawable[last_slot] = False
+        self._is_batch[last_slot] = False
+
+        if isinstance(proxy, RenderBatch):
+            self._batch_count -= 1
+        proxy._layer = None
+        proxy._slot = -1
+        self._is_cache_valid = False
+
+    def _set_surface(self, slot: int, surface: pygame.Surface | None):
+        self._surfaces[slot] = surface
+        self._drawable[slot] = surface is not None
+        if surface is not None:
+            self._sizes[slot] = surface.get_size()
+        self._is_cache_valid = False
+
+    def _grow(self):
+        count = len(self._proxies)
+        capacity = len(self._surfaces) * 2
+        for name in SLOT_ARRAY_NAMES:
+            old_array = getattr(self, name)
+            array = np.zeros((capacity, *old_array.shape[1:]), dtype=old_array.dtype)
+            array[:count] = old_array[:count]
+            setattr(self, name, array)
+
+    def _get_visible_items(self, interpolation_fraction: float, camera_offset: tuple[int, int],
+                           screen_size: tuple[int, int]) -> tuple[list[RenderItem], int]:
+        """Interpolate and cull all proxies with array operations and merge in the items of the batches.
+        Returns the items and the number of culled proxies."""
+        if self.static:
+            return self._get_cached_items(camera_offset, screen_size), 0
+
+        count = len(self._proxies)
+        prev_positions = self._prev_positions[:count]
+        positions = prev_positions + (self._positions[:count] - prev_positions) * interpolation_fraction
+        positions[~self._screen_space[:count]] -= camera_offset
+
+        sizes = self._sizes[:count]
+        screen_width, screen_height = screen_size
+        drawable = self._drawable[:count]
+        visible = drawable & ((positions[:, 0] < screen_width) & (positions[:, 1] < screen_height) &
+                              (positions[:, 0] + sizes[:, 0] > 0) & (positions[:, 1] + sizes[:, 1] > 0))
+        culled_count = int(np.count_nonzero(drawable)) - int(np.count_nonzero(visible))
+        batch_slots = np.flatnonzero(self._is_batch[:count]) if self._batch_count else None
+        if self.sort == RenderSort.Y:
+            visible_slots = np.flatnonzero(visible)
+            bottoms = positions[visible_slots, 1] + sizes[visible_slots, 1]
+            visible_slots = visible_slots[np.lexsort((self._sequences[visible_slots], bottoms))]
+            if batch_slots is not None:
+                batch_slots = self._sort_slots(batch_slots)
+        elif batch_slots is not None:
+            # Sort the batches together with the proxies, then split them off at their place in the render order
+            slots = self._sort_slots(np.flatnonzero(visible | self._is_batch[:count]))
+            is_batch = self._is_batch[slots]
+            visible_slots = slots[~is_batch]
+            batch_positions = np.flatnonzero(is_batch)
+            batch_slots = slots[batch_positions]
+        else:
+            visible_slots = self._sort_slots(np.flatnonzero(visible))
+
+        rects = np.empty((len(visible_slots), 4), dtype=np.int32)
+        rects[:, :2] = positions[visible_slots]  # Truncated like `int()`
+        rects[:, 2:] = sizes[visible_slots]
+        items: list[RenderItem] = list(zip(self._surfaces[visible_slots].tolist(), rects.tolist()))
+        if batch_slots is None:
+            return items, culled_count
+
+        if self.sort != RenderSort.NONE:
+            for batch_slot in batch_slots.tolist():
+                items.extend(self._get_batch(batch_slot).items)
+            return items, culled_count
+
+        # Splice the batch items in at the place of each batch in the render order
+        merged_items: list[RenderItem] = list()
+        split_indices = (batch_positions - np.arange(len(batch_positions))).tolist()  # The number of proxies before each batch
+        start = 0
+        for batch_slot, split_index in zip(batch_slots.tolist(), split_indices):
+            merged_items.extend(items[start:split_index])
+            merged_items.extend(self._get_batch(batch_slot).items)
+            start = split_index
+        merged_items.extend(items[start:])
+        return merged_items, culled_count
+
+    def _sort_slots(self, slots: np.ndarray) -> np.ndarray:
+        """Sort slots into the render order: by priority, then by registration order"""
+        return slots[np.lexsort((self._sequences[slots], self._priorities[slots]))]
+
+    def _get_batch(self, slot: int) -> RenderBatch:
+        batch = self._proxies[slot]
+        assert isinstance(batch, RenderBatch)
+        return batch
+
+    def _get_cached_items(self, camera_offset: tuple[int, int], screen_size: tuple[int, int]) -> list[RenderItem]:
+        if not self._is_cache_valid:
+            self._validate_cache()
+        if not self._cache_surfaces:
+            return list()
 
+        view_x, view_y = (0, 0) if self._cache_screen_space else camera_offset
+        first_x = view_x // STATIC_CHUNK_SIZE
+        first_y = view_y // STATIC_CHUNK_SIZE
+        last_x = (view_x + screen_size[0] - 1) // STATIC_CHUNK_SIZE
+        last_y = (view_y + screen_size[1] - 1) // STATIC_CHUNK_SIZE
+
+        chunks = self._cache_chunks
+        for key in [key for key in chunks if not (first_x - 1 <= key[0] <= last_x + 1 and first_y - 1 <= key[1] <= last_y + 1)]:
+            del chunks[key]
+
+        # The chunk surfaces are reused while they are cached, which keeps the items unchanged for `DIRTY_RECTS` mode
+        items: list[RenderItem] = list()
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                key = (chunk_x, chunk_y)
+                if key in chunks:
+                    surface = chunks[key]
+                else:
+                    surface = chunks[key] = self._composite_chunk(chunk_x, chunk_y)
+                if surface is not None:
+                    items.append((surface, (chunk_x * STATIC_CHUNK_SIZE - view_x, chunk_y * STATIC_CHUNK_SIZE - view_y,
+                                            STATIC_CHUNK_SIZE, STATIC_CHUNK_SIZE)))
+        return items
+
+    def _validate_cache(self):
+        """Take the drawable proxies in render order. The chunks are composited from them when they come into view."""
+        self._is_cache_valid = True
+        self._cache_chunks.clear()
+
+        count = len(self._proxies)
+        drawable_slots = np.flatnonzero(self._drawable[:count])
+        screen_space = self._screen_space[drawable_slots]
+        assert screen_space.all() or not screen_space.any(), "The proxies of a static layer must all be in the same space"
+        if self.sort == RenderSort.Y:
+            bottoms = self._positions[drawable_slots, 1] + self._sizes[drawable_slots, 1]
+            drawable_slots = drawable_slots[np.lexsort((self._sequences[drawable_slots], bottoms))]
+        else:
+            drawable_slots = self._sort_slots(drawable_slots)
+        self._cache_surfaces = self._surfaces[drawable_slots].tolist()
+        self._cache_positions = self._positions[drawable_slots].astype(np.int32)
+        self._cache_sizes = self._sizes[drawable_slots]
+        self._cache_screen_space = bool(screen_space[0]) if len(screen_space) else False
+
+    def _composite_chunk(self, chunk_x: int, chunk_y: int) -> pygame.Surface | None:
+        left = chunk_x * STATIC_CHUNK_SIZE
+        top = chunk_y * STATIC_CHUNK_SIZE
+        positions = self._cache_positions
+        sizes = self._cache_sizes
+        overlapping = np.flatnonzero((positions[:, 0] < left + STATIC_CHUNK_SIZE) & (positions[:, 1] < top + STATIC_CHUNK_SIZE) &
+                                     (positions[:, 0] + sizes[:, 0] > left) & (positions[:, 1] + sizes[:, 1] > top))
+        if len(overlapping) == 0:
+            return None
+
+        surface = pygame.Surface((STATIC_CHUNK_SIZE, STATIC_CHUNK_SIZE), pygame.SRCALPHA).convert_alpha()
+        surface.fill((0, 0, 0, 0))
+        surfaces = [self._cache_surfaces[index] for index in overlapping.tolist()]
+        surface.blits(list(zip(surfaces, (positions[overlapping] - (left, top)).tolist())), doreturn=False)
+        return surface
 
 class Display:
     _surface: pygame.Surface
-    _render_queue: list[RenderStruct]
+    _camera: Camera
+    _drawn_count: int
+    _culled_count: int
+    _render_mode: RenderMode
+    _dirty_rect_threshold: float
+    _prev_items: set[tuple[pygame.Surface, int, int, int, int]] | None  # The items drawn in the last frame, used in `DIRTY_RECTS` mode
+    _vsync: bool
+    _update_rects: list[pygame.Rect] | None  # The screen areas to update on `_present()`, or `None` to flip the whole screen
+    _invalidated_rects: list[pygame.Rect]
+    _layers: list[RenderLayer]  # By ascending depth
+    _layers_by_name: dict[str, RenderLayer]
+    clear_color: Color
+
+    @staticmethod
+    def init(width: int, height: int, flags: int = 0, depth: int = 0, vsync: bool = False,
+             render_mode: RenderMode = RenderMode.FULL, dirty_rect_threshold: float = 0.5):
+        """
+        Params:
+            vsync (bool): Make presenting a frame wait for the display refresh. Falls back to no vsync if it is not supported.
+            render_mode (RenderMode): How frames are drawn and presented.
+            dirty_rect_threshold (float): In `DIRTY_RECTS` mode, the whole screen is redrawn and flipped
+                when the changed area is larger than this fraction of the screen.
+        """
+        Display._vsync = False
+        if vsync:
+            try:
+                Display._surface = pygame.display.set_mode((width, height), flags, depth, vsync=1)
+                Display._vsync = True
+            except pygame.error:
+                pass
+        if not Display._vsync:
+            Display._surface = pygame.display.set_mode((width, height), flags, depth)
+        Display._camera = Camera(Vec2(width, height))
+        Display._drawn_count = 0
+        Display._culled_count = 0
+        Display._dirty_rect_threshold = dirty_rect_threshold
+        Display._invalidated_rects = list()
+        Display._layers = list()
+        Display._layers_by_name = dict()
+        Display.clear_color = Color.black()
+        Display.set_render_mode(render_mode)
+        Display.add_layer(DEFAULT_RENDER_LAYER, 0)
+
+    @staticmethod
+    def is_vsync() -> bool:
+        return Display._vsync
+
+    @staticmethod
+    def add_layer(name: str, depth: int, sort: RenderSort = RenderSort.NONE, static: bool = False) -> RenderLayer:
+        """Add a render layer. Layers with the same depth are drawn in the order they were added."""
+        assert name not in Display._layers_by_name, f"Render layer already exists: {name}"
+        layer = RenderLayer(name, depth, sort, static)
+        Display._layers.append(layer)
+        Display._layers.sort(key=(lambda layer: layer.depth))
+        Display._layers_by_name[name] = layer
+        return layer
 
     @staticmethod
-    def init(width: int, height: int, flags: int = 0, depth: int = 0):
-        Display._surface = pygame.display.set_mode((width, height), flags, depth)
-        Display._render_queue = list()
+    def get_layer(name: str) -> RenderLayer:
+        return Display._layers_by_name[name]
 
     @staticmethod
-    def deferred_blit(render_struct: RenderStruct):
-        Display._render_queue.append(render_struct)
+    def get_layers() -> list[RenderLayer]:
+        return Display._layers
+
+    @staticmethod
+    def add_render_proxy(proxy: RenderProxy | RenderBatch, layer: str = DEFAULT_RENDER_LAYER, priority: int = 0):
+        """Register a proxy or batch with a layer. It is drawn every frame until it is removed.
+
+        Unless the layer is sorted, proxies with a lower `priority` are drawn first, and proxies with the same
+        priority in the order they were registered. Components register with the priority of their entity,
+        so like the entities' ticks, entities are drawn by priority and their components in component order.
+        """
+        assert proxy._layer is None
+        Display._layers_by_name[layer]._add(proxy, priority)
+
+    @staticmethod
+    def remove_render_proxy(proxy: RenderProxy | RenderBatch):
+        assert proxy._layer is not None
+        proxy._layer._remove(proxy)
+
+    @staticmethod
+    def get_render_proxy_count() -> int:
+        return sum(layer.get_proxy_count() for layer in Display._layers)
 
     @staticmethod
     def render_frame(interpolation_fraction: float):
-        for struct in Display._render_queue:
-            position = struct.prev_position.lerp(struct.position, interpolation_fraction)
-            Display._surface.blit(struct.surface, position)
-        Display._render_queue.clear()
-        pygame.display.flip()
+        """Blit the render layers. Proxies that do not intersect the screen are culled."""
+        camera_offset = Display._camera.get_offset()
+        screen_size = Display._surface.get_size()
+        items: list[RenderItem] = list()
+        culled_count = 0
+        for layer in Display._layers:
+            layer_items, layer_culled_count = layer._get_visible_items(interpolation_fraction, camera_offset, screen_size)
+            items.extend(layer_items)
+            culled_count += layer_culled_count
+        Display._drawn_count = len(items)
+        Display._culled_count = culled_count
+
+        if Display._render_mode == RenderMode.DIRTY_RECTS:
+            Display._render_dirty_rects(items)
+        else:
+            Display._surface.fill(Display.clear_color)  # Areas that no proxy covers must not keep the last frame's pixels
+            Display._surface.fblits(items)
+            Display._update_rects = None
+
+    @staticmethod
+    def _render_dirty_rects(items: list[RenderItem]):
+        surface = Display._surface
+        current_items = {(item_surface, *rect) for item_surface, rect in items}
+        prev_items = Display._prev_items
+        Display._prev_items = current_items
+
+        dirty_rects = Display._invalidated_rects
+        Display._invalidated_rects = list()
+        if prev_items is None:
+            dirty_rects.append(surface.get_rect())
+        else:
+            # An item that moved, appeared, disappeared or changed its surface dirties both its old and its new rect
+            for key in current_items.symmetric_difference(prev_items):
+                dirty_rects.append(pygame.Rect(key[1:]))
+
+        dirty_rects = Display._merge_rects([rect.clip(surface.get_rect()) for rect in dirty_rects if rect.width and rect.height])
+        dirty_area = sum(rect.width * rect.height for rect in dirty_rects)
+        if dirty_area > Display._dirty_rect_threshold * surface.get_width() * surface.get_height():
+            surface.fill(Display.clear_color)
+            surface.blits(items, doreturn=False)
+            Display._update_rects = None
+            return
+
+        # Restore the background under each dirty rect by redrawing everything that intersects it, clipped to it
+        for dirty_rect in dirty_rects:
+            surface.set_clip(dirty_rect)
+            surface.fill(Display.clear_color)
+            surface.blits([item for item in items if dirty_rect.colliderect(item[1])], doreturn=False)
+        surface.set_clip(None)
+        Display._update_rects = dirty_rects
+
+    @staticmethod
+    def _merge_rects(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+        """Replace overlapping rects with their union, so that no area is redrawn twice"""
+        merged: list[pygame.Rect] = list()
+        for rect in rects:
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    @staticmethod
+    def _present():
+        if Display._update_rects is None:
+            pygame.display.flip()
+        elif Display._update_rects:
+            pygame.display.update(Display._update_rects)
+
+    @staticmethod
+    def invalidate_rect(rect: pygame.Rect):
+        """Mark a screen area that was drawn to outside of the render queue (e.g. an overlay).
+        It is presented this frame and redrawn on the next one. Only needed in `DIRTY_RECTS` mode."""
+        if Display._update_rects is not None:
+            Display._update_rects.append(rect)
+        Display._invalidated_rects.append(rect)
+
+    @staticmethod
+    def get_render_mode() -> RenderMode:
+        return Display._render_mode
+
+    @staticmethod
+    def set_render_mode(render_mode: RenderMode):
+        Display._render_mode = render_mode
+        Display._prev_items = None  # The next frame is redrawn in full
+        Display._update_rects = None
+
+    @staticmethod
+    def get_surface() -> pygame.Surface:
+        return Display._surface
+
+    @staticmethod
+    def get_camera() -> Camera:
+        return Display._camera
+
+    @staticmethod
+    def set_camera(camera: Camera):
+        Display._camera = camera
+
+    @staticmethod
+    def get_view_rect() -> pygame.Rect:
+        """The world space rect that is visible on the screen"""
+        return Display._camera.get_view_rect()
+
+    @staticmethod
+    def get_drawn_count() -> int:
+        """How many items were blitted in the last frame, including the items of render batches"""
+        return Display._drawn_count
+
+    @staticmethod
+    def get_culled_count() -> int:
+        """How many render proxies were culled in the last frame because they were off-screen"""
+        return Display._culled_count
 
     @staticmethod
     def get_size() -> Vec2:
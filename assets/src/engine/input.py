@@ -1,7 +1,9 @@
 import os
 import json
 import enum
+import time
 import pygame
+from collections import deque
 from engine.math import Math
 from engine.events import EventHook
 
@@ -11,6 +13,8 @@ from typing import Any
 INPUT_SETTINGS_FILE_NAME = "input_settings.json"
 ACTION_MAPPINGS = "action_mappings"
 AXIS_MAPPINGS = "axis_mappings"
+JOY_BUTTON_PREFIX = "JOY_BUTTON_"  # Key names like "JOY_BUTTON_0" bind gamepad buttons. Only supported in event-driven mode
+INPUT_EVENT_TYPES = (pygame.KEYDOWN, pygame.KEYUP, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED)
 KEY_NAMES_BY_KEY_CODE = {
     pygame.K_BACKSPACE: "K_BACKSPACE",
     pygame.K_TAB: "K_TAB",
@@ -148,6 +152,9 @@ KEY_NAMES_BY_KEY_CODE = {
 }
 
 
+KEY_CODES_BY_KEY_NAME = {key_name: key_code for key_code, key_name in KEY_NAMES_BY_KEY_CODE.items()}
+
+
 def _get_input_settings() -> Any:
     dir_path = os.path.dirname(os.path.realpath(__file__))
     file_path = f"{dir_path}/{INPUT_SETTINGS_FILE_NAME}"
@@ -162,6 +169,75 @@ def _create_axis_values(axis_mappings: dict[str, Any]) -> dict[str, float]:
     return axis_values
 
 
+class _KeyTable:
+    def __init__(self):
+        """Assigns a bit to every bound key, so that the state of all bound keys fits in one integer mask"""
+        self.key_codes: list[int] = list()  # The bound keyboard keys, polled with `pygame.key.get_pressed()`
+        self.bits: list[int] = list()
+        self.bits_by_key_code: dict[int, int] = dict()
+        self.bits_by_joy_button: dict[int, int] = dict()
+        self._bits_by_key_name: dict[str, int] = dict()
+
+    def get_bit(self, key_name: str) -> int:
+        bit = self._bits_by_key_name.get(key_name)
+        if bit is None:
+            bit = 1 << len(self._bits_by_key_name)
+            if key_name.startswith(JOY_BUTTON_PREFIX) and key_name[len(JOY_BUTTON_PREFIX):].isdigit():
+                self.bits_by_joy_button[int(key_name[len(JOY_BUTTON_PREFIX):])] = bit
+            elif key_name in KEY_CODES_BY_KEY_NAME:
+                key_code = KEY_CODES_BY_KEY_NAME[key_name]
+                self.key_codes.append(key_code)
+                self.bits.append(bit)
+                self.bits_by_key_code[key_code] = bit
+            else:
+                raise ValueError(f"Unknown key name in {INPUT_SETTINGS_FILE_NAME}: {key_name}")
+            self._bits_by_key_name[key_name] = bit
+        return bit
+
+    def get_mask(self, key_names: list[str]) -> int:
+        mask = 0
+        for key_name in key_names:
+            mask |= self.get_bit(key_name)
+        return mask
+
+
+class _ActionBinding:
+    __slots__ = ("name", "mask", "key_bits")
+
+    def __init__(self, name: str, key_bits: list[int]):
+        self.name = name
+        self.mask = 0  # All keys of the action
+        for bit in key_bits:
+            self.mask |= bit
+        self.key_bits = tuple(key_bits)
+
+
+class _AxisBinding:
+    __slots__ = ("name", "acceleration", "deceleration", "positive_mask", "negative_mask")
+
+    def __init__(self, name: str, acceleration: float, deceleration: float, positive_mask: int, negative_mask: int):
+        self.name = name
+        self.acceleration = acceleration
+        self.deceleration = deceleration
+        self.positive_mask = positive_mask
+        self.negative_mask = negative_mask
+
+
+def _compile_bindings(action_mappings: dict[str, list[str]], axis_mappings: dict[str, Any]) -> tuple[_KeyTable, list[_ActionBinding], list[_AxisBinding]]:
+    key_table = _KeyTable()
+
+    action_bindings: list[_ActionBinding] = list()
+    for action, keys in action_mappings.items():
+        action_bindings.append(_ActionBinding(action, [key_table.get_bit(key) for key in keys]))
+
+    axis_bindings: list[_AxisBinding] = list()
+    for axis, axis_settings in axis_mappings.items():
+        axis_bindings.append(_AxisBinding(axis, axis_settings["acceleration"], axis_settings["deceleration"],
+                                          key_table.get_mask(axis_settings["positive"]), key_table.get_mask(axis_settings["negative"])))
+
+    return key_table, action_bindings, axis_bindings
+
+
 class InputEventType(enum.Enum):
     PRESSED = 0
     RELEASED = 1
@@ -180,72 +256,144 @@ class InputEvent:
 
 class Input:
     on_input_event = EventHook()
+    continuous_axis_events = False  # If `True` AXIS events are dispatched every frame, not only when the axis value changes
+    event_driven = False  # See `Input.init()`
+    snapshot_fields = ("_axis_values",)  # Not the pressed keys, which are device state
 
     _input_settings = _get_input_settings()
     _action_mappings: dict[str, list[str]] = _input_settings[ACTION_MAPPINGS]
     _axis_mappings: dict[str, Any] = _input_settings[AXIS_MAPPINGS]
     _axis_values = _create_axis_values(_axis_mappings)
-    _pressed_keys_this_frame: set[str] = set()
-    _pressed_keys_last_frame: set[str] = set()
+    _key_table, _action_bindings, _axis_bindings = _compile_bindings(_action_mappings, _axis_mappings)
+    _pressed_keys_mask = 0  # Bit `i` is set if the key with bit `1 << i` in the `_key_table` is pressed
+    _queued_key_events: deque[tuple[float, int, bool]] = deque()  # (timestamp, key bit, pressed) in event-driven mode
+    _joysticks: dict[int, pygame.joystick.JoystickType] = dict()
 
     @staticmethod
-    def _tick(delta_time: float):
-        Input._cache_pressed_keys_from_last_frame()
-        Input._update_pressed_keys_this_frame()
-
-        # Dispatch action events
-        action_mappings = Input._action_mappings
-        for action, keys in action_mappings.items():
-            for key in keys:
-                if (key in Input._pressed_keys_this_frame) and not (key in Input._pressed_keys_last_frame):
-                    Input.on_input_event.invoke(InputEvent(action, InputEventType.PRESSED))
-                elif (key in Input._pressed_keys_last_frame) and not (key in Input._pressed_keys_this_frame):
-                    Input.on_input_event.invoke(InputEvent(action, InputEventType.RELEASED))
+    def init(continuous_axis_events: bool, event_driven: bool = False):
+        """
+        Params:
+            continuous_axis_events (bool): Dispatch AXIS events every frame, not only when the axis value changes.
+            event_driven (bool): Read keys and gamepad buttons from pygame's `KEYDOWN`/`KEYUP`/`JOYBUTTONDOWN`/`JOYBUTTONUP` events
+                instead of polling the keyboard once per frame. Key presses shorter than a frame are not lost, and PRESSED/RELEASED
+                events are dispatched right before the physics tick whose time window they fall into.
+                pygame does not expose SDL's event timestamps, so events are timestamped when they are taken from pygame's queue
+                and placed per drain, not per event: all events taken at once fall into the same physics tick.
+                Events taken after the start of the frame are dispatched before the last physics tick of the frame.
+        """
+        Input.continuous_axis_events = continuous_axis_events
+        Input.event_driven = event_driven
+
+    @staticmethod
+    def get_axis_value(axis: str) -> float:
+        return Input._axis_values[axis]
+
+    @staticmethod
+    def get_key_names() -> list[str]:
+        """The names of the bound keys. The key at index `i` has the bit `1 << i` in the pressed keys masks."""
+        return list(Input._key_table._bits_by_key_name)
+
+    @staticmethod
+    def get_pressed_keys_mask() -> int:
+        return Input._pressed_keys_mask
+
+    @staticmethod
+    def _tick(delta_time: float, pressed_keys_mask: int | None = None):
+        """
+        Params:
+            pressed_keys_mask (int): If set, the keys are not read from the keyboard, e.g. during a replay.
+                The PRESSED/RELEASED events are then dispatched right away, also in event-driven mode.
+        """
+        if Input.event_driven and pressed_keys_mask is None:
+            Input._poll_events()
+            pressed_keys_mask = Input._pressed_keys_mask
+        else:
+            if pressed_keys_mask is None:
+                pressed_keys_mask = Input._read_pressed_keys_mask()
+            changed_keys_mask = pressed_keys_mask ^ Input._pressed_keys_mask
+            Input._pressed_keys_mask = pressed_keys_mask
+
+            # Dispatch action events
+            if changed_keys_mask:
+                for action in Input._action_bindings:
+                    if not (changed_keys_mask & action.mask):
+                        continue
+                    for key_bit in action.key_bits:
+                        if changed_keys_mask & key_bit:
+                            event_type = InputEventType.PRESSED if (pressed_keys_mask & key_bit) else InputEventType.RELEASED
+                            Input.on_input_event.invoke(InputEvent(action.name, event_type))
 
         # Update axis values
-        axis_mappings = Input._axis_mappings
-        for axis, axis_settings in axis_mappings.items():
-            axis_acceleration = axis_settings["acceleration"]
-            axis_deceleration = axis_settings["deceleration"]
-            axis_positive_keys = axis_settings["positive"]
-            axis_negative_keys = axis_settings["negative"]
-
-            any_positive_key = False
-            for pos_key in axis_positive_keys:
-                if pos_key in Input._pressed_keys_this_frame:
-                    any_positive_key = True
-                    break
-
-            any_negative_key = False
-            for neg_key in axis_negative_keys:
-                if neg_key in Input._pressed_keys_this_frame:
-                    any_negative_key = True
-                    break
-
-            axis_value = Input._axis_values[axis]
-            if (any_positive_key and any_negative_key) or (not (any_positive_key or any_negative_key)):
+        for axis in Input._axis_bindings:
+            any_positive_key = (pressed_keys_mask & axis.positive_mask) != 0
+            any_negative_key = (pressed_keys_mask & axis.negative_mask) != 0
+
+            prev_axis_value = Input._axis_values[axis.name]
+            axis_value = prev_axis_value
+            if any_positive_key == any_negative_key:
                 if axis_value < 0.0:
-                    axis_value = Math.clamp(axis_value + axis_deceleration * delta_time, -1.0, 0.0)
+                    axis_value = Math.clamp(axis_value + axis.deceleration * delta_time, -1.0, 0.0)
                 elif axis_value > 0.0:
-                    axis_value = Math.clamp(axis_value - axis_deceleration * delta_time, 0.0, 1.0)
-            elif any_positive_key and not any_negative_key:
-                axis_value = Math.clamp(axis_value + axis_acceleration * delta_time, -1.0, 1.0)
-            elif any_negative_key and not any_positive_key:
-                axis_value = Math.clamp(axis_value - axis_acceleration * delta_time, -1.0, 1.0)
+                    axis_value = Math.clamp(axis_value - axis.deceleration * delta_time, 0.0, 1.0)
+            elif any_positive_key:
+                axis_value = Math.clamp(axis_value + axis.acceleration * delta_time, -1.0, 1.0)
+            else:
+                axis_value = Math.clamp(axis_value - axis.acceleration * delta_time, -1.0, 1.0)
 
-            Input._axis_values[axis] = axis_value
-            Input.on_input_event.invoke(InputEvent(axis, InputEventType.AXIS, axis_value))
+            if axis_value != prev_axis_value or Input.continuous_axis_events:
+                Input._axis_values[axis.name] = axis_value
+                Input.on_input_event.invoke(InputEvent(axis.name, InputEventType.AXIS, axis_value))
 
     @staticmethod
-    def _cache_pressed_keys_from_last_frame():
-        Input._pressed_keys_last_frame.clear()
-        for key in Input._pressed_keys_this_frame:
-            Input._pressed_keys_last_frame.add(key)
-
-    @staticmethod
-    def _update_pressed_keys_this_frame():
-        Input._pressed_keys_this_frame.clear()
+    def _read_pressed_keys_mask() -> int:
         pressed_key_flags = pygame.key.get_pressed()
-        for key_code, key_name in KEY_NAMES_BY_KEY_CODE.items():
+        key_table = Input._key_table
+        mask = 0
+        for key_code, bit in zip(key_table.key_codes, key_table.bits):
             if pressed_key_flags[key_code]:
-                Input._pressed_keys_this_frame.add(key_name)
+                mask |= bit
+        return mask
+
+    @staticmethod
+    def _poll_events():
+        """Take the input events from pygame's queue. Other events stay in the queue."""
+        for event in pygame.event.get(INPUT_EVENT_TYPES):
+            Input._handle_pygame_event(event)
+
+    @staticmethod
+    def _handle_pygame_event(event: pygame.event.Event):
+        """Queue a key or gamepad button event in event-driven mode"""
+        if event.type == pygame.KEYDOWN or event.type == pygame.KEYUP:
+            bit = Input._key_table.bits_by_key_code.get(event.key)
+        elif event.type == pygame.JOYBUTTONDOWN or event.type == pygame.JOYBUTTONUP:
+            bit = Input._key_table.bits_by_joy_button.get(event.button)
+        elif event.type == pygame.JOYDEVICEADDED:
+            joystick = pygame.joystick.Joystick(event.device_index)
+            Input._joysticks[joystick.get_instance_id()] = joystick
+            return
+        elif event.type == pygame.JOYDEVICEREMOVED:
+            Input._joysticks.pop(event.instance_id, None)
+            return
+        else:
+            return
+
+        if bit is None:
+            return
+
+        pressed = event.type == pygame.KEYDOWN or event.type == pygame.JOYBUTTONDOWN
+        if pressed:
+            Input._pressed_keys_mask |= bit
+        else:
+            Input._pressed_keys_mask &= ~bit
+        Input._queued_key_events.append((time.perf_counter(), bit, pressed))  # Stamped at drain time, see `Input.init()`
+
+    @staticmethod
+    def _dispatch_queued_events(until_timestamp: float):
+        """Dispatch the PRESSED/RELEASED events of the queued key events that happened up to `until_timestamp`"""
+        queued_key_events = Input._queued_key_events
+        while queued_key_events and queued_key_events[0][0] <= until_timestamp:
+            _, key_bit, pressed = queued_key_events.popleft()
+            event_type = InputEventType.PRESSED if pressed else InputEventType.RELEASED
+            for action in Input._action_bindings:
+                if action.mask & key_bit:
+                    Input.on_input_event.invoke(InputEvent(action.name, event_type))
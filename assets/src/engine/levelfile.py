@@ -0,0 +1,171 @@
+import sys
+import struct
+import pathlib
+import argparse
+import numpy as np
+from engine.math import Vec2
+from engine.graphics import Graphics
+from engine.tilemap import Tilemap, OffgridTile
+
+
+LEVEL_FILE_MAGIC = b"NLVL"
+LEVEL_FILE_VERSION = 1
+LEVEL_FILE_EXTENSION = ".lvl"
+LEVEL_FILE_ALIGNMENT = 8
+
+# magic, version, tile_size, origin_x, origin_y, width, height, tile type count, offgrid count
+HEADER = struct.Struct("<4sHHiiIIII")
+SOURCE_MTIME = struct.Struct("<q")
+OFFGRID_DTYPE = np.dtype([("type", "<u2"), ("variant", "<i2"), ("x", "<f4"), ("y", "<f4")])  # Unscaled positions
+
+# A level file is a compact binary form of a JSON map, which stays the editing format:
+#
+#     header | source mtime | tile type names | types grid | variants grid | offgrid table
+#
+# The tile type names are length-prefixed UTF-8 strings, and include the types that are only used off-grid.
+# The grids are `width * height` int8 cells in row-major order (`EMPTY_TILE` for empty cells).
+# The grids and the offgrid table start at multiples of `LEVEL_FILE_ALIGNMENT` bytes, so they can be used
+# as NumPy views of a memory-mapped file without copying.
+
+
+def write_level_file(tilemap: Tilemap, path: str | pathlib.Path, source_mtime_ns: int = 0):
+    """
+    Write a tilemap as a level file.
+
+    Args:
+        tilemap: The tilemap. Its off-grid positions are stored without `Graphics.scale`.
+        path: The level file path.
+        source_mtime_ns: The modification time of the JSON map the tilemap was loaded from, used to detect stale files.
+    """
+    tile_types = list(tilemap.tile_types)
+    for tile in tilemap.offgrid:
+        if tile.type not in tile_types:
+            tile_types.append(tile.type)
+
+    offgrid = np.zeros(len(tilemap.offgrid), dtype=OFFGRID_DTYPE)
+    scale = tilemap.cell_size / tilemap.tile_size
+    for i, tile in enumerate(tilemap.offgrid):
+        offgrid[i] = (tile_types.index(tile.type), tile.variant, tile.position.x / scale, tile.position.y / scale)
+
+    data = bytearray(HEADER.pack(LEVEL_FILE_MAGIC, LEVEL_FILE_VERSION, tilemap.tile_size, tilemap.origin[0], tilemap.origin[1],
+                                 tilemap.width, tilemap.height, len(tile_types), len(offgrid)))
+    data += SOURCE_MTIME.pack(source_mtime_ns)
+    for tile_type in tile_types:
+        name = tile_type.encode("utf-8")
+        data += struct.pack("<B", len(name)) + name
+
+    _align(data)
+    data += tilemap.get_type_grid().tobytes()
+    _align(data)
+    data += tilemap.get_variant_grid().tobytes()
+    _align(data)
+    data += offgrid.tobytes()
+
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as file_stream:
+        file_stream.write(data)
+
+
+def read_level_file(path: str | pathlib.Path, scale: float | None = None) -> Tilemap:
+    """
+    Load a level file by memory-mapping it. The tile grids of the returned tilemap are read-only views of the file.
+
+    Args:
+        path: The level file path.
+        scale: The graphics scale applied to the off-grid positions. If not set, `Graphics.scale` is used.
+
+    Returns:
+        Tilemap
+    """
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    magic, version, tile_size, origin_x, origin_y, width, height, type_count, offgrid_count = HEADER.unpack_from(data)
+    if magic != LEVEL_FILE_MAGIC or version != LEVEL_FILE_VERSION:
+        raise ValueError(f"Not a version {LEVEL_FILE_VERSION} level file: {path}")
+
+    offset = HEADER.size + SOURCE_MTIME.size
+    tile_types: list[str] = list()
+    for _ in range(type_count):
+        length = int(data[offset])
+        tile_types.append(bytes(data[offset + 1:offset + 1 + length]).decode("utf-8"))
+        offset += 1 + length
+
+    cell_count = width * height
+    offset = _aligned(offset)
+    types = data[offset:offset + cell_count].view(np.int8)
+    offset = _aligned(offset + cell_count)
+    variants = data[offset:offset + cell_count].view(np.int8)
+    offset = _aligned(offset + cell_count)
+    offgrid_records = data[offset:offset + offgrid_count * OFFGRID_DTYPE.itemsize].view(OFFGRID_DTYPE)
+
+    if scale is None:
+        scale = Graphics.scale
+    offgrid: list[OffgridTile] = list()
+    for type_index, variant, x, y in offgrid_records.tolist():
+        offgrid.append(OffgridTile(tile_types[type_index], variant, Vec2(x, y) * scale))
+
+    return Tilemap(tile_size, (origin_x, origin_y), width, height, tile_types, types, variants, offgrid, scale)
+
+
+def read_source_mtime(path: str | pathlib.Path) -> int | None:
+    """Get the modification time of the JSON map a level file was converted from, or `None` if it is not a level file"""
+    with open(path, "rb") as file_stream:
+        data = file_stream.read(HEADER.size + SOURCE_MTIME.size)
+    if len(data) < HEADER.size + SOURCE_MTIME.size:
+        return None
+    magic, version = HEADER.unpack_from(data)[:2]
+    if magic != LEVEL_FILE_MAGIC or version != LEVEL_FILE_VERSION:
+        return None
+    return SOURCE_MTIME.unpack_from(data, HEADER.size)[0]
+
+
+def convert_json_map(json_path: str | pathlib.Path, level_path: str | pathlib.Path):
+    """Convert a JSON map into a level file"""
+    tilemap = Tilemap.load(json_path, scale=1.0)  # Parse the off-grid positions without scaling them
+    write_level_file(tilemap, level_path, pathlib.Path(json_path).stat().st_mtime_ns)
+
+
+def load_tilemap(json_path: str | pathlib.Path, cache_dir: str | pathlib.Path, scale: float | None = None) -> Tilemap:
+    """
+    Load a JSON map through its level file in `cache_dir`. The level file is (re)converted if it is missing
+    or older than the JSON map.
+
+    Args:
+        json_path: The JSON map path.
+        cache_dir: The directory of the converted level files.
+        scale: The graphics scale of the returned tilemap. If not set, `Graphics.scale` is used.
+
+    Returns:
+        Tilemap
+    """
+    json_path = pathlib.Path(json_path)
+    level_path = pathlib.Path(cache_dir).joinpath(json_path.stem + LEVEL_FILE_EXTENSION)
+    if not level_path.exists() or read_source_mtime(level_path) != json_path.stat().st_mtime_ns:
+        convert_json_map(json_path, level_path)
+    return read_level_file(level_path, scale)
+
+
+def _aligned(offset: int) -> int:
+    return (offset + LEVEL_FILE_ALIGNMENT - 1) // LEVEL_FILE_ALIGNMENT * LEVEL_FILE_ALIGNMENT
+
+
+def _align(data: bytearray):
+    data += bytes(_aligned(len(data)) - len(data))
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Convert JSON maps into binary level files")
+    parser.add_argument("maps", nargs="+", help="the JSON maps to convert, e.g. data/maps/*.json")
+    parser.add_argument("--output-dir", default=None, help="where to write the level files (default: next to each map)")
+    args = parser.parse_args(argv)
+
+    for json_path in map(pathlib.Path, args.maps):
+        output_dir = pathlib.Path(args.output_dir) if args.output_dir is not None else json_path.parent
+        level_path = output_dir.joinpath(json_path.stem + LEVEL_FILE_EXTENSION)
+        convert_json_map(json_path, level_path)
+        print(f"{json_path} -> {level_path} ({json_path.stat().st_size} -> {level_path.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
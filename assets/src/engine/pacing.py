@@ -0,0 +1,131 @@
+import time
+import math
+import pygame
+from enum import Enum
+from collections import deque
+
+
+class PacingMode(Enum):
+    CLOCK = 0  # `pygame.time.Clock.tick()`, which sleeps with the OS timer granularity
+    PRECISE = 1  # Sleep until shortly before the frame deadline, then spin until it
+    VSYNC = 2  # Presentation waits for the display refresh. The frame rate follows the refresh rate
+
+
+class FramePacingStats:
+    def __init__(self, frames: int, mean_frame_time: float, jitter: float, max_frame_time: float, late_frames: int, dropped_steps: int):
+        self.frames = frames  # The number of frames in the stats window
+        self.mean_frame_time = mean_frame_time
+        self.jitter = jitter  # The standard deviation of the frame time
+        self.max_frame_time = max_frame_time
+        self.late_frames = late_frames  # Frames that missed their deadline by more than a frame, since the start
+        self.dropped_steps = dropped_steps  # Physics steps dropped by the catch-up limit, since the start
+
+    def __str__(self):
+        return (f"[FramePacingStats: frames={self.frames} | mean={self.mean_frame_time * 1000.0:.2f}ms | "
+                f"jitter={self.jitter * 1000.0:.2f}ms | max={self.max_frame_time * 1000.0:.2f}ms | "
+                f"late_frames={self.late_frames} | dropped_steps={self.dropped_steps}]")
+
+
+class FramePacer:
+    """Waits for the start of each frame, so that frames are evenly spaced at the target frame rate"""
+    mode: PacingMode
+    spin_threshold: float  # In `PRECISE` mode, how many seconds before the deadline to stop sleeping and start spinning
+
+    _clock: pygame.time.Clock
+    _target_frame_time: float
+    _refresh_period: float
+    _frame_start: float
+    _next_deadline: float
+    _frame_times: deque[float]
+    _late_frame_count: int
+    _dropped_step_count: int
+
+    @staticmethod
+    def init(mode: PacingMode, fps: int, spin_threshold: float, stats_window: int):
+        """
+        Params:
+            mode (PacingMode): How to wait for the next frame.
+            fps (int): The target frame rate.
+            spin_threshold (float): In `PRECISE` mode, how many seconds before the deadline to stop sleeping and start spinning.
+                It should be larger than the OS sleep granularity.
+            stats_window (int): How many frames the frame time stats are computed over.
+        """
+        FramePacer.mode = mode
+        FramePacer.spin_threshold = spin_threshold
+        FramePacer._clock = pygame.time.Clock()
+        refresh_rate = pygame.display.get_current_refresh_rate() if pygame.display.get_surface() is not None else 0
+        FramePacer._refresh_period = 1.0 / (refresh_rate if refresh_rate > 0 else fps)
+        FramePacer._frame_start = time.perf_counter()
+        FramePacer._frame_times = deque(maxlen=stats_window)
+        FramePacer._late_frame_count = 0
+        FramePacer._dropped_step_count = 0
+        FramePacer.set_fps(fps)
+
+    @staticmethod
+    def set_fps(fps: int):
+        FramePacer._target_frame_time = 1.0 / fps
+        FramePacer._next_deadline = FramePacer._frame_start + FramePacer._target_frame_time
+
+    @staticmethod
+    def get_fps() -> float:
+        if FramePacer.mode == PacingMode.CLOCK:
+            return FramePacer._clock.get_fps()
+        if not FramePacer._frame_times:
+            return 0.0
+        return len(FramePacer._frame_times) / sum(FramePacer._frame_times)
+
+    @staticmethod
+    def get_stats() -> FramePacingStats:
+        frame_times = FramePacer._frame_times
+        if not frame_times:
+            return FramePacingStats(0, 0.0, 0.0, 0.0, FramePacer._late_frame_count, FramePacer._dropped_step_count)
+
+        mean = sum(frame_times) / len(frame_times)
+        variance = sum((frame_time - mean) ** 2 for frame_time in frame_times) / len(frame_times)
+        return FramePacingStats(len(frame_times), mean, math.sqrt(variance), max(frame_times),
+                                FramePacer._late_frame_count, FramePacer._dropped_step_count)
+
+    @staticmethod
+    def _wait() -> float:
+        """Wait for the start of the next frame. Returns the time since the start of the previous frame in seconds."""
+        if FramePacer.mode == PacingMode.CLOCK:
+            delta_time = FramePacer._clock.tick(round(1.0 / FramePacer._target_frame_time)) / 1000.0
+            now = time.perf_counter()
+        elif FramePacer.mode == PacingMode.VSYNC and time.perf_counter() - FramePacer._frame_start >= FramePacer._refresh_period * 0.5:
+            # The flip already waited for the refresh. Snap to whole refresh periods to hide the timer noise.
+            now = time.perf_counter()
+            delta_time = now - FramePacer._frame_start
+            refresh_count = round(delta_time / FramePacer._refresh_period)
+            if refresh_count > 0 and abs(delta_time - refresh_count * FramePacer._refresh_period) < FramePacer._refresh_period * 0.1:
+                delta_time = refresh_count * FramePacer._refresh_period
+        else:
+            # `PRECISE`, or `VSYNC` when the flip did not block (e.g. vsync is not supported by the driver)
+            now = FramePacer._wait_until(FramePacer._next_deadline)
+            delta_time = now - FramePacer._frame_start
+
+        if now - FramePacer._next_deadline > FramePacer._target_frame_time:
+            # Too far behind to catch up. Start a new schedule instead of rushing the next frames
+            FramePacer._late_frame_count += 1
+            FramePacer._next_deadline = now + FramePacer._target_frame_time
+        else:
+            FramePacer._next_deadline += FramePacer._target_frame_time
+
+        FramePacer._frame_start = now
+        FramePacer._frame_times.append(delta_time)
+        return delta_time
+
+    @staticmethod
+    def _wait_until(deadline: float) -> float:
+        """Sleep until `spin_threshold` seconds before `deadline`, then spin. Returns the current time."""
+        now = time.perf_counter()
+        sleep_time = deadline - now - FramePacer.spin_threshold
+        if sleep_time > 0.0:
+            time.sleep(sleep_time)
+        now = time.perf_counter()
+        while now < deadline:
+            now = time.perf_counter()
+        return now
+
+    @staticmethod
+    def _add_dropped_steps(count: int):
+        FramePacer._dropped_step_count += count
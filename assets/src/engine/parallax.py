@@ -0,0 +1,59 @@
+import pygame
+from engine.math import Vec2
+
+
+class ParallaxLayer:
+    def __init__(self, image: pygame.Surface, depth: float, offset: Vec2 | None = None, velocity: Vec2 | None = None,
+                 repeat_x: bool = True, repeat_y: bool = False):
+        """A scrolling background layer. Rendered by a `ParallaxComponent`.
+
+        The (already scaled) image is tiled once into a strip that covers the screen plus one image along each repeated
+        axis, so scrolling is a single blit of the strip at an offset, whatever the resolution.
+
+        Params:
+            image (pygame.Surface): The image to tile. It should wrap around seamlessly along the repeated axes.
+            depth (float): How much the layer moves with the camera. `0.0` stays on the screen, `1.0` moves with the world.
+            offset (Vec2): The screen position of the image's top-left corner when the camera is at the world origin.
+            velocity (Vec2): Automatic scrolling in pixels per second, e.g. for drifting clouds.
+            repeat_x (bool): Tile the image horizontally.
+            repeat_y (bool): Tile the image vertically.
+        """
+        self.image = image
+        self.depth = depth
+        self.offset = offset if offset is not None else Vec2.zero()
+        self.velocity = velocity if velocity is not None else Vec2.zero()
+        self.repeat_x = repeat_x
+        self.repeat_y = repeat_y
+        self._scroll = Vec2.zero()  # The distance scrolled by `velocity`
+
+    def _build_strip(self, screen_size: tuple[int, int]) -> pygame.Surface:
+        image_width, image_height = self.image.get_size()
+        columns = screen_size[0] // image_width + 2 if self.repeat_x else 1
+        rows = screen_size[1] // image_height + 2 if self.repeat_y else 1
+        if columns == 1 and rows == 1:
+            return self.image
+
+        strip = pygame.Surface((columns * image_width, rows * image_height), pygame.SRCALPHA).convert_alpha()
+        strip.fill((0, 0, 0, 0))
+        strip.blits([(self.image, (column * image_width, row * image_height))
+                     for row in range(rows) for column in range(columns)], doreturn=False)
+        return strip
+
+    def _get_screen_position(self, camera_position: Vec2, delta_time: float) -> tuple[int, int]:
+        """Advance the automatic scrolling and get the screen position of the strip's top-left corner"""
+        image_width, image_height = self.image.get_size()
+        self._scroll.x += self.velocity.x * delta_time
+        self._scroll.y += self.velocity.y * delta_time
+        if self.repeat_x:
+            self._scroll.x %= image_width
+        if self.repeat_y:
+            self._scroll.y %= image_height
+        x = self.offset.x + self._scroll.x - camera_position.x * self.depth
+        y = self.offset.y + self._scroll.y - camera_position.y * self.depth
+
+        # Wrap into [-image size, 0), so that the strip always covers the screen
+        if self.repeat_x:
+            x = x % image_width - image_width
+        if self.repeat_y:
+            y = y % image_height - image_height
+        return (int(x), int(y))
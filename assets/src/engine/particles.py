@@ -0,0 +1,245 @@
+import pygame
+import numpy as np
+from engine.math import Vec2
+
+from typing import Sequence
+
+
+class ParticleEmitter:
+    def __init__(self, frames: Sequence[pygame.Surface], capacity: int, lifetime: tuple[float, float],
+                 frame_duration: float | None = None, gravity: Vec2 | None = None, damping: float = 0.0,
+                 sway: tuple[float, float] = (0.0, 0.0), seed: int | None = None):
+        """A `ParticleEmitter` stores its particles in NumPy arrays and updates and culls them in batches,
+        so the cost per frame does not grow with Python work per particle.
+
+        The live particles are packed at the front of the arrays. Dead particles are removed by compaction.
+
+        Params:
+            frames (Sequence[pygame.Surface]): The animation frames of a particle.
+            capacity (int): The budget of the emitter. Particles emitted beyond it are dropped.
+            lifetime (tuple[float, float]): The min and max lifetime of a particle in seconds.
+            frame_duration (float): The duration of an animation frame. If `None` the frames are spread over the lifetime.
+            gravity (Vec2): The acceleration applied to all particles.
+            damping (float): The fraction of the velocity lost per second.
+            sway (tuple[float, float]): The amplitude (pixels per second) and frequency (radians per second)
+                of a horizontal sine motion, e.g. for falling leaves.
+            seed (int): The seed of the random number generator.
+        """
+        self._frames = np.empty(len(frames), dtype=object)
+        self._frames[:] = list(frames)
+        self._frame_sizes = np.array([frame.get_size() for frame in frames], dtype=np.int32)
+        self._capacity = capacity
+        self.lifetime = lifetime
+        self.frame_duration = frame_duration
+        self.gravity = gravity if gravity is not None else Vec2.zero()
+        self.damping = damping
+        self.sway = sway
+        self.bounds: pygame.Rect | None = None  # Particles that leave these world space bounds die
+        self._rng = np.random.default_rng(seed)
+
+        self._positions = np.zeros((capacity, 2))  # The center of each particle
+        self._velocities = np.zeros((capacity, 2))
+        self._ages = np.zeros(capacity)
+        self._lifetimes = np.ones(capacity)
+        self._phases = np.zeros(capacity)  # The sway phase of each particle
+        self._frame_indices = np.zeros(capacity, dtype=np.int32)
+        self._count = 0
+        self._dropped_count = 0
+
+        # Continuous emission from a set of world space rects
+        self._spawn_rects = np.zeros((0, 4))
+        self._spawn_rate = 0.0
+        self._spawn_velocity = Vec2.zero()
+        self._spawn_velocity_spread = Vec2.zero()
+        self._spawn_accumulator = 0.0
+
+    def emit(self, count: int, position: Vec2, velocity: Vec2, velocity_spread: Vec2 | None = None,
+             position_spread: Vec2 | None = None) -> int:
+        """Emit a burst of particles. Returns the number of particles emitted, which is limited by the budget.
+
+        Params:
+            position (Vec2): The world space position of the burst.
+            velocity (Vec2): The mean velocity of the particles.
+            velocity_spread (Vec2): The velocity of each particle is randomized by up to +/- this much.
+            position_spread (Vec2): The position of each particle is randomized by up to +/- this much.
+        """
+        start, end = self._reserve(count)
+        if start == end:
+            return 0
+
+        count = end - start
+        self._positions[start:end] = position
+        if position_spread is not None:
+            self._positions[start:end] += (self._rng.random((count, 2)) * 2.0 - 1.0) * position_spread
+        self._init_particles(start, end, velocity, velocity_spread)
+        return count
+
+    def emit_in_rects(self, count: int, rects: np.ndarray, velocity: Vec2, velocity_spread: Vec2 | None = None) -> int:
+        """Emit particles at random positions inside randomly picked rects. Returns the number of particles emitted.
+
+        Params:
+            rects (np.ndarray): The world space rects as an array of shape (n, 4).
+        """
+        if len(rects) == 0:
+            return 0
+        start, end = self._reserve(count)
+        if start == end:
+            return 0
+
+        count = end - start
+        picked_rects = rects[self._rng.integers(len(rects), size=count)]
+        self._positions[start:end] = picked_rects[:, :2] + self._rng.random((count, 2)) * picked_rects[:, 2:]
+        self._init_particles(start, end, velocity, velocity_spread)
+        return count
+
+    def set_spawn_rects(self, rects: Sequence[pygame.Rect], rate: float, velocity: Vec2, velocity_spread: Vec2 | None = None):
+        """Emit particles continuously inside `rects` (e.g. leaves falling from trees).
+
+        Params:
+            rate (float): The number of particles emitted per second per rect.
+        """
+        self._spawn_rects = np.array([tuple(rect) for rect in rects], dtype=float).reshape(-1, 4)
+        self._spawn_rate = rate
+        self._spawn_velocity = velocity
+        self._spawn_velocity_spread = velocity_spread if velocity_spread is not None else Vec2.zero()
+
+    def clear(self):
+        self._count = 0
+
+    def get_count(self) -> int:
+        return self._count
+
+    def get_capacity(self) -> int:
+        return self._capacity
+
+    def get_dropped_count(self) -> int:
+        """How many particles were not emitted because the budget was exhausted"""
+        return self._dropped_count
+
+    def _reserve(self, count: int) -> tuple[int, int]:
+        start = self._count
+        end = min(start + count, self._capacity, start + ParticleSystem._get_free_budget())
+        self._dropped_count += count - (end - start)
+        self._count = end
+        return start, end
+
+    def _init_particles(self, start: int, end: int, velocity: Vec2, velocity_spread: Vec2 | None):
+        count = end - start
+        self._velocities[start:end] = velocity
+        if velocity_spread is not None:
+            self._velocities[start:end] += (self._rng.random((count, 2)) * 2.0 - 1.0) * velocity_spread
+        self._ages[start:end] = 0.0
+        self._lifetimes[start:end] = self._rng.uniform(self.lifetime[0], self.lifetime[1], count)
+        self._phases[start:end] = self._rng.uniform(0.0, 2.0 * np.pi, count)
+        self._frame_indices[start:end] = 0
+
+    def _update(self, delta_time: float):
+        if self._spawn_rate > 0.0 and len(self._spawn_rects):
+            self._spawn_accumulator += self._spawn_rate * len(self._spawn_rects) * delta_time
+            spawn_count = int(self._spawn_accumulator)
+            if spawn_count:
+                self._spawn_accumulator -= spawn_count
+                self.emit_in_rects(spawn_count, self._spawn_rects, self._spawn_velocity, self._spawn_velocity_spread)
+
+        count = self._count
+        if count == 0:
+            return
+
+        positions = self._positions[:count]
+        velocities = self._velocities[:count]
+        ages = self._ages[:count]
+
+        velocities += (self.gravity.x * delta_time, self.gravity.y * delta_time)
+        if self.damping > 0.0:
+            velocities *= max(0.0, 1.0 - self.damping * delta_time)
+        positions += velocities * delta_time
+        sway_amplitude, sway_frequency = self.sway
+        if sway_amplitude != 0.0:
+            positions[:, 0] += np.sin(ages * sway_frequency + self._phases[:count]) * (sway_amplitude * delta_time)
+        ages += delta_time
+
+        alive = ages < self._lifetimes[:count]
+        if self.bounds is not None:
+            bounds = self.bounds
+            alive &= (positions[:, 0] >= bounds.left) & (positions[:, 0] < bounds.right)
+            alive &= (positions[:, 1] >= bounds.top) & (positions[:, 1] < bounds.bottom)
+        if not alive.all():
+            self._compact(alive)
+            count = self._count
+
+        frame_count = len(self._frames)
+        if self.frame_duration is None:
+            frame_indices = self._ages[:count] / self._lifetimes[:count] * frame_count
+        else:
+            frame_indices = self._ages[:count] / self.frame_duration
+        np.minimum(frame_indices, frame_count - 1, out=frame_indices)
+        self._frame_indices[:count] = frame_indices
+
+    def _compact(self, alive: np.ndarray):
+        """Move the live particles to the front of the arrays"""
+        count = int(np.count_nonzero(alive))
+        for array in (self._positions, self._velocities, self._ages, self._lifetimes, self._phases):
+            array[:count] = array[:self._count][alive]
+        self._count = count
+
+    def _get_render_items(self, view_rect: pygame.Rect | None) -> list[tuple[pygame.Surface, list[int]]]:
+        """Get the visible particles as (surface, screen space rect) pairs.
+
+        Params:
+            view_rect (pygame.Rect): The world space rect that is visible. If `None` the positions are in screen space.
+        """
+        count = self._count
+        if count == 0:
+            return list()
+
+        frame_indices = self._frame_indices[:count]
+        sizes = self._frame_sizes[frame_indices]
+        top_lefts = self._positions[:count] - sizes / 2
+        if view_rect is not None:
+            top_lefts -= view_rect.topleft
+            screen_size = view_rect.size
+        else:
+            screen_size = pygame.display.get_surface().get_size()
+
+        visible = ((top_lefts[:, 0] < screen_size[0]) & (top_lefts[:, 1] < screen_size[1]) &
+                   (top_lefts[:, 0] + sizes[:, 0] > 0) & (top_lefts[:, 1] + sizes[:, 1] > 0))
+        rects = np.empty((int(np.count_nonzero(visible)), 4), dtype=np.int32)
+        rects[:, :2] = top_lefts[visible]
+        rects[:, 2:] = sizes[visible]
+        return list(zip(self._frames[frame_indices[visible]].tolist(), rects.tolist()))
+
+
+class ParticleSystem:
+    """Keeps track of the emitters in play and of the total particle budget"""
+    max_particles: int  # The total budget of all emitters in play
+
+    _emitters: list[ParticleEmitter]
+
+    @staticmethod
+    def init(max_particles: int):
+        ParticleSystem.max_particles = max_particles
+        ParticleSystem._emitters = list()
+
+    @staticmethod
+    def get_emitters() -> list[ParticleEmitter]:
+        return ParticleSystem._emitters
+
+    @staticmethod
+    def get_particle_count() -> int:
+        return sum(emitter.get_count() for emitter in ParticleSystem._emitters)
+
+    @staticmethod
+    def get_dropped_count() -> int:
+        return sum(emitter.get_dropped_count() for emitter in ParticleSystem._emitters)
+
+    @staticmethod
+    def _get_free_budget() -> int:
+        return max(0, ParticleSystem.max_particles - ParticleSystem.get_particle_count())
+
+    @staticmethod
+    def _add_emitter(emitter: ParticleEmitter):
+        ParticleSystem._emitters.append(emitter)
+
+    @staticmethod
+    def _remove_emitter(emitter: ParticleEmitter):
+        ParticleSystem._emitters.remove(emitter)
@@ -1,31 +1,87 @@
+import math
+from engine.time import Time
+from engine.input import Input
+from engine.pacing import FramePacer
 from engine.entity import Entity
+from engine.broadphase import Broadphase
+from engine.bodystorage import BodyStorage
+from engine.tilecollision import TileCollision
 
 from typing import Iterable
 
 
 class Physics:
+    snapshot_fields = ("_accumulator",)
+
     _accumulator: float  # Used to accumulate how many physics ticks should happen each frame
     _interpolation_fraction: float
+    _substep_count: int  # How many physics ticks happened in the last frame
+    _dropped_step_count: int
     fixed_delta_time: float
     interpolation: bool
+    max_substeps: int  # The max number of physics ticks per frame. The simulation falls behind instead of spiraling
 
     @staticmethod
-    def init(fixed_delta_time: float, interpolation: bool):
+    def init(fixed_delta_time: float, interpolation: bool, max_substeps: int):
         Physics._accumulator = 0.0
+        Physics._substep_count = 0
+        Physics._dropped_step_count = 0
         Physics.fixed_delta_time = fixed_delta_time
         Physics.interpolation = interpolation
+        Physics.max_substeps = max_substeps
 
     @staticmethod
     def _tick(entities: Iterable[Entity], frame_delta_time: float):
         Physics._accumulator += frame_delta_time
+        Physics._substep_count = 0
+        TileCollision._begin_frame()
+
+        # The ticks of this frame simulate the time up to `Physics._accumulator` seconds before the start of the frame.
+        # In event-driven input mode, the input events are dispatched before the tick whose time window they fall into.
+        frame_timestamp = Time.get_frame_timestamp()
+        time_scale = Time.get_time_scale()
+        tick_end_offset = Physics.fixed_delta_time - Physics._accumulator
 
-        while Physics._accumulator >= Physics.fixed_delta_time:
+        while Physics._accumulator >= Physics.fixed_delta_time and Physics._substep_count < Physics.max_substeps:
+            if Input.event_driven:
+                is_last_tick = (Physics._accumulator - Physics.fixed_delta_time < Physics.fixed_delta_time or
+                                Physics._substep_count + 1 >= Physics.max_substeps)
+                if is_last_tick:
+                    # Events taken from pygame's queue after the start of the frame are clamped into the last tick
+                    Input._dispatch_queued_events(math.inf)
+                else:
+                    tick_end_timestamp = (frame_timestamp + tick_end_offset / time_scale) if time_scale > 0.0 else frame_timestamp
+                    Input._dispatch_queued_events(tick_end_timestamp)
+                    tick_end_offset += Physics.fixed_delta_time
+            if BodyStorage.enabled:
+                BodyStorage._store_prev_positions()
             for entity in entities:
                 entity._physics_tick(Physics.fixed_delta_time)
+            if BodyStorage.enabled:
+                BodyStorage._integrate(Physics.fixed_delta_time)
+            Broadphase._update()
+            Broadphase._dispatch_overlaps()
             Physics._accumulator -= Physics.fixed_delta_time
+            Physics._substep_count += 1
+
+        if Physics._accumulator >= Physics.fixed_delta_time:
+            # Drop the steps over the limit, but keep the fraction for the interpolation
+            dropped_step_count = int(Physics._accumulator / Physics.fixed_delta_time)
+            Physics._accumulator -= dropped_step_count * Physics.fixed_delta_time
+            Physics._dropped_step_count += dropped_step_count
+            FramePacer._add_dropped_steps(dropped_step_count)
 
         Physics._interpolation_fraction = (Physics._accumulator / Physics.fixed_delta_time) if Physics.interpolation else 1.0
 
     @staticmethod
     def get_interpolation_fraction() -> float:
         return Physics._interpolation_fraction
+
+    @staticmethod
+    def get_substep_count() -> int:
+        return Physics._substep_count
+
+    @staticmethod
+    def get_dropped_step_count() -> int:
+        """How many physics ticks were dropped by the `max_substeps` limit since the start"""
+        return Physics._dropped_step_count
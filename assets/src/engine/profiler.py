@@ -0,0 +1,179 @@
+import enum
+import json
+import time
+import pygame
+import pathlib
+from engine.color import Color
+
+from typing import Any
+
+
+class ProfilerPhase(enum.IntEnum):
+    """The phases of a frame, in the order the game loop runs them. The lowercase name is used in the exports."""
+    EVENTS = 0
+    TIME = 1
+    SPAWN = 2
+    INPUT = 3
+    TICK = 4
+    PHYSICS = 5
+    RENDER_TICK = 6
+    RENDER = 7
+    PRESENT = 8
+
+
+PHASE_NAMES = tuple(phase.name.lower() for phase in ProfilerPhase)
+PHASE_COLORS = (
+    Color(128, 128, 128),  # events
+    Color(64, 64, 64),  # time
+    Color(255, 255, 255),  # spawn
+    Color(255, 0, 255),  # input
+    Color(0, 0, 255),  # tick
+    Color(255, 165, 0),  # physics
+    Color(0, 255, 255),  # render_tick
+    Color(0, 255, 0),  # render
+    Color(255, 255, 0),  # present
+)
+GRAPH_HEIGHT = 100  # The height of the on-screen graph in pixels. The target frame time is drawn at half of it
+GRAPH_BAR_WIDTH = 2
+
+
+class FrameRecord:
+    __slots__ = ("frame", "start_time", "phase_times", "substeps", "entity_times")
+
+    def __init__(self):
+        """The timings of a single frame. All times are in seconds."""
+        self.frame = 0
+        self.start_time = 0.0
+        self.phase_times = [0.0] * len(ProfilerPhase)
+        self.substeps = 0
+        self.entity_times: dict[str, float] = dict()  # Time spent in `_tick` and `_render_tick` by entity class name
+
+    def get_frame_time(self) -> float:
+        return sum(self.phase_times)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "frame": self.frame,
+            "start_time": self.start_time,
+            "phases": dict(zip(PHASE_NAMES, self.phase_times)),
+            "substeps": self.substeps,
+            "entities": dict(self.entity_times),
+        }
+
+
+class Profiler:
+    """Records per-phase frame timings into a fixed-size ring buffer.
+
+    The game loop checks `Profiler.enabled` once per frame, so a disabled profiler costs a single branch.
+    """
+    enabled: bool
+    show_graph: bool
+
+    _records: list[FrameRecord]
+    _next_index: int  # The index of the record that will be written next
+    _frame_count: int
+    _start_time: float
+    _last_mark_time: float
+    _current: FrameRecord  # The frame being recorded. It only enters the ring buffer when the frame ends
+
+    @staticmethod
+    def init(enabled: bool, capacity: int, show_graph: bool):
+        Profiler.enabled = enabled
+        Profiler.show_graph = show_graph
+        Profiler._records = [FrameRecord() for _ in range(capacity)]
+        Profiler._next_index = 0
+        Profiler._frame_count = 0
+        Profiler._start_time = time.perf_counter()
+        Profiler._last_mark_time = Profiler._start_time
+        Profiler._current = FrameRecord()
+
+    @staticmethod
+    def get_frames() -> list[FrameRecord]:
+        """Get the recorded frames, oldest first"""
+        capacity = len(Profiler._records)
+        count = min(Profiler._frame_count, capacity)
+        first_index = (Profiler._next_index - count) % capacity
+        return [Profiler._records[(first_index + i) % capacity] for i in range(count)]
+
+    @staticmethod
+    def clear():
+        Profiler._next_index = 0
+        Profiler._frame_count = 0
+
+    @staticmethod
+    def _begin_frame():
+        """Start recording a frame. A frame that is not ended (e.g. the game loop stops) is not recorded."""
+        record = Profiler._current
+        record.frame = Profiler._frame_count
+        record.substeps = 0
+        record.entity_times.clear()
+        Profiler._last_mark_time = time.perf_counter()
+        record.start_time = Profiler._last_mark_time - Profiler._start_time
+
+    @staticmethod
+    def _mark(phase: int):
+        """Record the time since the previous mark as the duration of `phase`"""
+        now = time.perf_counter()
+        Profiler._current.phase_times[phase] = now - Profiler._last_mark_time
+        Profiler._last_mark_time = now
+
+    @staticmethod
+    def _add_entity_time(entity_class_name: str, seconds: float):
+        entity_times = Profiler._current.entity_times
+        entity_times[entity_class_name] = entity_times.get(entity_class_name, 0.0) + seconds
+
+    @staticmethod
+    def _end_frame(substeps: int):
+        Profiler._current.substeps = substeps
+        # Swap the frame into the ring buffer. The oldest record is reused for the next frame
+        records = Profiler._records
+        records[Profiler._next_index], Profiler._current = Profiler._current, records[Profiler._next_index]
+        Profiler._next_index = (Profiler._next_index + 1) % len(Profiler._records)
+        Profiler._frame_count += 1
+
+    @staticmethod
+    def _draw_graph(surface: pygame.Surface, target_frame_time: float) -> pygame.Rect:
+        """Draw the recorded frames as stacked bars in the bottom-left corner of `surface`. Returns the area drawn to."""
+        pixels_per_second = (GRAPH_HEIGHT / 2) / target_frame_time
+        bottom = surface.get_height()
+        target_y = bottom - GRAPH_HEIGHT / 2
+        top = target_y
+        x = 0
+        for record in Profiler.get_frames()[-(surface.get_width() // GRAPH_BAR_WIDTH):]:
+            y = bottom
+            for phase in ProfilerPhase:
+                height = record.phase_times[phase] * pixels_per_second
+                if height >= 1.0:
+                    surface.fill(PHASE_COLORS[phase], (x, y - height, GRAPH_BAR_WIDTH, height))
+                y -= height
+            top = min(top, y)
+            x += GRAPH_BAR_WIDTH
+
+        pygame.draw.line(surface, Color.red(), (0, target_y), (x, target_y))
+        return pygame.Rect(0, int(top), x, bottom - int(top) + 1).clip(surface.get_rect())
+
+    @staticmethod
+    def export_json(path: str | pathlib.Path):
+        """Write the recorded frames to a JSON file"""
+        with open(path, "w") as file_stream:
+            json.dump([record.to_dict() for record in Profiler.get_frames()], file_stream)
+
+    @staticmethod
+    def export_chrome_trace(path: str | pathlib.Path):
+        """Write the recorded frames in the Chrome trace event format (chrome://tracing, Perfetto)"""
+        events: list[dict[str, Any]] = list()
+        for record in Profiler.get_frames():
+            timestamp = record.start_time * 1e6
+            frame_time = record.get_frame_time()
+            events.append({"name": f"frame {record.frame}", "ph": "X", "pid": 0, "tid": 0,
+                           "ts": timestamp, "dur": frame_time * 1e6, "args": record.entity_times})
+            for phase in ProfilerPhase:
+                duration = record.phase_times[phase] * 1e6
+                events.append({"name": PHASE_NAMES[phase], "ph": "X", "pid": 0, "tid": 0,
+                               "ts": timestamp, "dur": duration})
+                timestamp += duration
+            events.append({"name": "substeps", "ph": "C", "pid": 0, "tid": 0,
+                           "ts": record.start_time * 1e6, "args": {"substeps": record.substeps}})
+
+        with open(path, "w") as file_stream:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file_stream)
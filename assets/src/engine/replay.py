@@ -0,0 +1,162 @@
+import sys
+import zlib
+import struct
+import pathlib
+from array import array
+from enum import Enum
+from engine.input import Input
+
+
+REPLAY_FILE_MAGIC = b"NRPL"
+REPLAY_FILE_VERSION = 1
+
+# magic, version, key count, frame count
+HEADER = struct.Struct("<4sHHI")
+
+# A replay file stores the input of a session frame by frame:
+#
+#     header | key names | zlib(delta times | pressed key masks)
+#
+# The key names are length-prefixed UTF-8 strings in the bit order of the masks, so a replay can only be played
+# with the same key bindings. The delta times are float64 and the masks uint64, one per frame, in
+# little-endian byte order. Masks rarely change between frames, so they compress well.
+
+
+class ReplayMode(Enum):
+    NONE = 0
+    RECORD = 1
+    PLAY = 2
+
+
+class Replay:
+    """Records the pressed keys and the delta time of every frame, and plays them back.
+
+    A replay feeds `Time._tick()` and `Input._tick()` with the recorded values, so a session that starts from
+    the same state is simulated exactly the same way. In headless runs the replay is played as fast as possible.
+    Keys are recorded and replayed with per-frame polling, so a replay cannot be recorded with event-driven input.
+    While recording or playing, the game loop waits for the streaming loads, so that levels are switched on the same frame.
+    """
+    _mode = ReplayMode.NONE
+    _key_names: list[str] = list()
+    _delta_times = array("d")
+    _pressed_keys_masks = array("Q")
+    _frame = 0
+
+    @staticmethod
+    def start_recording(key_names: list[str]):
+        """
+        Params:
+            key_names (list[str]): The names of the keys in the bit order of the pressed keys masks.
+        """
+        assert len(key_names) <= 64, "The pressed keys masks are stored as uint64"
+        if Input.event_driven:
+            raise RuntimeError("Replays cannot be recorded with event-driven input, as the keys are only stored once per frame")
+        Replay._mode = ReplayMode.RECORD
+        Replay._key_names = list(key_names)
+        Replay._delta_times = array("d")
+        Replay._pressed_keys_masks = array("Q")
+        Replay._frame = 0
+
+    @staticmethod
+    def stop_recording(path: str | pathlib.Path):
+        """Stop recording and save the replay file"""
+        assert Replay._mode == ReplayMode.RECORD
+        Replay._mode = ReplayMode.NONE
+        Replay.save(path)
+
+    @staticmethod
+    def save(path: str | pathlib.Path):
+        delta_times = array("d", Replay._delta_times)
+        pressed_keys_masks = array("Q", Replay._pressed_keys_masks)
+        if sys.byteorder != "little":
+            delta_times.byteswap()
+            pressed_keys_masks.byteswap()
+
+        data = bytearray(HEADER.pack(REPLAY_FILE_MAGIC, REPLAY_FILE_VERSION, len(Replay._key_names), len(delta_times)))
+        for key_name in Replay._key_names:
+            name = key_name.encode("utf-8")
+            data += struct.pack("<B", len(name)) + name
+        data += zlib.compress(delta_times.tobytes() + pressed_keys_masks.tobytes())
+
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as file_stream:
+            file_stream.write(data)
+
+    @staticmethod
+    def start_playback(path: str | pathlib.Path, key_names: list[str]):
+        """
+        Load a replay file and play it from the first frame.
+
+        Args:
+            path: The replay file path.
+            key_names: The names of the keys in the bit order of the pressed keys masks. They must match the recorded ones.
+        """
+        with open(path, "rb") as file_stream:
+            data = file_stream.read()
+
+        magic, version, key_count, frame_count = HEADER.unpack_from(data)
+        if magic != REPLAY_FILE_MAGIC or version != REPLAY_FILE_VERSION:
+            raise ValueError(f"Not a version {REPLAY_FILE_VERSION} replay file: {path}")
+
+        offset = HEADER.size
+        recorded_key_names: list[str] = list()
+        for _ in range(key_count):
+            length = data[offset]
+            recorded_key_names.append(data[offset + 1:offset + 1 + length].decode("utf-8"))
+            offset += 1 + length
+        if recorded_key_names != list(key_names):
+            raise ValueError(f"The replay was recorded with different key bindings: {path}")
+
+        payload = zlib.decompress(data[offset:])
+        delta_times = array("d", payload[:frame_count * 8])
+        pressed_keys_masks = array("Q", payload[frame_count * 8:])
+        if sys.byteorder != "little":
+            delta_times.byteswap()
+            pressed_keys_masks.byteswap()
+
+        Replay._mode = ReplayMode.PLAY
+        Replay._key_names = recorded_key_names
+        Replay._delta_times = delta_times
+        Replay._pressed_keys_masks = pressed_keys_masks
+        Replay._frame = 0
+
+    @staticmethod
+    def get_mode() -> ReplayMode:
+        return Replay._mode
+
+    @staticmethod
+    def is_playing() -> bool:
+        return Replay._mode == ReplayMode.PLAY
+
+    @staticmethod
+    def is_finished() -> bool:
+        """`True` when a playback has played all its frames"""
+        return Replay._mode == ReplayMode.PLAY and Replay._frame >= len(Replay._delta_times)
+
+    @staticmethod
+    def get_frame() -> int:
+        """The number of frames recorded or played so far"""
+        return Replay._frame
+
+    @staticmethod
+    def get_frame_count() -> int:
+        return len(Replay._delta_times)
+
+    @staticmethod
+    def _get_delta_time() -> float:
+        """The recorded delta time of the current playback frame"""
+        return Replay._delta_times[Replay._frame]
+
+    @staticmethod
+    def _get_pressed_keys_mask() -> int:
+        """The recorded pressed keys of the current playback frame"""
+        return Replay._pressed_keys_masks[Replay._frame]
+
+    @staticmethod
+    def _end_frame(delta_time: float, pressed_keys_mask: int):
+        """Record the input of the frame, or advance the playback"""
+        if Replay._mode == ReplayMode.RECORD:
+            Replay._delta_times.append(delta_time)
+            Replay._pressed_keys_masks.append(pressed_keys_mask)
+        Replay._frame += 1
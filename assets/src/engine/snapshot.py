@@ -0,0 +1,196 @@
+import time
+import numpy as np
+from engine.math import Vec2
+from engine.time import Time
+from engine.input import Input
+from engine.physics import Physics
+from engine.bodystorage import BodyStorage
+from engine.broadphase import Broadphase
+from engine.entity import EntitySpawner
+
+from typing import Any
+
+
+# Field kinds
+FIELD_SCALAR = 0  # bool, int or float
+FIELD_VEC2 = 1
+FIELD_DICT = 2  # A dict of floats with fixed keys
+FIELD_ARRAY = 3  # A float64 NumPy array with a fixed shape
+
+MAX_EXACT_INT = 1 << 53  # Larger ints do not survive a round trip through float64
+
+
+class SnapshotField:
+    __slots__ = ("owner", "name", "kind", "type", "offset", "length")
+
+    def __init__(self, owner: Any, name: str, kind: int, type: type, offset: int, length: int):
+        self.owner = owner
+        self.name = name
+        self.kind = kind
+        self.type = type  # The type of a scalar, to restore it as bool/int/float
+        self.offset = offset
+        self.length = length
+
+
+class SnapshotStats:
+    def __init__(self, byte_size: int, field_count: int, entity_count: int, save_time: float, restore_time: float):
+        self.byte_size = byte_size
+        self.field_count = field_count
+        self.entity_count = entity_count
+        self.save_time = save_time  # Of the last save, in seconds
+        self.restore_time = restore_time  # Of the last restore, in seconds
+
+    def __str__(self):
+        return (f"[SnapshotStats: bytes={self.byte_size} | fields={self.field_count} | entities={self.entity_count} | "
+                f"save={self.save_time * 1000000.0:.1f}us | restore={self.restore_time * 1000000.0:.1f}us]")
+
+
+class Snapshot:
+    # The static classes whose `snapshot_fields` are saved with the entities
+    static_classes: list[type] = [Time, Physics, Input, BodyStorage]
+
+    def __init__(self, capacity: int = 1024):
+        """A `Snapshot` saves the simulation state of the world into a preallocated float64 buffer,
+        and restores it into the same objects.
+
+        Entities, components and the `static_classes` opt in by declaring the names of their state attributes
+        in a `snapshot_fields` class attribute. The fields of base classes are included.
+        A field can hold a bool/int/float, a `Vec2`, a dict of floats or a float64 NumPy array.
+
+        Only the state of the entities that are in play when saving is captured. The set of entities itself is not:
+        entities spawned after the save stay in play after a restore, and destroyed entities are not respawned.
+
+        Params:
+            capacity (int): The initial size of the buffer in floats. It grows if the state does not fit.
+        """
+        self._buffer = np.zeros(capacity)
+        self._size = 0
+        self._scalar_size = 0  # The scalar and `Vec2` fields come first, so they are copied with one slice assignment
+        self._fields: list[SnapshotField] = list()
+        self._entity_count = 0
+        self._generation = -1  # The `EntitySpawner` generation the layout was built for
+        self._is_saved = False
+        self._save_time = 0.0
+        self._restore_time = 0.0
+
+    def save(self):
+        start_time = time.perf_counter()
+        if self._generation != EntitySpawner._generation:
+            self._build_layout()
+
+        values: list[float] = list()
+        arrays: list[SnapshotField] = list()
+        for field in self._fields:
+            value = getattr(field.owner, field.name)
+            kind = field.kind
+            if kind == FIELD_SCALAR:
+                values.append(value)
+            elif kind == FIELD_VEC2:
+                values.append(value.x)
+                values.append(value.y)
+            elif kind == FIELD_DICT:
+                values.extend(value.values())
+            elif value.size == field.length:
+                arrays.append(field)
+            else:
+                # The array was reallocated with a different size (e.g. the `BodyStorage` grew)
+                self._generation = -1
+                self.save()
+                return
+
+        buffer = self._buffer
+        buffer[:self._scalar_size] = values
+        for field in arrays:
+            buffer[field.offset:field.offset + field.length] = getattr(field.owner, field.name).reshape(-1)
+
+        self._is_saved = True
+        self._save_time = time.perf_counter() - start_time
+
+    def restore(self):
+        assert self._is_saved, "Nothing to restore"
+        start_time = time.perf_counter()
+        buffer = self._buffer
+        values = buffer[:self._scalar_size].tolist()
+        for field in self._fields:
+            kind = field.kind
+            offset = field.offset
+            if kind == FIELD_SCALAR:
+                setattr(field.owner, field.name, field.type(values[offset]))
+            elif kind == FIELD_VEC2:
+                # A new vector, as vectors can be shared (e.g. a previous position with the position passed to `teleport()`)
+                setattr(field.owner, field.name, Vec2(values[offset], values[offset + 1]))
+            elif kind == FIELD_DICT:
+                dictionary = getattr(field.owner, field.name)
+                for key, value in zip(dictionary, values[offset:offset + field.length]):
+                    dictionary[key] = value
+            else:
+                array = getattr(field.owner, field.name)
+                array.reshape(-1)[:] = buffer[offset:offset + field.length]
+
+        Broadphase._mark_all_moved()
+        self._restore_time = time.perf_counter() - start_time
+
+    def is_saved(self) -> bool:
+        return self._is_saved
+
+    def get_byte_size(self) -> int:
+        """The size of the saved state in bytes"""
+        return self._size * self._buffer.itemsize
+
+    def get_stats(self) -> SnapshotStats:
+        return SnapshotStats(self.get_byte_size(), len(self._fields), self._entity_count, self._save_time, self._restore_time)
+
+    def _build_layout(self):
+        owners: list[Any] = list(Snapshot.static_classes)
+        entities = EntitySpawner.get_entities()
+        for entity in entities:
+            owners.append(entity)
+            owners.extend(entity._components)
+
+        scalar_fields: list[SnapshotField] = list()
+        array_fields: list[SnapshotField] = list()
+        scalar_size = 0
+        for owner in owners:
+            for name in _get_snapshot_fields(owner if isinstance(owner, type) else type(owner)):
+                value = getattr(owner, name)
+                if isinstance(value, Vec2):
+                    scalar_fields.append(SnapshotField(owner, name, FIELD_VEC2, Vec2, scalar_size, 2))
+                    scalar_size += 2
+                elif isinstance(value, (bool, int, float)):
+                    assert not isinstance(value, int) or abs(value) < MAX_EXACT_INT, f"Int field too large: {name}"
+                    scalar_fields.append(SnapshotField(owner, name, FIELD_SCALAR, type(value), scalar_size, 1))
+                    scalar_size += 1
+                elif isinstance(value, dict):
+                    scalar_fields.append(SnapshotField(owner, name, FIELD_DICT, float, scalar_size, len(value)))
+                    scalar_size += len(value)
+                elif isinstance(value, np.ndarray) and value.dtype == np.float64:
+                    array_fields.append(SnapshotField(owner, name, FIELD_ARRAY, float, 0, value.size))
+                else:
+                    raise TypeError(f"Unsupported snapshot field: {type(owner).__name__}.{name}")
+
+        size = scalar_size
+        for field in array_fields:
+            field.offset = size
+            size += field.length
+
+        if size > len(self._buffer):
+            self._buffer = np.zeros(max(size, len(self._buffer) * 2))
+        self._fields = scalar_fields + array_fields
+        self._size = size
+        self._scalar_size = scalar_size
+        self._entity_count = len(entities)
+        self._generation = EntitySpawner._generation
+
+
+_snapshot_fields_by_class: dict[type, tuple[str, ...]] = dict()
+
+
+def _get_snapshot_fields(cls: type) -> tuple[str, ...]:
+    """The `snapshot_fields` declared by a class and its base classes"""
+    fields = _snapshot_fields_by_class.get(cls)
+    if fields is None:
+        names: dict[str, None] = dict()
+        for base in reversed(cls.__mro__):
+            names.update(dict.fromkeys(base.__dict__.get("snapshot_fields", ())))
+        fields = _snapshot_fields_by_class[cls] = tuple(names)
+    return fields
@@ -0,0 +1,162 @@
+import traceback
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from engine.entity import Entity, EntitySpawner
+
+from typing import Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+class StreamingRequest(Generic[T]):
+    def __init__(self, future: "Future[T]", on_loaded: Callable[[T], None] | None,
+                 on_failed: Callable[[BaseException], None] | None):
+        """A load running on a streaming worker. Created by `Streaming.load_async()`."""
+        self._future = future
+        self._on_loaded = on_loaded
+        self._on_failed = on_failed
+        self._is_done = False
+
+    def is_done(self) -> bool:
+        """`True` once the main thread has taken the request: its result was handed over, it failed, or it was cancelled"""
+        return self._is_done
+
+    def is_failed(self) -> bool:
+        """`True` once the main thread has taken a load that raised an exception"""
+        return self._is_done and not self._future.cancelled() and self._future.exception() is not None
+
+    def get_result(self) -> T:
+        """Wait for the load to finish and get its result. Raises the exception of a failed load."""
+        return self._future.result()
+
+    def cancel(self) -> bool:
+        """Cancel the load if it has not started yet. Neither `on_loaded` nor `on_failed` is called for cancelled loads."""
+        return self._future.cancel()
+
+
+class StreamingStats:
+    def __init__(self, pending_loads: int, pending_spawns: int, completed_loads: int, failed_loads: int, spawned_entities: int):
+        self.pending_loads = pending_loads
+        self.pending_spawns = pending_spawns
+        self.completed_loads = completed_loads
+        self.failed_loads = failed_loads
+        self.spawned_entities = spawned_entities
+
+    def __str__(self):
+        return (f"[StreamingStats: pending_loads={self.pending_loads} | pending_spawns={self.pending_spawns} | "
+                f"completed_loads={self.completed_loads} | failed_loads={self.failed_loads} | "
+                f"spawned_entities={self.spawned_entities}]")
+
+
+class Streaming:
+    """Loads level data and assets on worker threads, so that level transitions do not stall the game loop.
+
+    Loads run on the workers and should only read and decode data: globals like `Graphics.scale`, surfaces and
+    entities belong to the main thread. Their results are handed over to the main thread at the start of a frame,
+    where `on_loaded` builds the entities from them, and entities added by `Streaming.add_entity()` enter play
+    at most `spawn_budget` per frame.
+    """
+    spawn_budget: int  # How many streamed entities can enter play per frame
+
+    _executor: ThreadPoolExecutor | None = None
+    _requests: deque[StreamingRequest] = deque()  # In submission order
+    _spawn_queue: deque[Entity] = deque()
+    _completed_load_count = 0
+    _failed_load_count = 0
+    _spawned_entity_count = 0
+
+    @staticmethod
+    def init(spawn_budget: int, worker_count: int = 1):
+        """
+        Params:
+            spawn_budget (int): How many streamed entities can enter play per frame.
+            worker_count (int): The number of worker threads.
+        """
+        Streaming.spawn_budget = spawn_budget
+        Streaming._executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="streaming")
+        Streaming._requests = deque()
+        Streaming._spawn_queue = deque()
+        Streaming._completed_load_count = 0
+        Streaming._failed_load_count = 0
+        Streaming._spawned_entity_count = 0
+
+    @staticmethod
+    def load_async(load: Callable[[], T], on_loaded: Callable[[T], None] | None = None,
+                   on_failed: Callable[[BaseException], None] | None = None) -> StreamingRequest[T]:
+        """Run `load` on a worker thread.
+
+        Params:
+            load (Callable[[], T]): Reads and decodes the data, e.g. loads a tilemap. It runs on a worker thread.
+            on_loaded (Callable[[T], None]): Called with the result on the main thread, at the start of the first frame
+                after the load finished. Results are handed over in submission order.
+            on_failed (Callable[[BaseException], None]): Called instead of `on_loaded` with the exception raised by the load.
+                If not set, the exception is printed and the game keeps running.
+        """
+        request = StreamingRequest(Streaming._executor.submit(load), on_loaded, on_failed)
+        Streaming._requests.append(request)
+        return request
+
+    @staticmethod
+    def add_entity(entity: Entity):
+        """Spawn an entity built from the result of a load. Like with `EntitySpawner.spawn_entity()`, `entity.enter_play()`
+        is called on a later frame, but it may be deferred by a few frames to stay within the spawn budget.
+        Streamed entities enter play in the order they were added.
+        """
+        Streaming._spawn_queue.append(entity)
+
+    @staticmethod
+    def is_idle() -> bool:
+        """`True` when there are no loads running and no streamed entities waiting to enter play"""
+        return len(Streaming._requests) == 0 and len(Streaming._spawn_queue) == 0
+
+    @staticmethod
+    def get_stats() -> StreamingStats:
+        return StreamingStats(len(Streaming._requests), len(Streaming._spawn_queue), Streaming._completed_load_count,
+                              Streaming._failed_load_count, Streaming._spawned_entity_count)
+
+    @staticmethod
+    def _tick(wait_for_loads: bool = False):
+        """Hand over the finished loads and pass the next streamed entities to the `EntitySpawner`.
+        Called at the start of a frame, before the spawn requests are resolved.
+
+        Params:
+            wait_for_loads (bool): Wait for the running loads, so that every load is handed over on the frame after it
+                was requested, e.g. while a replay is recorded or played.
+        """
+        requests = Streaming._requests
+        while requests:
+            if not requests[0]._future.done():
+                if not wait_for_loads:
+                    break
+                wait((requests[0]._future,))
+            request = requests.popleft()
+            request._is_done = True
+            future = request._future
+            if future.cancelled():
+                continue
+
+            exception = future.exception()
+            if exception is not None:
+                Streaming._failed_load_count += 1
+                if request._on_failed is not None:
+                    request._on_failed(exception)
+                else:
+                    traceback.print_exception(exception)
+                continue
+
+            Streaming._completed_load_count += 1
+            if request._on_loaded is not None:
+                request._on_loaded(future.result())
+
+        spawn_queue = Streaming._spawn_queue
+        for _ in range(min(Streaming.spawn_budget, len(spawn_queue))):
+            EntitySpawner._entity_spawn_requests.add(spawn_queue.popleft())
+            Streaming._spawned_entity_count += 1
+
+    @staticmethod
+    def _shutdown():
+        """Cancel the loads that have not started and wait for the running ones"""
+        if Streaming._executor is not None:
+            Streaming._executor.shutdown(wait=True, cancel_futures=True)
+            Streaming._executor = None
@@ -0,0 +1,136 @@
+import math
+import enum
+import numpy as np
+from engine.tilemap import Tilemap
+
+from typing import Iterable
+
+
+CONTACT_EPSILON = 1e-4  # Edges closer than this to a cell boundary are on the boundary
+
+
+class TileContact(enum.IntFlag):
+    NONE = 0
+    GROUND = 1
+    CEILING = 2
+    WALL_LEFT = 4
+    WALL_RIGHT = 8
+
+
+class TileCollision:
+    """Resolves the movement of rigid bodies against the solid cells of a tilemap.
+
+    Bodies are moved one axis at a time. Each move only tests the cells that the leading edge of the body sweeps
+    through, which are looked up directly in a flat grid, so the cost per body depends on its size and speed,
+    not on the size of the level.
+    """
+    _tilemap: Tilemap | None = None
+    _solid: bytes = b""  # 1 for solid cells, row-major
+    _width = 0
+    _height = 0
+    _origin_x = 0
+    _origin_y = 0
+    _cell_size = 1.0
+    _frame = 0  # Counts the physics frames, so that bodies can gather their contacts over the ticks of a frame
+
+    @staticmethod
+    def set_tilemap(tilemap: Tilemap, solid_types: Iterable[str]):
+        """
+        Params:
+            tilemap (Tilemap): The tilemap to collide with. Only one tilemap is collided with at a time.
+            solid_types (Iterable[str]): The tile types that block bodies.
+        """
+        solid_types = set(solid_types)
+        solid_indices = [i for i, tile_type in enumerate(tilemap.tile_types) if tile_type in solid_types]
+        TileCollision._tilemap = tilemap
+        TileCollision._solid = np.isin(tilemap.get_type_grid(), solid_indices).astype(np.uint8).tobytes()
+        TileCollision._width = tilemap.width
+        TileCollision._height = tilemap.height
+        TileCollision._origin_x, TileCollision._origin_y = tilemap.origin
+        TileCollision._cell_size = tilemap.cell_size
+
+    @staticmethod
+    def clear(tilemap: Tilemap | None = None):
+        """Stop colliding with tiles. If `tilemap` is set, only if it is the current one."""
+        if tilemap is not None and tilemap is not TileCollision._tilemap:
+            return
+        TileCollision._tilemap = None
+        TileCollision._solid = b""
+        TileCollision._width = 0
+        TileCollision._height = 0
+
+    @staticmethod
+    def get_tilemap() -> Tilemap | None:
+        return TileCollision._tilemap
+
+    @staticmethod
+    def is_solid(tile_x: int, tile_y: int) -> bool:
+        """Whether a cell is solid. Cells outside of the tilemap are not."""
+        x = tile_x - TileCollision._origin_x
+        y = tile_y - TileCollision._origin_y
+        if x < 0 or y < 0 or x >= TileCollision._width or y >= TileCollision._height:
+            return False
+        return TileCollision._solid[y * TileCollision._width + x] == 1
+
+    @staticmethod
+    def _begin_frame():
+        """Called by `Physics` before the physics ticks of a frame"""
+        TileCollision._frame += 1
+
+    @staticmethod
+    def _move(left: float, top: float, width: float, height: float, dx: float, dy: float) -> tuple[float, float, TileContact]:
+        """Move a box by (dx, dy), first along x, then along y, stopping at solid cells.
+        Returns the allowed (dx, dy) and the `TileContact` flags of the move."""
+        contacts = TileContact.NONE
+        if TileCollision._tilemap is None:
+            return dx, dy, contacts
+
+        if dx != 0.0:
+            allowed_dx = TileCollision._sweep(left, top, width, height, dx, horizontal=True)
+            if allowed_dx != dx:
+                contacts |= TileContact.WALL_RIGHT if dx > 0.0 else TileContact.WALL_LEFT
+                dx = allowed_dx
+            left += dx
+
+        if dy != 0.0:
+            allowed_dy = TileCollision._sweep(top, left, height, width, dy, horizontal=False)
+            if allowed_dy != dy:
+                contacts |= TileContact.GROUND if dy > 0.0 else TileContact.CEILING
+                dy = allowed_dy
+
+        return dx, dy, contacts
+
+    @staticmethod
+    def _sweep(start: float, side_start: float, length: float, side_length: float, delta: float, horizontal: bool) -> float:
+        """Sweep the leading edge of a box along one axis. `start`/`length` are along the axis of motion,
+        `side_start`/`side_length` along the other one. Returns how far the box can move."""
+        cell_size = TileCollision._cell_size
+        side_first = math.floor((side_start + CONTACT_EPSILON) / cell_size)
+        side_last = math.floor((side_start + side_length - CONTACT_EPSILON) / cell_size)
+
+        if delta > 0.0:
+            edge = start + length
+            first = math.floor((edge - CONTACT_EPSILON) / cell_size) + 1  # The first cell beyond the edge
+            last = math.floor((edge + delta - CONTACT_EPSILON) / cell_size)
+            cells = range(first, last + 1)
+        else:
+            edge = start
+            first = math.floor((edge + CONTACT_EPSILON) / cell_size) - 1
+            last = math.floor((edge + delta + CONTACT_EPSILON) / cell_size)
+            cells = range(first, last - 1, -1)
+
+        # Inline `is_solid()`, as this runs for every body on every physics tick
+        solid = TileCollision._solid
+        width = TileCollision._width
+        height = TileCollision._height
+        origin_x = TileCollision._origin_x
+        origin_y = TileCollision._origin_y
+        for cell in cells:
+            for side_cell in range(side_first, side_last + 1):
+                x, y = (cell, side_cell) if horizontal else (side_cell, cell)
+                x -= origin_x
+                y -= origin_y
+                if 0 <= x < width and 0 <= y < height and solid[y * width + x]:
+                    # Stop at the boundary of the cell
+                    return (cell * cell_size - edge) if delta > 0.0 else ((cell + 1) * cell_size - edge)
+        return delta
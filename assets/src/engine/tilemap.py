@@ -0,0 +1,198 @@
+import json
+import array
+import pygame
+import pathlib
+import numpy as np
+from engine.math import Vec2
+from engine.graphics import Display, Graphics, RenderProxy
+
+from typing import Any, Iterable, Sequence
+
+
+CHUNK_SIZE = 8  # Width and height of a chunk in tiles
+EMPTY_TILE = -1
+
+TileImages = dict[str, Sequence[pygame.Surface]]
+TileArray = array.array | np.ndarray  # Flat int8 cells
+
+
+class OffgridTile:
+    def __init__(self, type: str, variant: int, position: Vec2):
+        """A decoration that is not aligned to the tile grid. `position` is in world space."""
+        self.type = type
+        self.variant = variant
+        self.position = position
+
+
+class Tilemap:
+    def __init__(self, tile_size: int, origin: tuple[int, int], width: int, height: int,
+                 tile_types: list[str], types: TileArray, variants: TileArray, offgrid: list[OffgridTile],
+                 scale: float | None = None):
+        """A grid of tiles stored in dense arrays, plus a list of off-grid decorations.
+
+        Params:
+            tile_size (int): The size of a tile in source image pixels (before `Graphics.scale`).
+            origin (tuple[int, int]): The tile coordinates of the top-left cell of the grid.
+            width (int): The grid width in tiles.
+            height (int): The grid height in tiles.
+            tile_types (list[str]): The tile type names. A cell stores an index into this list, or `EMPTY_TILE`.
+            types (TileArray): `width * height` tile type indices in row-major order.
+            variants (TileArray): `width * height` tile variants in row-major order.
+            offgrid (list[OffgridTile]): The off-grid decorations.
+            scale (float): The graphics scale of the world space. If not set, `Graphics.scale` is used.
+                Maps loaded off the main thread should pass it, since `Graphics.scale` is a global.
+        """
+        self.tile_size = tile_size
+        self.cell_size = tile_size * (Graphics.scale if scale is None else scale)  # The size of a tile in world space
+        self.origin = origin
+        self.width = width
+        self.height = height
+        self.tile_types = tile_types
+        self.offgrid = offgrid
+        self._types = types
+        self._variants = variants
+        self._chunks: dict[tuple[int, int], RenderProxy] = dict()
+        self._offgrid_render_proxies: list[RenderProxy] = list()
+        self._render_layers: tuple[str, str, int] | None = None  # The (tile, offgrid) layers and priority while the tilemap is rendered
+
+    @staticmethod
+    def load(path: str | pathlib.Path, scale: float | None = None) -> "Tilemap":
+        """Load a tilemap from a JSON map file (`tilemap`, `tile_size` and `offgrid` keys).
+        See `engine.levelfile` for the binary level files that load without parsing."""
+        with open(path, "r") as file_stream:
+            data = json.load(file_stream)
+        return Tilemap.from_dict(data, scale)
+
+    @staticmethod
+    def from_dict(data: dict[str, Any], scale: float | None = None) -> "Tilemap":
+        """
+        Params:
+            data (dict[str, Any]): The contents of a JSON map file.
+            scale (float): The graphics scale applied to the off-grid positions and the cell size. If not set, `Graphics.scale` is used.
+        """
+        if scale is None:
+            scale = Graphics.scale
+        tiles = data["tilemap"].values()
+        tile_size = data["tile_size"]
+
+        if tiles:
+            min_x = min(tile["pos"][0] for tile in tiles)
+            min_y = min(tile["pos"][1] for tile in tiles)
+            width = max(tile["pos"][0] for tile in tiles) - min_x + 1
+            height = max(tile["pos"][1] for tile in tiles) - min_y + 1
+        else:
+            min_x = min_y = width = height = 0
+
+        tile_types: list[str] = list()
+        types = array.array("b", [EMPTY_TILE]) * (width * height)
+        variants = array.array("b", [0]) * (width * height)
+        for tile in tiles:
+            if tile["type"] not in tile_types:
+                tile_types.append(tile["type"])
+            index = (tile["pos"][1] - min_y) * width + (tile["pos"][0] - min_x)
+            types[index] = tile_types.index(tile["type"])
+            variants[index] = tile["variant"]
+
+        offgrid: list[OffgridTile] = list()
+        for tile in data["offgrid"]:
+            position = Vec2(tile["pos"]) * scale
+            offgrid.append(OffgridTile(tile["type"], tile["variant"], position))
+
+        return Tilemap(tile_size, (min_x, min_y), width, height, tile_types, types, variants, offgrid, scale)
+
+    def get_tile(self, tile_x: int, tile_y: int) -> tuple[str, int] | None:
+        """Get the `(type, variant)` of the tile at the given tile coordinates, or `None` if the cell is empty."""
+        x = tile_x - self.origin[0]
+        y = tile_y - self.origin[1]
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return None
+
+        index = y * self.width + x
+        type_index = self._types[index]
+        if type_index == EMPTY_TILE:
+            return None
+        return (self.tile_types[type_index], int(self._variants[index]))
+
+    def get_type_grid(self) -> np.ndarray:
+        """The tile type indices as a `(height, width)` int8 NumPy view, without copying. Empty cells are `EMPTY_TILE`."""
+        return np.frombuffer(self._types, dtype=np.int8).reshape(self.height, self.width)
+
+    def get_variant_grid(self) -> np.ndarray:
+        """The tile variants as a `(height, width)` int8 NumPy view, without copying."""
+        return np.frombuffer(self._variants, dtype=np.int8).reshape(self.height, self.width)
+
+    def world_to_tile(self, position: Vec2) -> tuple[int, int]:
+        return (int(position.x // self.cell_size), int(position.y // self.cell_size))
+
+    def get_world_rect(self) -> pygame.Rect:
+        """The world space rect covered by the tile grid."""
+        return pygame.Rect(self.origin[0] * self.cell_size, self.origin[1] * self.cell_size,
+                           self.width * self.cell_size, self.height * self.cell_size)
+
+    def get_offgrid(self, types: Iterable[str]) -> list[OffgridTile]:
+        return [tile for tile in self.offgrid if tile.type in types]
+
+    def bake(self, tile_images: TileImages):
+        """Pre-composite the grid into `CHUNK_SIZE` x `CHUNK_SIZE` chunk surfaces.
+
+        Params:
+            tile_images (TileImages): The (already scaled) images of each tile type, indexed by variant.
+                Tiles and off-grid decorations whose type is missing are not rendered.
+        """
+        # Re-register the new proxies in the same layers if the tilemap is being rendered
+        render_layers = self._render_layers
+        if render_layers is not None:
+            self._remove_render_proxies()
+
+        self._chunks.clear()
+        chunk_pixels = int(CHUNK_SIZE * self.cell_size)
+        chunks_x = (self.width + CHUNK_SIZE - 1) // CHUNK_SIZE
+        chunks_y = (self.height + CHUNK_SIZE - 1) // CHUNK_SIZE
+        for chunk_y in range(chunks_y):
+            for chunk_x in range(chunks_x):
+                surface: pygame.Surface | None = None
+                for y in range(chunk_y * CHUNK_SIZE, min((chunk_y + 1) * CHUNK_SIZE, self.height)):
+                    for x in range(chunk_x * CHUNK_SIZE, min((chunk_x + 1) * CHUNK_SIZE, self.width)):
+                        index = y * self.width + x
+                        type_index = self._types[index]
+                        if type_index == EMPTY_TILE or self.tile_types[type_index] not in tile_images:
+                            continue
+
+                        if surface is None:
+                            surface = pygame.Surface((chunk_pixels, chunk_pixels), pygame.SRCALPHA).convert_alpha()
+                            surface.fill((0, 0, 0, 0))
+
+                        image = tile_images[self.tile_types[type_index]][self._variants[index]]
+                        local_x = (x - chunk_x * CHUNK_SIZE) * self.cell_size
+                        local_y = (y - chunk_y * CHUNK_SIZE) * self.cell_size
+                        surface.blit(image, (local_x, local_y))
+
+                if surface is not None:
+                    position = Vec2((self.origin[0] + chunk_x * CHUNK_SIZE) * self.cell_size,
+                                    (self.origin[1] + chunk_y * CHUNK_SIZE) * self.cell_size)
+                    self._chunks[(chunk_x, chunk_y)] = RenderProxy(surface, position)
+
+        self._offgrid_render_proxies.clear()
+        for tile in self.offgrid:
+            if tile.type in tile_images:
+                image = tile_images[tile.type][tile.variant]
+                self._offgrid_render_proxies.append(RenderProxy(image, tile.position))
+
+        if render_layers is not None:
+            self._add_render_proxies(*render_layers)
+
+    def _add_render_proxies(self, tile_layer: str, offgrid_layer: str, priority: int = 0):
+        """Register the off-grid decorations and then the chunks, so that the decorations are drawn behind the tiles
+        if both share a layer. Off-screen chunks are culled by the `Display`."""
+        for render_proxy in self._offgrid_render_proxies:
+            Display.add_render_proxy(render_proxy, offgrid_layer, priority)
+        for render_proxy in self._chunks.values():
+            Display.add_render_proxy(render_proxy, tile_layer, priority)
+        self._render_layers = (tile_layer, offgrid_layer, priority)
+
+    def _remove_render_proxies(self):
+        for render_proxy in self._offgrid_render_proxies:
+            Display.remove_render_proxy(render_proxy)
+        for render_proxy in self._chunks.values():
+            Display.remove_render_proxy(render_proxy)
+        self._render_layers = None
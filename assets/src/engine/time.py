@@ -1,36 +1,71 @@
-import pygame
+import time
+from engine.pacing import FramePacer
 
 
 class Time:
-    _clock: pygame.time.Clock
+    snapshot_fields = ("_play_time", "_time_scale")
+
     _play_time: float
+    _delta_time: float
+    _frame_timestamp: float
     _time_scale: float
     _fps: int
+    _virtual_delta_time: float | None
 
     @staticmethod
-    def init(fps: int):
-        Time._clock = pygame.time.Clock()
+    def init(fps: int, virtual_delta_time: float | None = None):
+        """
+        Params:
+            fps (int): The target frame rate. The frame rate is capped to it by the `FramePacer`.
+            virtual_delta_time (float): If set, the clock is virtual and advances by exactly this many seconds each frame,
+                without waiting for the frame cap. Used to run the simulation faster than real time.
+        """
         Time._play_time = 0.0
+        Time._delta_time = 0.0
+        Time._frame_timestamp = time.perf_counter()
+        Time._virtual_delta_time = virtual_delta_time
         Time.set_time_scale(1.0)
         Time.set_fps(fps)
 
     @staticmethod
-    def _tick():
-        milliseconds = Time._clock.tick(Time._fps)
-        Time._play_time += milliseconds / 1000.0
+    def _tick(delta_time: float | None = None):
+        """
+        Params:
+            delta_time (float): If set, the frame advances by exactly this many seconds, e.g. during a replay.
+                The frame is still paced unless the clock is virtual.
+        """
+        if Time._virtual_delta_time is not None:
+            Time._delta_time = Time._virtual_delta_time
+        else:
+            Time._delta_time = FramePacer._wait()
+        if delta_time is not None:
+            Time._delta_time = delta_time
+        Time._play_time += Time._delta_time
+        Time._frame_timestamp = time.perf_counter()
+
+    @staticmethod
+    def get_frame_timestamp() -> float:
+        """The `time.perf_counter()` value at the start of the current frame, right after the frame cap"""
+        return Time._frame_timestamp
+
+    @staticmethod
+    def is_virtual() -> bool:
+        return Time._virtual_delta_time is not None
 
     @staticmethod
     def get_fps() -> float:
-        return Time._clock.get_fps()
+        if Time._virtual_delta_time is not None:
+            return 1.0 / Time._virtual_delta_time
+        return FramePacer.get_fps()
 
     @staticmethod
     def set_fps(fps: int):
         Time._fps = fps
+        FramePacer.set_fps(fps)
 
     @staticmethod
     def get_delta_time() -> float:
-        milliseconds = Time._clock.get_time()
-        return milliseconds / 1000.0
+        return Time._delta_time
 
     @staticmethod
     def get_play_time() -> float:
@@ -1,24 +1,61 @@
+import argparse
 from engine.gameloop import GameLoop
+from engine.profiler import Profiler
 from engine.graphics import Display
+from engine.audio import Audio
+from engine.input import Input
+from engine.replay import Replay
+from ninjagame.data import Data, BACKGROUND_LAYER, CLOUDS_LAYER, OFFGRID_LAYER, TILES_LAYER
 from engine.entity import EntitySpawner
-from ninjagame.player import PlayerEntity
 from ninjagame.background import BackgroundEntity
+from ninjagame.world import WorldEntity
 
 
 def init_game():
     Display.set_window_title("Ninja Game")
 
+    # Decode the sounds up front, so that playing them never reads from disk
+    Audio.load_sounds(Data.asset_path("data", "sfx"))
+
+    # The background and the off-grid decorations never change, so they are composited once
+    Display.add_layer(BACKGROUND_LAYER, -40, static=True)
+    Display.add_layer(CLOUDS_LAYER, -30)
+    Display.add_layer(OFFGRID_LAYER, -20, static=True)
+    Display.add_layer(TILES_LAYER, -10)
+
     EntitySpawner.spawn_entity(BackgroundEntity)
-    EntitySpawner.spawn_entity(PlayerEntity)
+    world = EntitySpawner.spawn_entity(WorldEntity)
+    world.start(level=0)
 
 
-def run():
-    GameLoop.init()
+def run(headless: bool = False, max_frames: int | None = None, profile_path: str | None = None,
+        record_path: str | None = None, replay_path: str | None = None):
+    GameLoop.init(headless)
+    if profile_path is not None:
+        Profiler.enabled = True
 
     init_game()
 
-    GameLoop.run()
+    if record_path is not None:
+        Replay.start_recording(Input.get_key_names())
+    elif replay_path is not None:
+        Replay.start_playback(replay_path, Input.get_key_names())
+
+    GameLoop.run(max_frames)
+
+    if record_path is not None:
+        Replay.stop_recording(record_path)
+    if profile_path is not None:
+        Profiler.export_chrome_trace(profile_path)
 
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Ninja Game")
+    parser.add_argument("--headless", action="store_true", help="run without a window, faster than real time")
+    parser.add_argument("--frames", type=int, default=None, help="stop after this many frames")
+    parser.add_argument("--profile", default=None, help="write a Chrome trace of the last frames to this file")
+    parser.add_argument("--record", default=None, help="record the input of the session to this replay file")
+    parser.add_argument("--replay", default=None, help="play back a replay file, e.g. with --headless --profile to compare builds")
+    args = parser.parse_args()
+
+    run(args.headless, args.frames, args.profile, args.record, args.replay)
@@ -1,17 +1,50 @@
 import pygame
+import random
+from engine.math import Vec2
 from engine.entity import Entity
-from engine.graphics import Display, RenderStruct
-from engine.color import Color
+from engine.assets import Assets
+from engine.graphics import Display
+from engine.parallax import ParallaxLayer
+from engine.components import ParallaxComponent
+from ninjagame.data import Data, BACKGROUND_LAYER, CLOUDS_LAYER
+
+from typing import Sequence
+
+
+CLOUD_BANDS = (
+    # (depth, clouds, drift speed in screen pixels per second)
+    (0.2, 10, -8.0),
+    (0.4, 6, -16.0),
+)
+CLOUD_BAND_SEED = 1
 
 
 class BackgroundEntity(Entity):
     def __init__(self, priority: int = 0):
         super().__init__(priority)
-        self._surface = pygame.Surface(Display.get_size())
-        self._surface.fill(Color(14, 219, 248))
+        background_image = Assets.load_image(Data.asset_path("data", "images", "background.png"))
+        # The background fills the screen and does not move, so it is blitted as is, without a tiled strip
+        background_layers = [ParallaxLayer(background_image, depth=0.0, repeat_x=False, repeat_y=False)]
+        self.add_component(ParallaxComponent(background_layers, BACKGROUND_LAYER))
+
+        rng = random.Random(CLOUD_BAND_SEED)
+        cloud_images = Data.get_atlas().get_images("clouds")
+        band_size = (Display.get_width() * 2, Display.get_height() // 2)
+        cloud_layers = list()
+        for depth, cloud_count, drift_speed in CLOUD_BANDS:
+            band = self._build_cloud_band(cloud_images, band_size, cloud_count, rng)
+            cloud_layers.append(ParallaxLayer(band, depth, velocity=Vec2(drift_speed, 0.0)))
+        self.add_component(ParallaxComponent(cloud_layers, CLOUDS_LAYER))
 
-    def _render_tick(self, delta_time: float):
-        super()._render_tick(delta_time)
-        transform = self.get_transform()
-        render_struct = RenderStruct(self._surface, transform.get_position(), transform.get_prev_position())
-        Display.deferred_blit(render_struct)
+    @staticmethod
+    def _build_cloud_band(images: Sequence[pygame.Surface], size: tuple[int, int], count: int, rng: random.Random) -> pygame.Surface:
+        """Scatter clouds over a surface that wraps around horizontally, so it can be scrolled forever"""
+        band = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        band.fill((0, 0, 0, 0))
+        for _ in range(count):
+            image = rng.choice(images)
+            x = rng.randrange(size[0])
+            y = rng.randrange(max(1, size[1] - image.get_height()))
+            band.blit(image, (x, y))
+            band.blit(image, (x - size[0], y))  # The part that wraps around to the left edge
+        return band
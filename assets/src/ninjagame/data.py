@@ -1,8 +1,40 @@
 import pathlib
+from engine.color import Color
+from engine.atlas import SpriteAtlas
+from engine.animation import AnimationClip
+
+
+# Render layers, added by `init_game()`
+BACKGROUND_LAYER = "background"
+CLOUDS_LAYER = "clouds"
+OFFGRID_LAYER = "offgrid"
+TILES_LAYER = "tiles"
+
+ATLAS_NAME = "sprites"
+ATLAS_FOLDERS = {
+    "tiles/decor": Color.black(),
+    "tiles/grass": Color.black(),
+    "tiles/large_decor": Color.black(),
+    "tiles/stone": Color.black(),
+    "entities/player/idle": None,
+    "entities/player/run": None,
+    "entities/player/jump": None,
+    "entities/player/slide": None,
+    "entities/player/wall_slide": None,
+    "entities/enemy/idle": None,
+    "entities/enemy/run": None,
+    "particles/leaf": Color.black(),
+    "particles/particle": Color.black(),
+    "clouds": Color.black(),
+}
 
 
 class Data:
     BASE_DIR = pathlib.Path(__file__).resolve().parent.parent.parent
+    CACHE_DIR = BASE_DIR.joinpath("cache")
+
+    _atlas: SpriteAtlas | None = None
+    _animation_clips: dict[tuple[str, float, bool], AnimationClip] = dict()  # By (folder, frame_duration, loop)
 
     @staticmethod
     def asset_path(*parts: str) -> pathlib.Path:
@@ -10,3 +42,19 @@ class Data:
         if not path.exists():
             raise FileNotFoundError(f"Asset not found: {path}")
         return path
+
+    @staticmethod
+    def get_atlas() -> SpriteAtlas:
+        """The atlas of all tile, animation, particle and cloud images. Built (or loaded from the cache) on first use."""
+        if Data._atlas is None:
+            Data._atlas = SpriteAtlas.build(ATLAS_NAME, Data.asset_path("data", "images"), ATLAS_FOLDERS, Data.CACHE_DIR.joinpath("atlas"))
+        return Data._atlas
+
+    @staticmethod
+    def get_animation_clip(folder: str, frame_duration: float, loop: bool = True) -> AnimationClip:
+        """Get the clip made of the atlas images in `folder`. Clips are created once per timing and shared."""
+        key = (folder, frame_duration, loop)
+        clip = Data._animation_clips.get(key)
+        if clip is None:
+            clip = Data._animation_clips[key] = AnimationClip(Data.get_atlas().get_images(folder), frame_duration, loop)
+        return clip
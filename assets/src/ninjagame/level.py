@@ -0,0 +1,76 @@
+import pygame
+from engine.math import Vec2
+from engine.graphics import Graphics
+from engine.particles import ParticleEmitter
+from engine.entity import Entity
+from engine.tilemap import Tilemap
+from engine.levelfile import load_tilemap
+from engine.components import TilemapComponent, TileColliderComponent, ParticleComponent
+from ninjagame.data import Data, TILES_LAYER, OFFGRID_LAYER
+
+
+TILE_TYPES = ["decor", "grass", "large_decor", "stone"]
+SOLID_TILE_TYPES = ["grass", "stone"]
+PLAYER_SPAWNER_VARIANT = 0
+TREE_VARIANT = 2  # The `large_decor` variant that drops leaves
+TREE_CANOPY_RECT = pygame.Rect(4, 4, 23, 13)  # Relative to the tree image, in unscaled pixels
+LEAVES_PER_SECOND = 0.4  # Per tree
+
+
+LEVEL_COUNT = 3  # data/maps/0.json .. 2.json
+
+
+def load_level_tilemap(level: int, scale: float | None = None) -> Tilemap:
+    """Load the tilemap of a level. Only reads files, so it can run on a streaming worker, see `WorldEntity.load_level_async()`
+
+    Params:
+        level (int): The index of the map in data/maps.
+        scale (float): The graphics scale. Pass it when loading on a worker, since `Graphics.scale` is a global.
+    """
+    return load_tilemap(Data.asset_path("data", "maps", f"{level}.json"), Data.CACHE_DIR.joinpath("maps"), scale)
+
+
+class LevelEntity(Entity):
+    def __init__(self, priority: int = 0, level: int = 0, tilemap: Tilemap | None = None):
+        """Constructed on the main thread, since it creates surfaces and reads `Graphics.scale`
+
+        Params:
+            level (int): The index of the map in data/maps.
+            tilemap (Tilemap): The tilemap of the level, if it was already loaded by `load_level_tilemap()`.
+        """
+        super().__init__(priority)
+        self.level = level
+        self.tilemap = tilemap if tilemap is not None else load_level_tilemap(level)
+
+        atlas = Data.get_atlas()
+        tile_images = dict()
+        for tile_type in TILE_TYPES:
+            tile_images[tile_type] = atlas.get_images(f"tiles/{tile_type}")
+        self.tilemap.bake(tile_images)
+
+        self._tilemap_component = self.add_component(TilemapComponent(self.tilemap, TILES_LAYER, OFFGRID_LAYER))
+        self._tile_collider_component = self.add_component(TileColliderComponent(self.tilemap, SOLID_TILE_TYPES))
+
+        leaf_emitter = ParticleEmitter(atlas.get_images("particles/leaf"), capacity=512, lifetime=(3.0, 6.0),
+                                       sway=(18.0 * Graphics.scale, 2.0))
+        leaf_emitter.bounds = self.tilemap.get_world_rect()
+        leaf_emitter.set_spawn_rects(self._get_tree_canopy_rects(), LEAVES_PER_SECOND,
+                                     Vec2(-6.0, 18.0) * Graphics.scale, Vec2(3.0, 3.0) * Graphics.scale)
+        self._leaf_particle_component = self.add_component(ParticleComponent(leaf_emitter))
+
+    def _get_tree_canopy_rects(self) -> list[pygame.Rect]:
+        rects = list()
+        for tree in self.tilemap.get_offgrid(["large_decor"]):
+            if tree.variant == TREE_VARIANT:
+                rects.append(pygame.Rect(tree.position.x + TREE_CANOPY_RECT.x * Graphics.scale,
+                                         tree.position.y + TREE_CANOPY_RECT.y * Graphics.scale,
+                                         TREE_CANOPY_RECT.width * Graphics.scale,
+                                         TREE_CANOPY_RECT.height * Graphics.scale))
+        return rects
+
+    def get_player_spawn_position(self) -> Vec2:
+        spawners = self.tilemap.get_offgrid(["spawners"])
+        for spawner in spawners:
+            if spawner.variant == PLAYER_SPAWNER_VARIANT:
+                return spawner.position.copy()
+        return Vec2.zero()
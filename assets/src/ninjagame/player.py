@@ -1,14 +1,15 @@
 from engine.math import Vec2
-from engine.color import Color
 from engine.time import Time
 from engine.entity import Entity
-from engine.components import InputComponent, ImageComponent
+from engine.graphics import Graphics
+from engine.components import InputComponent, AnimationComponent, RigidBodyComponent
 from engine.input import InputEventType
-from engine.assets import Assets
 from ninjagame.data import Data
 
 
 class PlayerEntity(Entity):
+    snapshot_fields = ("_horizontal_input", "_vertical_input")
+
     def __init__(self, priority: int = 0):
         super().__init__(priority)
         self._is_ticking = True
@@ -18,8 +19,19 @@ class PlayerEntity(Entity):
 
         self._input_component = self.add_component(InputComponent())
 
-        image = Assets.load_image(Data.asset_path("data", "images", "entities", "player.png"), colorkey=Color.black())
-        self._image_component = self.add_component(ImageComponent(image))
+        clips = {
+            "idle": Data.get_animation_clip("entities/player/idle", frame_duration=0.1),
+            "run": Data.get_animation_clip("entities/player/run", frame_duration=0.066),
+            "jump": Data.get_animation_clip("entities/player/jump", frame_duration=0.1),
+            "slide": Data.get_animation_clip("entities/player/slide", frame_duration=0.1),
+            "wall_slide": Data.get_animation_clip("entities/player/wall_slide", frame_duration=0.1),
+        }
+        self._animation_component = self.add_component(AnimationComponent(clips, "idle"))
+
+        # The frames have a transparent border around the body
+        body_size = Vec2(8, 15) * Graphics.scale
+        body_offset = Vec2(3, 3) * Graphics.scale
+        self._rigid_body_component = self.add_component(RigidBodyComponent(body_size, body_offset, collides_with_tiles=True))
 
     def _enter_play(self):
         super()._enter_play()
@@ -33,13 +45,18 @@ class PlayerEntity(Entity):
         self._input_component.unbind_axis("vertical", self._set_vertical_input)
         self._input_component.unbind_action("slow_motion", InputEventType.PRESSED, self._toggle_slow_motion)
 
+    def _tick(self, delta_time: float):
+        super()._tick(delta_time)
+        if self._horizontal_input != 0.0:
+            self._animation_component.play("run")
+            self._animation_component.flip_x = self._horizontal_input < 0.0
+        else:
+            self._animation_component.play("idle")
+
     def _physics_tick(self, fixed_delta_time: float):
+        # Set the velocity before the rigid body moves. The tiles stop the body along each axis
+        self._rigid_body_component.set_velocity(Vec2(self._speed * self._horizontal_input, -self._speed * self._vertical_input))
         super()._physics_tick(fixed_delta_time)
-        horizontal_delta = Vec2.right() * self._speed * self._horizontal_input * fixed_delta_time
-        vertical_delta = Vec2.up() * self._speed * self._vertical_input * fixed_delta_time
-        position_delta = horizontal_delta + vertical_delta
-        transform = self.get_transform()
-        transform.set_position(transform.get_position() + position_delta)
 
     def _set_horizontal_input(self, axis_value: float):
         self._horizontal_input = axis_value
@@ -0,0 +1,75 @@
+from engine.entity import Entity, EntitySpawner
+from engine.graphics import Display, Graphics
+from engine.tilemap import Tilemap
+from engine.input import InputEventType
+from engine.streaming import Streaming, StreamingRequest
+from engine.snapshot import Snapshot
+from engine.components import InputComponent
+from ninjagame.level import LevelEntity, LEVEL_COUNT, load_level_tilemap
+from ninjagame.player import PlayerEntity
+
+
+class WorldEntity(Entity):
+    def __init__(self, priority: int = 0):
+        """Owns the current level and the player, and switches to the next level when "next_level" is pressed.
+        The next level is loaded by a streaming worker while the current one keeps playing.
+        "quick_save" and "quick_load" save and restore a `Snapshot` of the current level.
+        """
+        super().__init__(priority)
+        self.level: LevelEntity | None = None
+        self.player: PlayerEntity | None = None
+        self._level_request: StreamingRequest[Tilemap] | None = None
+        self._quick_save = Snapshot()
+        self._input_component = self.add_component(InputComponent())
+
+    def _enter_play(self):
+        super()._enter_play()
+        self._input_component.bind_action("next_level", InputEventType.PRESSED, self._load_next_level)
+        self._input_component.bind_action("quick_save", InputEventType.PRESSED, self._quick_save_snapshot)
+        self._input_component.bind_action("quick_load", InputEventType.PRESSED, self._quick_load)
+
+    def _exit_play(self):
+        super()._exit_play()
+        self._input_component.unbind_action("next_level", InputEventType.PRESSED, self._load_next_level)
+        self._input_component.unbind_action("quick_save", InputEventType.PRESSED, self._quick_save_snapshot)
+        self._input_component.unbind_action("quick_load", InputEventType.PRESSED, self._quick_load)
+
+    def start(self, level: int = 0):
+        """Load the first level synchronously and spawn the player"""
+        self.level = EntitySpawner.spawn_entity(LevelEntity, 0, level)
+        self.player = EntitySpawner.spawn_entity(PlayerEntity)
+        self.player.get_transform().teleport(self.level.get_player_spawn_position())
+
+        camera = Display.get_camera()
+        camera.bounds = self.level.tilemap.get_world_rect()
+        camera.follow(self.player.get_transform(), smoothing=0.1)
+
+    def load_level_async(self, level: int) -> StreamingRequest[Tilemap]:
+        """Load the tilemap of a level in the background and switch to the level once it is loaded"""
+        scale = Graphics.scale  # Read on the main thread
+        self._level_request = Streaming.load_async(lambda: load_level_tilemap(level, scale),
+                                                   lambda tilemap: self._switch_level(level, tilemap))
+        return self._level_request
+
+    def _load_next_level(self):
+        if self._level_request is not None and not self._level_request.is_done():
+            return  # Already loading
+        self.load_level_async((self.level.level + 1) % LEVEL_COUNT)
+
+    def _quick_save_snapshot(self):
+        self._quick_save.save()
+
+    def _quick_load(self):
+        if self._quick_save.is_saved():
+            self._quick_save.restore()
+
+    def _switch_level(self, level: int, tilemap: Tilemap):
+        self._quick_save = Snapshot()  # The quick save belongs to the old level
+        EntitySpawner.destroy_entity(self.level)
+        self.level = LevelEntity(0, level, tilemap)
+        Streaming.add_entity(self.level)
+        self.player.get_transform().teleport(self.level.get_player_spawn_position())
+
+        camera = Display.get_camera()
+        camera.bounds = self.level.tilemap.get_world_rect()
+        camera.set_position(self.player.get_transform().get_position() - camera.get_size() / 2)
@@ -0,0 +1,62 @@
+import os
+import sys
+import pathlib
+
+import pytest
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1].joinpath("assets", "src")))
+
+from engine.gameloop import GameLoop  # noqa: E402
+from engine.entity import EntitySpawner  # noqa: E402
+from engine.events import EventHook  # noqa: E402
+from engine.input import Input  # noqa: E402
+from engine.streaming import Streaming  # noqa: E402
+from engine.tilecollision import TileCollision  # noqa: E402
+
+
+@pytest.fixture
+def engine():
+    """Initialize the engine headless, with a clean world"""
+    GameLoop.init(headless=True)
+    _clear_world()
+    yield
+    Streaming._shutdown()
+    _clear_world()
+
+
+def _clear_world():
+    EntitySpawner._entities.clear()
+    EntitySpawner._tickable_entities.clear()
+    EntitySpawner._entities_by_class.clear()
+    EntitySpawner._components_by_type.clear()
+    EntitySpawner._entity_spawn_requests.clear()
+    EntitySpawner._entity_destroy_requests.clear()
+    EntitySpawner._entity_ticking_requests.clear()
+    EntitySpawner._generation += 1
+
+    Input.on_input_event = EventHook()
+    Input._pressed_keys_mask = 0
+    Input._queued_key_events.clear()
+    for axis in Input._axis_values:
+        Input._axis_values[axis] = 0.0
+
+    TileCollision.clear()
+
+
+def step(frames: int = 1, delta_time: float | None = None, pressed_keys_mask: int = 0):
+    """Run frames of the game loop without rendering, with the given keys pressed"""
+    from engine.time import Time
+    from engine.physics import Physics
+
+    for _ in range(frames):
+        Time._tick(delta_time)
+        Streaming._tick()
+        EntitySpawner._resolve_entity_spawn_requests()
+        EntitySpawner._resolve_entity_destroy_requests()
+        Input._tick(Time.get_delta_time(), pressed_keys_mask)
+        tickable_entities = EntitySpawner.get_tickable_entities()
+        for entity in tickable_entities:
+            entity._tick(Time.get_delta_time())
+        Physics._tick(tickable_entities, Time.get_delta_time())
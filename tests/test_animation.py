@@ -0,0 +1,63 @@
+import pygame
+
+from engine.animation import AnimationClip
+from engine.components import AnimationComponent
+
+
+def make_component(loop: bool = True) -> AnimationComponent:
+    frames = [pygame.Surface((1, 1)) for _ in range(4)]
+    clips = {"run": AnimationClip(frames, 0.1, loop), "idle": AnimationClip(frames[:1], 0.1)}
+    return AnimationComponent(clips, "run")
+
+
+def record_frame_events(component: AnimationComponent, clip_name: str = "run") -> list[int]:
+    reached_frames: list[int] = list()
+    for frame_index in range(4):
+        component.add_frame_event(clip_name, frame_index, lambda frame_index=frame_index: reached_frames.append(frame_index))
+    return reached_frames
+
+
+def test_first_frame_event_fires_when_a_clip_starts(engine):
+    component = make_component()
+    reached_frames = record_frame_events(component)
+    component._advance(0.0)
+    component._advance(0.05)
+    assert reached_frames == [0]
+
+    component.play("run", restart=True)
+    component._advance(0.0)
+    assert reached_frames == [0, 0]
+
+
+def test_skipped_frames_fire_their_events_in_order(engine):
+    component = make_component()
+    reached_frames = record_frame_events(component)
+    component._advance(0.0)
+    component._advance(0.35)
+    assert reached_frames == [0, 1, 2, 3]
+    assert component.get_frame_index() == 3
+
+    # Wrap around the end of the looping clip
+    component._advance(0.2)
+    assert reached_frames == [0, 1, 2, 3, 0, 1]
+    assert component.get_frame_index() == 1
+
+
+def test_non_looping_clip_stops_on_its_last_frame(engine):
+    component = make_component(loop=False)
+    reached_frames = record_frame_events(component)
+    finished_clips: list[str] = list()
+    component.on_clip_finished += finished_clips.append
+    component._advance(1.0)
+    assert reached_frames == [0, 1, 2, 3]
+    assert component.is_finished()
+    assert finished_clips == ["run"]
+
+
+def test_callback_that_plays_a_clip_stops_the_dispatch(engine):
+    component = make_component()
+    reached_frames = record_frame_events(component)
+    component.add_frame_event("run", 1, lambda: component.play("idle"))
+    component._advance(0.35)
+    assert reached_frames == [0, 1]
+    assert component.get_clip_name() == "idle"
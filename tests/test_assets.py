@@ -0,0 +1,82 @@
+import pygame
+
+from engine.assets import Assets
+
+
+def write_image(path, size: tuple[int, int] = (8, 8)):
+    pygame.image.save(pygame.Surface(size), path)
+    return path
+
+
+def test_loading_an_image_again_returns_the_cached_surface(engine, tmp_path):
+    path = write_image(tmp_path.joinpath("image.png"))
+    misses = Assets.get_image_cache_stats().misses
+    first = Assets.load_image(path)
+    second = Assets.load_image(path)
+    assert first is second
+    assert Assets.get_image_cache_stats().misses == misses + 1
+    assert Assets.load_image(path, colorkey=(0, 0, 0)) is not first
+
+
+def test_only_unreferenced_images_are_evicted(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(Assets, "_image_cache_budget", 0)
+    kept_path = write_image(tmp_path.joinpath("kept.png"))
+    released_path = write_image(tmp_path.joinpath("released.png"))
+    kept = Assets.load_image(kept_path, take_reference=True)
+    released = Assets.load_image(released_path, take_reference=True)
+
+    Assets.release_image(released_path)
+    assert Assets.load_image(kept_path) is kept
+    assert Assets.load_image(released_path) is not released
+
+    Assets.release_image(kept_path)
+    Assets.clear_image_cache()
+    assert Assets._get_image_key(kept_path, None) not in Assets._image_cache
+
+
+def test_preloaded_images_are_not_referenced(engine, tmp_path):
+    path = write_image(tmp_path.joinpath("preloaded.png"))
+    Assets.preload_images([path])
+    Assets.clear_image_cache()
+    hits = Assets.get_image_cache_stats().hits
+    Assets.load_image(path)
+    assert Assets.get_image_cache_stats().hits == hits
+
+
+def test_switching_levels_shrinks_the_cache(engine, tmp_path, monkeypatch):
+    paths = [write_image(tmp_path.joinpath(f"{i}.png"), (32, 32)) for i in range(8)]
+    level_paths = (paths[:4], paths[4:])
+    Assets.clear_image_cache()
+    monkeypatch.setattr(Assets, "_image_cache_budget", 0)
+
+    # A level takes references while it is loaded and gives them back when it is torn down
+    for path in level_paths[0]:
+        Assets.load_image(path, take_reference=True)
+    level_bytes = Assets.get_image_cache_stats().byte_size
+    assert Assets.get_image_cache_stats().entries == 4
+
+    for path in level_paths[0]:
+        Assets.release_image(path)
+    for path in level_paths[1]:
+        Assets.load_image(path, take_reference=True)
+    stats = Assets.get_image_cache_stats()
+    assert stats.entries == 4
+    assert stats.byte_size == level_bytes
+    assert all(Assets._get_image_key(path, None) not in Assets._image_cache for path in level_paths[0])
+
+    for path in level_paths[1]:
+        Assets.release_image(path)
+    assert Assets.get_image_cache_stats().entries == 0
+
+
+def test_unreferenced_images_stay_within_the_budget(engine, tmp_path, monkeypatch):
+    paths = [write_image(tmp_path.joinpath(f"{i}.png"), (32, 32)) for i in range(4)]
+    Assets.clear_image_cache()
+    Assets.load_image(paths[0])
+    image_bytes = Assets.get_image_cache_stats().byte_size
+    monkeypatch.setattr(Assets, "_image_cache_budget", 2 * image_bytes)
+    for path in paths:
+        Assets.load_image(path)
+    stats = Assets.get_image_cache_stats()
+    assert stats.entries == 2
+    assert stats.byte_size <= stats.byte_budget
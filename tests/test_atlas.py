@@ -0,0 +1,47 @@
+import pygame
+
+from engine.atlas import SpriteAtlas
+from engine.graphics import Graphics
+
+
+def scaled(sizes: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    return [(int(width * Graphics.scale), int(height * Graphics.scale)) for width, height in sizes]
+
+
+def write_images(root, folder: str, sizes: list[tuple[int, int]]):
+    directory = root.joinpath(folder)
+    directory.mkdir(parents=True)
+    for i, size in enumerate(sizes):
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill((i * 40, 100, 200, 255))
+        pygame.image.save(surface, directory.joinpath(f"{i:02}.png"))
+
+
+def test_build_packs_the_folders_in_file_name_order(engine, tmp_path):
+    write_images(tmp_path.joinpath("src"), "player/idle", [(4, 6), (8, 3), (5, 5)])
+    write_images(tmp_path.joinpath("src"), "tiles", [(16, 16)])
+    atlas = SpriteAtlas.build("test", tmp_path.joinpath("src"), {"player/idle": None, "tiles": None}, tmp_path.joinpath("cache"))
+
+    assert atlas.get_page_count() == 1
+    images = atlas.get_images("player/idle")
+    assert [image.get_size() for image in images] == scaled([(4, 6), (8, 3), (5, 5)])
+    assert images[1].get_at((0, 0)) == pygame.Color(40, 100, 200, 255)
+    assert atlas.get_image("tiles/00").get_size() == scaled([(16, 16)])[0]
+
+
+def test_build_loads_the_cached_pages_until_a_source_changes(engine, tmp_path, monkeypatch):
+    write_images(tmp_path.joinpath("src"), "tiles", [(4, 4), (6, 6)])
+    folders = {"tiles": None}
+    SpriteAtlas.build("test", tmp_path.joinpath("src"), folders, tmp_path.joinpath("cache"))
+
+    packed: list[bool] = list()
+    original_pack = SpriteAtlas._pack
+    monkeypatch.setattr(SpriteAtlas, "_pack", lambda *args: (packed.append(True), original_pack(*args))[1])
+    atlas = SpriteAtlas.build("test", tmp_path.joinpath("src"), folders, tmp_path.joinpath("cache"))
+    assert not packed
+    assert [image.get_size() for image in atlas.get_images("tiles")] == scaled([(4, 4), (6, 6)])
+
+    pygame.image.save(pygame.Surface((2, 2)), tmp_path.joinpath("src", "tiles", "02.png"))
+    atlas = SpriteAtlas.build("test", tmp_path.joinpath("src"), folders, tmp_path.joinpath("cache"))
+    assert packed
+    assert len(atlas.get_images("tiles")) == 3
@@ -0,0 +1,55 @@
+import pathlib
+
+import pytest
+
+from engine.audio import Audio
+
+SFX_DIR = pathlib.Path(__file__).resolve().parents[1].joinpath("assets", "data", "sfx")
+
+
+@pytest.fixture
+def audio(engine):
+    Audio.init(channel_count=2, default_voice_limit=1, buffer_size=512)
+    if not Audio.enabled:
+        pytest.skip("No audio mixer")
+    Audio.load_sounds(SFX_DIR)
+
+
+def test_plays_in_a_frame_are_merged(audio):
+    stats = Audio.get_stats()
+    Audio.play("jump", 0.5)
+    Audio.play("jump", 1.0)
+    assert Audio._play_requests == {"jump": 1.0}
+    Audio._tick()
+    assert Audio.get_stats().plays == stats.plays + 1
+    assert Audio.get_stats().merged == stats.merged + 1
+
+
+def test_voice_limit_restarts_the_oldest_voice(audio):
+    stats = Audio.get_stats()
+    Audio.play("jump")
+    Audio._tick()
+    Audio.play("jump")
+    Audio._tick()
+    assert Audio.get_stats().stolen == stats.stolen + 1
+    assert len(Audio._sound_bank["jump"].voices) == 1
+
+
+def test_plays_are_dropped_when_all_channels_are_busy(audio):
+    stats = Audio.get_stats()
+    for name in ("jump", "dash", "hit"):
+        Audio.play(name)
+    Audio._tick()
+    assert Audio.get_stats().dropped == stats.dropped + 1
+
+
+def test_playing_an_unknown_sound_raises(audio):
+    with pytest.raises(KeyError):
+        Audio.play("missing")
+
+
+def test_stop_silences_every_voice(audio):
+    Audio.play("jump")
+    Audio._tick()
+    Audio.stop("jump")
+    assert Audio._sound_bank["jump"].voices == []
@@ -0,0 +1,85 @@
+import pytest
+
+from conftest import step
+from engine.math import Vec2
+from engine.bodystorage import BodyStorage
+from engine.entity import Entity, EntitySpawner
+from engine.components import RigidBodyComponent
+
+
+class BodyEntity(Entity):
+    def __init__(self, priority: int = 0, is_ticking: bool = True):
+        super().__init__(priority)
+        self._is_ticking = is_ticking
+        self.body = self.add_component(RigidBodyComponent(Vec2(8, 8)))
+
+
+def simulate(vectorized: bool) -> list[Vec2]:
+    BodyStorage.init(vectorized)
+    ticking = EntitySpawner.spawn_entity(BodyEntity, 0, True)
+    idle = EntitySpawner.spawn_entity(BodyEntity, 0, False)
+    stopped = EntitySpawner.spawn_entity(BodyEntity, 0, True)
+    for entity in (ticking, idle, stopped):
+        entity.body.set_velocity(Vec2(30.0, -10.0))
+        entity.body.set_acceleration(Vec2(0.0, 100.0))
+
+    step(5)
+    stopped.set_ticking(False)
+    step(5)
+    return [entity.get_transform().get_position() for entity in (ticking, idle, stopped)]
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_only_ticking_bodies_move(engine, vectorized):
+    ticking_position, idle_position, stopped_position = simulate(vectorized)
+    assert ticking_position.x > stopped_position.x > 0.0
+    assert idle_position == Vec2.zero()
+
+
+def test_scalar_and_vectorized_modes_match(engine):
+    scalar_positions = simulate(False)
+    EntitySpawner._entities.clear()
+    EntitySpawner._tickable_entities.clear()
+    vectorized_positions = simulate(True)
+    for scalar_position, vectorized_position in zip(scalar_positions, vectorized_positions):
+        assert scalar_position.x == pytest.approx(vectorized_position.x)
+        assert scalar_position.y == pytest.approx(vectorized_position.y)
+
+
+def test_scalar_getters_do_not_copy(engine):
+    BodyStorage.init(False)
+    entity = EntitySpawner.spawn_entity(BodyEntity)
+    step()
+    transform = entity.get_transform()
+    position = transform.get_position()
+    assert transform.get_position() is position
+
+    transform.set_position(Vec2(5.0, 0.0))
+    assert position == Vec2.zero()  # Replaced, not changed
+    assert transform.get_prev_position() is position
+
+
+def test_vectorized_getters_return_copies_of_the_slot(engine):
+    BodyStorage.init(True)
+    entity = EntitySpawner.spawn_entity(BodyEntity)
+    step()
+    transform = entity.get_transform()
+    transform.get_position().x += 100.0
+    transform.get_prev_position().x += 100.0
+    assert transform.get_position() == Vec2.zero()
+    assert transform.get_prev_position() == Vec2.zero()
+
+
+def test_free_slots_are_reused_and_trailing_ones_dropped(engine):
+    BodyStorage.init(True, capacity=2)
+    entities = [EntitySpawner.spawn_entity(BodyEntity) for _ in range(3)]
+    step()
+    assert BodyStorage.get_body_count() == 3
+    assert len(BodyStorage._positions) == 4
+
+    EntitySpawner.destroy_entity(entities[2])
+    step()
+    assert BodyStorage._size == 2
+    EntitySpawner.spawn_entity(BodyEntity)
+    step()
+    assert BodyStorage.get_body_count() == 3
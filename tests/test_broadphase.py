@@ -0,0 +1,95 @@
+import pygame
+import pytest
+
+from conftest import step
+from engine.math import Vec2
+from engine.broadphase import Broadphase, SpatialHash
+from engine.bodystorage import BodyStorage
+from engine.snapshot import Snapshot
+from engine.entity import Entity, EntitySpawner
+from engine.components import RigidBodyComponent
+
+
+class BodyEntity(Entity):
+    def __init__(self, priority: int = 0):
+        super().__init__(priority)
+        self._is_ticking = True
+        self.body = self.add_component(RigidBodyComponent(Vec2(8, 8)))
+
+
+def spawn_body(position: Vec2, velocity: Vec2 | None = None) -> BodyEntity:
+    entity = EntitySpawner.spawn_entity(BodyEntity)
+    entity.get_transform().teleport(position)
+    if velocity is not None:
+        entity.body.set_velocity(velocity)
+    return entity
+
+
+def test_spatial_hash_queries():
+    spatial_hash = SpatialHash(16.0)
+    spatial_hash.insert("a", pygame.FRect(0.0, 0.0, 8.0, 8.0))
+    spatial_hash.insert("b", pygame.FRect(4.0, 4.0, 8.0, 8.0))
+    spatial_hash.insert("c", pygame.FRect(100.0, 100.0, 8.0, 8.0))
+    assert sorted(spatial_hash.query_aabb(pygame.FRect(0.0, 0.0, 20.0, 20.0))) == ["a", "b"]
+    assert spatial_hash.query_point((101.0, 101.0)) == ["c"]
+    assert [tuple(sorted(pair)) for pair in spatial_hash.get_overlapping_pairs()] == [("a", "b")]
+
+    spatial_hash.update("c", pygame.FRect(2.0, 2.0, 8.0, 8.0))
+    assert len(spatial_hash.get_overlapping_pairs()) == 3
+    spatial_hash.remove("a")
+    assert len(spatial_hash) == 2
+    assert "a" not in spatial_hash
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_moving_bodies_are_rebucketed(engine, vectorized):
+    BodyStorage.init(vectorized)
+    moving = spawn_body(Vec2(0.0, 0.0), Vec2(600.0, 0.0))
+    spawn_body(Vec2(200.0, 200.0))
+    step(10)
+    position = moving.get_transform().get_position()
+    assert position.x > 50.0
+    assert Broadphase.query_point(position + Vec2(1.0, 1.0)) == [moving.body]
+    assert Broadphase.query_point(Vec2(1.0, 1.0)) == []
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_only_moved_bodies_are_updated(engine, vectorized, monkeypatch):
+    BodyStorage.init(vectorized)
+    moving = spawn_body(Vec2(0.0, 0.0), Vec2(60.0, 0.0))
+    resting = spawn_body(Vec2(200.0, 200.0))
+    step()
+
+    updated: list[RigidBodyComponent] = list()
+    original_update = SpatialHash.update
+    monkeypatch.setattr(SpatialHash, "update", lambda self, item, rect: (updated.append(item), original_update(self, item, rect)))
+    step(3)
+    assert moving.body in updated
+    assert resting.body not in updated
+
+    resting.get_transform().set_position(Vec2(0.0, 0.0))
+    step()
+    assert resting.body in updated
+
+
+def test_snapshot_restore_rebuckets_bodies(engine):
+    entity = spawn_body(Vec2(0.0, 0.0))
+    step()
+    snapshot = Snapshot()
+    snapshot.save()
+    entity.get_transform().teleport(Vec2(300.0, 300.0))
+    step()
+    assert Broadphase.query_point(Vec2(1.0, 1.0)) == []
+
+    snapshot.restore()
+    step()
+    assert Broadphase.query_point(Vec2(1.0, 1.0)) == [entity.body]
+
+
+def test_overlaps_are_dispatched(engine):
+    first = spawn_body(Vec2(0.0, 0.0))
+    second = spawn_body(Vec2(4.0, 4.0))
+    overlaps: list[RigidBodyComponent] = list()
+    first.body.on_overlap += overlaps.append
+    step()
+    assert overlaps and overlaps[0] is second.body
@@ -0,0 +1,47 @@
+import pygame
+import pytest
+
+from engine.math import Vec2
+from engine.camera import Camera
+from engine.components import TransformComponent
+
+
+def test_view_rect_uses_the_rounded_position():
+    camera = Camera(Vec2(320, 240))
+    camera.set_position(Vec2(10.4, 20.6))
+    assert camera.get_offset() == (10, 21)
+    assert camera.get_view_rect() == pygame.Rect(10, 21, 320, 240)
+    assert camera.world_to_screen(Vec2(100.0, 100.0)) == Vec2(90.0, 79.0)
+    assert camera.screen_to_world(Vec2(90.0, 79.0)) == Vec2(100.0, 100.0)
+
+
+def test_position_is_clamped_to_the_bounds():
+    camera = Camera(Vec2(100, 100))
+    camera.bounds = pygame.Rect(0, 0, 300, 50)
+    camera.set_position(Vec2(-50.0, 0.0))
+    assert camera.get_position().x == 0.0
+    camera.set_position(Vec2(500.0, 0.0))
+    assert camera.get_position().x == 200.0
+    # Bounds smaller than the view are centered
+    assert camera.get_position().y == pytest.approx(25.0 - 50.0)
+
+
+def test_follow_centers_the_target():
+    camera = Camera(Vec2(100, 100))
+    target = TransformComponent()
+    target.set_position(Vec2(500.0, 300.0))
+    camera.follow(target)
+    camera._update(1.0 / 60.0, 1.0)
+    assert camera.get_position() == Vec2(450.0, 250.0)
+
+
+def test_smoothing_catches_up_gradually():
+    camera = Camera(Vec2(100, 100))
+    target = TransformComponent()
+    target.set_position(Vec2(1050.0, 50.0))
+    camera.follow(target, smoothing=0.1)
+    camera._update(0.1, 1.0)
+    assert camera.get_position().x == pytest.approx(1000.0 * (1.0 - 1.0 / 2.718281828), rel=1e-3)
+    for _ in range(100):
+        camera._update(0.1, 1.0)
+    assert camera.get_position().x == pytest.approx(1000.0)
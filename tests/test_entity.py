@@ -0,0 +1,72 @@
+from conftest import step
+from engine.math import Vec2
+from engine.entity import Entity, EntitySpawner
+from engine.components import Component, RigidBodyComponent, TransformComponent
+
+
+class BaseEntity(Entity):
+    pass
+
+
+class DerivedEntity(BaseEntity):
+    def __init__(self, priority: int = 0):
+        super().__init__(priority)
+        self._is_ticking = True
+        self.body = self.add_component(RigidBodyComponent(Vec2(4, 4)))
+
+
+def test_entities_are_indexed_by_every_class_in_their_mro(engine):
+    base = EntitySpawner.spawn_entity(BaseEntity)
+    derived = EntitySpawner.spawn_entity(DerivedEntity)
+    assert EntitySpawner.get_entities_of_class(DerivedEntity) == []  # Not in play until the next frame
+
+    step()
+    assert EntitySpawner.get_entities_of_class(DerivedEntity) == [derived]
+    assert EntitySpawner.get_entities_of_class(BaseEntity) == [base, derived]
+    assert set(EntitySpawner.get_entities_of_class(Entity)) == {base, derived}
+
+    EntitySpawner.destroy_entity(derived)
+    step()
+    assert EntitySpawner.get_entities_of_class(BaseEntity) == [base]
+    assert EntitySpawner.get_entities_of_class(DerivedEntity) == []
+
+
+def test_components_are_indexed_while_their_entity_is_in_play(engine):
+    entity = EntitySpawner.spawn_entity(DerivedEntity)
+    step()
+    assert EntitySpawner.get_components_of_type(RigidBodyComponent) == [entity.body]
+    assert len(EntitySpawner.get_components_of_type(TransformComponent)) == 1
+
+    extra = entity.add_component(Component())
+    assert extra in EntitySpawner.get_components_of_type(Component)
+    entity.remove_component(extra)
+    assert extra not in EntitySpawner.get_components_of_type(Component)
+
+    EntitySpawner.destroy_entity(entity)
+    step()
+    assert EntitySpawner.get_components_of_type(RigidBodyComponent) == []
+
+
+def test_ticking_changes_apply_on_the_next_frame(engine):
+    entity = EntitySpawner.spawn_entity(DerivedEntity)
+    step()
+    assert entity in EntitySpawner.get_tickable_entities()
+
+    entity.set_ticking(False)
+    assert entity in EntitySpawner.get_tickable_entities()
+    step()
+    assert entity not in EntitySpawner.get_tickable_entities()
+
+
+def test_spawning_and_destroying_changes_the_generation(engine):
+    generation = EntitySpawner._generation
+    entity = EntitySpawner.spawn_entity(BaseEntity)
+    step()
+    assert EntitySpawner._generation != generation
+
+    generation = EntitySpawner._generation
+    step()
+    assert EntitySpawner._generation == generation
+    EntitySpawner.destroy_entity(entity)
+    step()
+    assert EntitySpawner._generation != generation
@@ -0,0 +1,70 @@
+from conftest import step
+from engine.entity import Entity, EntitySpawner, EntityPool
+
+
+class PooledEntity(Entity):
+    def __init__(self, priority: int = 0):
+        super().__init__(priority)
+        self._is_ticking = True
+        self.tick_count = 0
+        self.reset_count = 0
+
+    def _reset(self):
+        super()._reset()
+        self.tick_count = 0
+        self.reset_count += 1
+
+    def _tick(self, delta_time: float):
+        super()._tick(delta_time)
+        self.tick_count += 1
+
+
+def test_spawn_reuses_released_entities(engine):
+    pool = EntityPool(PooledEntity, capacity=2)
+    pool.prewarm()
+    first = pool.spawn()
+    step()
+    assert first.is_in_play()
+
+    EntitySpawner.destroy_entity(first)
+    step()
+    assert not first.is_in_play()
+    assert first.reset_count == 1
+
+    second = pool.spawn()
+    stats = pool.get_stats()
+    assert stats.created == 2
+    assert stats.reused == 2
+    assert stats.active == 1
+    assert stats.high_water_mark == 1
+    assert second is first
+
+
+def test_pool_keeps_at_most_capacity_entities(engine):
+    pool = EntityPool(PooledEntity, capacity=1)
+    entities = [pool.spawn() for _ in range(3)]
+    step()
+    for entity in entities:
+        EntitySpawner.destroy_entity(entity)
+    step()
+    stats = pool.get_stats()
+    assert stats.free == 1
+    assert stats.active == 0
+    assert stats.high_water_mark == 3
+
+
+def test_recycled_entity_ticks_again_after_set_ticking_false(engine):
+    pool = EntityPool(PooledEntity, capacity=1)
+    entity = pool.spawn()
+    step()
+    entity.set_ticking(False)
+    step()
+    EntitySpawner.destroy_entity(entity)
+    step()
+
+    recycled = pool.spawn()
+    assert recycled is entity
+    assert recycled.is_ticking()
+    step(3)
+    assert recycled.tick_count > 0
+    assert recycled in EntitySpawner._tickable_entities
@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+from engine.time import Time
+from engine.gameloop import GameLoop
+from engine.entity import Entity, EntitySpawner
+
+
+class CountingEntity(Entity):
+    def __init__(self, priority: int = 0):
+        super().__init__(priority)
+        self._is_ticking = True
+        self.tick_count = 0
+        self.render_tick_count = 0
+
+    def _tick(self, delta_time: float):
+        super()._tick(delta_time)
+        self.tick_count += 1
+
+    def _render_tick(self, delta_time: float):
+        super()._render_tick(delta_time)
+        self.render_tick_count += 1
+
+
+def test_headless_run_uses_an_uncapped_virtual_clock(engine):
+    assert Time.is_virtual()
+    entity = EntitySpawner.spawn_entity(CountingEntity)
+    start_time = time.perf_counter()
+    GameLoop.run(max_frames=600)
+    elapsed_time = time.perf_counter() - start_time
+
+    assert entity.tick_count == entity.render_tick_count == 600
+    assert Time.get_play_time() == pytest.approx(600 * Time.get_delta_time())
+    assert elapsed_time < 600 * Time.get_delta_time()  # Faster than real time
+
+
+def test_stop_predicate_ends_the_run(engine):
+    entity = EntitySpawner.spawn_entity(CountingEntity)
+    GameLoop.run(stop_predicate=lambda: entity.tick_count >= 10)
+    assert entity.tick_count == 10
@@ -0,0 +1,144 @@
+import pygame
+
+from engine.math import Vec2
+from engine.graphics import Display, RenderBatch, RenderMode, RenderProxy, RenderSort, STATIC_CHUNK_SIZE
+
+
+def make_proxy(x: float = 0.0, y: float = 0.0, height: int = 4) -> RenderProxy:
+    return RenderProxy(pygame.Surface((4, height)), Vec2(x, y))
+
+
+def get_drawn_surfaces(layer_name: str = "default") -> list[pygame.Surface]:
+    items, _ = Display.get_layer(layer_name)._get_visible_items(1.0, (0, 0), Display.get_surface().get_size())
+    return [surface for surface, _ in items]
+
+
+def test_proxies_are_drawn_by_priority_then_registration_order(engine):
+    late_low = make_proxy()
+    high = make_proxy()
+    early_low = make_proxy()
+    Display.add_render_proxy(high, priority=1)
+    Display.add_render_proxy(early_low, priority=0)
+    Display.add_render_proxy(late_low, priority=0)
+    assert get_drawn_surfaces() == [early_low._surface, late_low._surface, high._surface]
+
+
+def test_removing_a_proxy_keeps_the_render_order(engine):
+    proxies = [make_proxy() for _ in range(6)]
+    for proxy in proxies:
+        Display.add_render_proxy(proxy)
+    Display.remove_render_proxy(proxies[1])
+    Display.remove_render_proxy(proxies[4])
+
+    remaining = [proxies[i] for i in (0, 2, 3, 5)]
+    assert get_drawn_surfaces() == [proxy._surface for proxy in remaining]
+    assert sorted(proxy._slot for proxy in remaining) == [0, 1, 2, 3]
+    assert not proxies[1].is_registered()
+
+    # A moved proxy still updates its own slot
+    proxies[5].set_position(Vec2(10000.0, 0.0))
+    assert get_drawn_surfaces() == [proxy._surface for proxy in remaining[:3]]
+
+
+def test_batches_are_drawn_at_their_place_in_the_order(engine):
+    first, last = make_proxy(), make_proxy()
+    batch = RenderBatch()
+    batch_surface = pygame.Surface((1, 1))
+    batch.items = [(batch_surface, (0, 0, 1, 1))]
+    Display.add_render_proxy(last, priority=2)
+    Display.add_render_proxy(batch, priority=1)
+    Display.add_render_proxy(first, priority=0)
+    assert get_drawn_surfaces() == [first._surface, batch_surface, last._surface]
+
+    Display.remove_render_proxy(first)
+    assert get_drawn_surfaces() == [batch_surface, last._surface]
+
+
+def test_y_sorted_layer_draws_lower_proxies_in_front(engine):
+    Display.add_layer("sorted", 1, RenderSort.Y)
+    low, high = make_proxy(y=50.0), make_proxy(y=10.0)
+    Display.add_render_proxy(low, "sorted")
+    Display.add_render_proxy(high, "sorted")
+    assert get_drawn_surfaces("sorted") == [high._surface, low._surface]
+
+
+def test_off_screen_proxies_are_culled(engine):
+    Display.add_render_proxy(make_proxy(-100.0, 0.0))
+    Display.add_render_proxy(make_proxy(10.0, 10.0))
+    Display.render_frame(1.0)
+    assert Display.get_drawn_count() == 1
+    assert Display.get_culled_count() == 1
+
+
+def test_static_layer_is_only_recomposited_when_a_proxy_moves(engine):
+    Display.add_layer("static", -1, static=True)
+    proxy = make_proxy(10.0, 10.0)
+    Display.add_render_proxy(proxy, "static")
+    Display.render_frame(1.0)
+    layer = Display.get_layer("static")
+    assert layer._is_cache_valid
+
+    proxy.set_position(Vec2(10.0, 10.0), Vec2(10.0, 10.0))
+    assert layer._is_cache_valid
+
+    proxy.set_position(Vec2(12.0, 10.0))
+    assert not layer._is_cache_valid
+    Display.render_frame(1.0)
+    chunk = layer._cache_chunks[(0, 0)]
+    assert chunk.get_at((12, 10)).a == 255
+    assert chunk.get_at((10, 10)).a == 0
+
+
+def test_static_layer_only_caches_the_chunks_around_the_view(engine):
+    Display.add_layer("static", -1, static=True)
+    near, far = make_proxy(10.0, 10.0), make_proxy(100 * STATIC_CHUNK_SIZE, 10.0)
+    Display.add_render_proxy(near, "static")
+    Display.add_render_proxy(far, "static")
+    layer = Display.get_layer("static")
+    screen_width, screen_height = Display.get_surface().get_size()
+    view_chunks = ((screen_width - 1) // STATIC_CHUNK_SIZE + 1) * ((screen_height - 1) // STATIC_CHUNK_SIZE + 1)
+
+    Display.render_frame(1.0)
+    assert len(layer._cache_chunks) == view_chunks
+    assert sum(chunk is not None for chunk in layer._cache_chunks.values()) == 1
+
+    Display.get_camera().set_position(Vec2(100 * STATIC_CHUNK_SIZE, 0.0))
+    Display.render_frame(1.0)
+    assert (0, 0) not in layer._cache_chunks
+    assert layer._cache_chunks[(100, 0)] is not None
+
+
+def test_full_mode_clears_the_areas_no_proxy_covers(engine):
+    proxy = make_proxy(10.0, 10.0)
+    proxy.get_surface().fill((255, 255, 255))
+    Display.add_render_proxy(proxy)
+    Display.render_frame(1.0)
+    assert Display.get_surface().get_at((10, 10))[:3] == (255, 255, 255)
+
+    proxy.set_position(Vec2(20.0, 10.0))
+    Display.render_frame(1.0)
+    assert Display.get_surface().get_at((10, 10))[:3] == tuple(Display.clear_color)[:3]
+
+
+def test_dirty_rects_cover_the_old_and_new_rects_of_a_moved_proxy(engine):
+    Display.set_render_mode(RenderMode.DIRTY_RECTS)
+    proxy = make_proxy(10.0, 10.0)
+    Display.add_render_proxy(proxy)
+    Display.add_render_proxy(make_proxy(100.0, 100.0))
+    Display.render_frame(1.0)
+    assert Display._update_rects is None  # The first frame is drawn in full
+
+    Display.render_frame(1.0)
+    assert Display._update_rects == []
+
+    proxy.set_position(Vec2(12.0, 10.0))
+    Display.render_frame(1.0)
+    assert Display._update_rects == [pygame.Rect(10, 10, 6, 4)]
+
+
+def test_invalidated_rects_are_redrawn(engine):
+    Display.set_render_mode(RenderMode.DIRTY_RECTS)
+    Display.render_frame(1.0)
+    Display.invalidate_rect(pygame.Rect(0, 0, 8, 8))
+    Display.render_frame(1.0)
+    assert Display._update_rects == [pygame.Rect(0, 0, 8, 8)]
@@ -0,0 +1,140 @@
+import time
+import pygame
+import pytest
+
+from engine.time import Time
+from engine.events import EventHook
+from engine.physics import Physics
+from engine.entity import Entity, EntitySpawner
+from engine.input import Input, InputEventType, _compile_bindings
+
+ACTION_MAPPINGS = {"jump": ["K_SPACE", "K_UP"], "up": ["K_UP", "K_w"], "left": ["K_LEFT"]}
+AXIS_MAPPINGS = {"horizontal": {"acceleration": 10, "deceleration": 5, "positive": ["K_RIGHT"], "negative": ["K_LEFT"]}}
+
+
+@pytest.fixture
+def bindings(engine, monkeypatch):
+    """Use the test bindings, with the pressed keys read from the returned list instead of the keyboard"""
+    key_table, action_bindings, axis_bindings = _compile_bindings(ACTION_MAPPINGS, AXIS_MAPPINGS)
+    monkeypatch.setattr(Input, "_key_table", key_table)
+    monkeypatch.setattr(Input, "_action_bindings", action_bindings)
+    monkeypatch.setattr(Input, "_axis_bindings", axis_bindings)
+    monkeypatch.setattr(Input, "_axis_values", {"horizontal": 0.0})
+    monkeypatch.setattr(Input, "_pressed_keys_mask", 0)
+    pressed_key_names: list[str] = list()
+    monkeypatch.setattr(Input, "_read_pressed_keys_mask", staticmethod(lambda: key_table.get_mask(pressed_key_names)))
+    return pressed_key_names
+
+
+def record_input_events(monkeypatch) -> list[tuple[str, InputEventType]]:
+    input_events: list[tuple[str, InputEventType]] = list()
+    monkeypatch.setattr(Input, "on_input_event", EventHook())
+    Input.on_input_event += lambda input_event: input_events.append((input_event.name, input_event.type))
+    return input_events
+
+
+def test_key_table_assigns_one_bit_per_key():
+    key_table, action_bindings, _ = _compile_bindings(ACTION_MAPPINGS, AXIS_MAPPINGS)
+    assert key_table.key_codes == [pygame.K_SPACE, pygame.K_UP, pygame.K_w, pygame.K_LEFT, pygame.K_RIGHT]
+    assert key_table.bits == [1, 2, 4, 8, 16]
+    assert key_table.get_bit("K_UP") == 2
+    assert [action.mask for action in action_bindings] == [1 | 2, 2 | 4, 8]
+
+
+def test_key_shared_by_two_actions_has_a_single_bit():
+    key_table, action_bindings, _ = _compile_bindings(ACTION_MAPPINGS, AXIS_MAPPINGS)
+    jump, up, _ = action_bindings
+    up_bit = key_table.get_bit("K_UP")
+    assert jump.mask & up.mask == up_bit
+    assert key_table.key_codes.count(pygame.K_UP) == 1
+
+
+def test_axis_masks_share_the_bits_of_the_actions():
+    key_table, action_bindings, axis_bindings = _compile_bindings(ACTION_MAPPINGS, AXIS_MAPPINGS)
+    axis = axis_bindings[0]
+    assert (axis.name, axis.acceleration, axis.deceleration) == ("horizontal", 10, 5)
+    assert axis.positive_mask == key_table.get_bit("K_RIGHT")
+    assert axis.negative_mask == action_bindings[2].mask
+
+
+def test_unknown_key_name_raises():
+    with pytest.raises(ValueError):
+        _compile_bindings({"jump": ["K_NOT_A_KEY"]}, dict())
+
+
+def test_pressed_and_released_are_dispatched_on_changes(bindings, monkeypatch):
+    input_events = record_input_events(monkeypatch)
+    bindings.append("K_SPACE")
+    Input._tick(0.01)
+    Input._tick(0.01)
+    bindings.clear()
+    Input._tick(0.01)
+    assert input_events == [("jump", InputEventType.PRESSED), ("jump", InputEventType.RELEASED)]
+
+
+def test_key_shared_by_two_actions_dispatches_both(bindings, monkeypatch):
+    input_events = record_input_events(monkeypatch)
+    bindings.append("K_UP")
+    Input._tick(0.01)
+    assert sorted(input_events) == [("jump", InputEventType.PRESSED), ("up", InputEventType.PRESSED)]
+
+
+def test_axis_accelerates_towards_the_pressed_direction(bindings, monkeypatch):
+    input_events = record_input_events(monkeypatch)
+    bindings.append("K_LEFT")
+    Input._tick(0.05)
+    assert Input.get_axis_value("horizontal") == pytest.approx(-0.5)
+    assert ("horizontal", InputEventType.AXIS) in input_events
+
+    bindings.clear()
+    Input._tick(0.05)
+    assert Input.get_axis_value("horizontal") == pytest.approx(-0.25)
+    Input._tick(1.0)
+    assert Input.get_axis_value("horizontal") == 0.0
+
+
+class TickCounterEntity(Entity):
+    def __init__(self, priority: int = 0):
+        super().__init__(priority)
+        self._is_ticking = True
+        self.physics_tick_count = 0
+
+    def _physics_tick(self, fixed_delta_time: float):
+        super()._physics_tick(fixed_delta_time)
+        self.physics_tick_count += 1
+
+
+@pytest.fixture
+def event_driven(bindings, monkeypatch):
+    monkeypatch.setattr(Input, "event_driven", True)
+    Input._queued_key_events.clear()
+    yield
+    Input._queued_key_events.clear()
+
+
+def test_key_presses_shorter_than_a_frame_are_not_lost(event_driven, monkeypatch):
+    input_events = record_input_events(monkeypatch)
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE))
+    Input._poll_events()
+    Input._dispatch_queued_events(time.perf_counter())
+    assert input_events == [("jump", InputEventType.PRESSED), ("jump", InputEventType.RELEASED)]
+    assert Input._pressed_keys_mask == 0
+
+
+def test_events_taken_after_the_frame_start_fall_into_the_last_tick(event_driven, monkeypatch):
+    counter = EntitySpawner.spawn_entity(TickCounterEntity)
+    EntitySpawner._resolve_entity_spawn_requests()
+    pressed_at_ticks: list[int] = list()
+    monkeypatch.setattr(Input, "on_input_event", EventHook())
+    Input.on_input_event += lambda input_event: pressed_at_ticks.append(counter.physics_tick_count) if input_event.type == InputEventType.PRESSED else None
+
+    Time._frame_timestamp = time.perf_counter()
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    Input._poll_events()
+    monkeypatch.setattr(Physics, "_accumulator", 0.0)
+    Physics._tick(EntitySpawner.get_tickable_entities(), Physics.fixed_delta_time * 3.5)
+
+    assert Physics.get_substep_count() == 3
+    assert pressed_at_ticks == [2]
+    assert Input._pressed_keys_mask == Input._key_table.get_bit("K_SPACE")
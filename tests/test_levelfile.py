@@ -0,0 +1,67 @@
+import os
+import pathlib
+
+import numpy as np
+import pytest
+
+from engine import levelfile
+from engine.graphics import Graphics
+from engine.tilemap import Tilemap
+
+MAP_PATH = pathlib.Path(__file__).resolve().parents[1].joinpath("assets", "data", "maps", "0.json")
+
+
+def test_level_file_round_trip(engine, tmp_path):
+    tilemap = Tilemap.load(MAP_PATH)
+    level_path = tmp_path.joinpath("0.lvl")
+    levelfile.write_level_file(tilemap, level_path, source_mtime_ns=1234)
+    loaded = levelfile.read_level_file(level_path)
+
+    assert (loaded.tile_size, loaded.origin, loaded.width, loaded.height) == \
+        (tilemap.tile_size, tilemap.origin, tilemap.width, tilemap.height)
+    assert loaded.tile_types[:len(tilemap.tile_types)] == tilemap.tile_types
+    np.testing.assert_array_equal(loaded.get_type_grid(), tilemap.get_type_grid())
+    np.testing.assert_array_equal(loaded.get_variant_grid(), tilemap.get_variant_grid())
+    assert len(loaded.offgrid) == len(tilemap.offgrid)
+    for loaded_tile, tile in zip(loaded.offgrid, tilemap.offgrid):
+        assert (loaded_tile.type, loaded_tile.variant) == (tile.type, tile.variant)
+        assert loaded_tile.position.x == pytest.approx(tile.position.x)
+        assert loaded_tile.position.y == pytest.approx(tile.position.y)
+    assert levelfile.read_source_mtime(level_path) == 1234
+
+
+def test_loaded_grids_are_read_only_views(engine, tmp_path):
+    level_path = tmp_path.joinpath("0.lvl")
+    levelfile.write_level_file(Tilemap.load(MAP_PATH), level_path)
+    grid = levelfile.read_level_file(level_path).get_type_grid()
+    assert not grid.flags.writeable
+
+
+def test_reading_a_file_of_another_format_raises(engine, tmp_path):
+    path = tmp_path.joinpath("bogus.lvl")
+    path.write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        levelfile.read_level_file(path)
+    assert levelfile.read_source_mtime(path) is None
+
+
+def test_load_tilemap_reconverts_stale_level_files(engine, tmp_path):
+    json_path = tmp_path.joinpath("0.json")
+    json_path.write_bytes(MAP_PATH.read_bytes())
+    cache_dir = tmp_path.joinpath("cache")
+    levelfile.load_tilemap(json_path, cache_dir)
+    level_path = cache_dir.joinpath("0" + levelfile.LEVEL_FILE_EXTENSION)
+    assert levelfile.read_source_mtime(level_path) == json_path.stat().st_mtime_ns
+
+    mtime_ns = json_path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(json_path, ns=(mtime_ns, mtime_ns))
+    levelfile.load_tilemap(json_path, cache_dir)
+    assert levelfile.read_source_mtime(level_path) == mtime_ns
+
+
+def test_conversion_does_not_use_the_graphics_scale(engine, tmp_path, monkeypatch):
+    monkeypatch.delattr(Graphics, "scale")  # Neither read nor written, so conversions can run on any thread
+    levelfile.convert_json_map(MAP_PATH, tmp_path.joinpath("0.lvl"))
+    tilemap = levelfile.read_level_file(tmp_path.joinpath("0.lvl"), scale=2.0)
+    assert not hasattr(Graphics, "scale")
+    assert tilemap.cell_size == tilemap.tile_size * 2.0
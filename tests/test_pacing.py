@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from conftest import step
+from engine.physics import Physics
+from engine.pacing import FramePacer, PacingMode
+
+
+def init_pacer(mode: PacingMode = PacingMode.PRECISE, fps: int = 200):
+    FramePacer.init(mode, fps, spin_threshold=0.002, stats_window=60)
+
+
+def test_precise_mode_waits_for_the_deadline(engine):
+    init_pacer()
+    start_time = time.perf_counter()
+    for _ in range(10):
+        FramePacer._wait()
+    assert time.perf_counter() - start_time >= 10 * 0.005 - 0.001
+    stats = FramePacer.get_stats()
+    assert stats.frames == 10
+    assert stats.mean_frame_time == pytest.approx(0.005, abs=0.002)
+
+
+def test_late_frames_restart_the_schedule(engine):
+    init_pacer()
+    FramePacer._wait()
+    late_frames = FramePacer.get_stats().late_frames
+    time.sleep(0.02)  # Miss the next deadline by more than a frame
+    FramePacer._wait()
+    assert FramePacer.get_stats().late_frames == late_frames + 1
+
+    # The next frame is paced from the late one, not rushed to catch up
+    start_time = time.perf_counter()
+    FramePacer._wait()
+    assert time.perf_counter() - start_time >= 0.004
+
+
+def test_physics_drops_the_steps_over_the_substep_limit(engine):
+    init_pacer()
+    dropped_step_count = Physics.get_dropped_step_count()
+    step(delta_time=(Physics.max_substeps + 3.5) * Physics.fixed_delta_time)
+    assert Physics.get_substep_count() == Physics.max_substeps
+    assert Physics.get_dropped_step_count() == dropped_step_count + 3
+    assert FramePacer.get_stats().dropped_steps == 3
+    if Physics.interpolation:
+        assert Physics.get_interpolation_fraction() == pytest.approx(0.5)
@@ -0,0 +1,38 @@
+import pygame
+
+from engine.math import Vec2
+from engine.graphics import Display
+from engine.parallax import ParallaxLayer
+from engine.components import ParallaxComponent
+from engine.entity import EntitySpawner, Entity
+
+
+def test_fixed_layer_uses_the_image_as_is(engine):
+    image = pygame.Surface(Display.get_surface().get_size())
+    layer = ParallaxLayer(image, depth=0.0, repeat_x=False, repeat_y=False)
+    assert layer._build_strip(Display.get_surface().get_size()) is image
+
+
+def test_repeated_strip_covers_the_screen_at_any_scroll(engine):
+    image = pygame.Surface((100, 50))
+    layer = ParallaxLayer(image, depth=0.5)
+    screen_width = Display.get_surface().get_width()
+    strip = layer._build_strip(Display.get_surface().get_size())
+    assert strip.get_height() == 50
+    for camera_x in (0.0, 37.0, -512.0, 10000.0):
+        x, _ = layer._get_screen_position(Vec2(camera_x, 0.0), 0.0)
+        assert -100 <= x <= 0
+        assert x + strip.get_width() >= screen_width
+
+
+def test_layers_scroll_with_the_rounded_camera_offset(engine):
+    entity = Entity()
+    component = entity.add_component(ParallaxComponent([ParallaxLayer(pygame.Surface((100, 50)), depth=1.0)]))
+    EntitySpawner._entity_spawn_requests.add(entity)
+    EntitySpawner._resolve_entity_spawn_requests()
+
+    camera = Display.get_camera()
+    camera.set_position(Vec2(10.6, 0.0))
+    component._render_tick(0.0)
+    assert component._screen_positions[0][0] == -11
+    assert camera.get_offset() == (11, 0)
@@ -0,0 +1,50 @@
+import pygame
+import pytest
+
+from engine.math import Vec2
+from engine.particles import ParticleEmitter
+
+
+def make_emitter(capacity: int = 1024) -> ParticleEmitter:
+    return ParticleEmitter([pygame.Surface((2, 2))], capacity=capacity, lifetime=(10.0, 10.0), seed=0)
+
+
+@pytest.mark.parametrize("frame_rate", [30, 60, 144])
+def test_spawn_rate_does_not_depend_on_the_frame_rate(engine, frame_rate):
+    emitter = make_emitter()
+    emitter.set_spawn_rects((pygame.FRect(0.0, 0.0, 8.0, 8.0),), 240.0, Vec2.zero())
+    for _ in range(frame_rate):
+        emitter._update(1.0 / frame_rate)
+    assert emitter.get_count() == pytest.approx(240, abs=1)
+
+
+def test_spawned_particles_are_inside_the_rects(engine):
+    emitter = make_emitter()
+    emitter.set_spawn_rects((pygame.FRect(10.0, 20.0, 4.0, 6.0),), 100.0, Vec2.zero())
+    emitter._update(0.5)
+    positions = emitter._positions[:emitter.get_count()]
+    assert ((positions[:, 0] >= 10.0) & (positions[:, 0] <= 14.0)).all()
+    assert ((positions[:, 1] >= 20.0) & (positions[:, 1] <= 26.0)).all()
+
+
+def test_emission_stops_when_the_rects_are_cleared(engine):
+    emitter = make_emitter()
+    emitter.set_spawn_rects((pygame.FRect(0.0, 0.0, 8.0, 8.0),), 100.0, Vec2.zero())
+    emitter._update(0.1)
+    count = emitter.get_count()
+    emitter.set_spawn_rects((), 0.0, Vec2.zero())
+    emitter._update(0.1)
+    assert emitter.get_count() == count
+
+
+def test_emit_is_limited_by_the_capacity(engine):
+    emitter = make_emitter(capacity=8)
+    assert emitter.emit(10, Vec2(0.0, 0.0), Vec2.zero()) == 8
+    assert emitter.get_dropped_count() == 2
+
+
+def test_dead_particles_are_compacted(engine):
+    emitter = ParticleEmitter([pygame.Surface((2, 2))], capacity=16, lifetime=(0.1, 0.1), seed=0)
+    emitter.emit(4, Vec2(0.0, 0.0), Vec2.zero())
+    emitter._update(0.2)
+    assert emitter.get_count() == 0
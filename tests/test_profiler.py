@@ -0,0 +1,49 @@
+import json
+
+from engine.gameloop import GameLoop
+from engine.profiler import Profiler, ProfilerPhase
+
+
+def test_ring_buffer_keeps_the_last_frames_in_order(engine):
+    Profiler.init(True, 4, False)
+    GameLoop.run(max_frames=6)
+
+    frames = Profiler.get_frames()
+    assert [record.frame for record in frames] == [2, 3, 4, 5]
+    start_times = [record.start_time for record in frames]
+    assert start_times == sorted(start_times)
+
+
+def test_unfinished_frame_is_not_recorded(engine):
+    Profiler.init(True, 4, False)
+    for _ in range(5):
+        Profiler._begin_frame()
+        Profiler._mark(ProfilerPhase.EVENTS)
+        Profiler._end_frame(1)
+    Profiler._begin_frame()  # The loop stops before the frame ends
+
+    assert [record.frame for record in Profiler.get_frames()] == [1, 2, 3, 4]
+
+
+def test_chrome_trace_export(engine, tmp_path):
+    Profiler.init(True, 8, False)
+    GameLoop.run(max_frames=3)
+
+    path = tmp_path / "trace.json"
+    Profiler.export_chrome_trace(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    frame_names = [event["name"] for event in events if event["name"].startswith("frame ")]
+    assert frame_names == ["frame 0", "frame 1", "frame 2"]
+    phase_names = [event["name"] for event in events[1:1 + len(ProfilerPhase)]]
+    assert phase_names == [phase.name.lower() for phase in ProfilerPhase]
+    assert phase_names[ProfilerPhase.RENDER_TICK] == "render_tick"
+
+
+def test_json_export_names_the_phases(engine, tmp_path):
+    Profiler.init(True, 8, False)
+    GameLoop.run(max_frames=2)
+
+    path = tmp_path / "frames.json"
+    Profiler.export_json(path)
+    frames = json.loads(path.read_text())
+    assert list(frames[0]["phases"]) == ["events", "time", "spawn", "input", "tick", "physics", "render_tick", "render", "present"]
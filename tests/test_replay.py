@@ -0,0 +1,84 @@
+import time
+import pytest
+
+from engine.gameloop import GameLoop
+from engine.input import Input
+from engine.replay import Replay, ReplayMode
+from engine.streaming import Streaming
+
+
+def test_round_trip(engine, tmp_path):
+    path = tmp_path / "session.replay"
+    key_names = Input.get_key_names()
+    masks = [0, 1, 1, 3, (1 << (len(key_names) - 1)), 0]
+    delta_times = [1.0 / 60.0, 0.02, 0.0125, 1.0 / 30.0, 0.016, 0.017]
+
+    Replay.start_recording(key_names)
+    for delta_time, mask in zip(delta_times, masks):
+        Replay._end_frame(delta_time, mask)
+    Replay.stop_recording(path)
+    assert Replay.get_mode() == ReplayMode.NONE
+
+    Replay.start_playback(path, key_names)
+    assert Replay.get_frame_count() == len(masks)
+    played_delta_times: list[float] = list()
+    played_masks: list[int] = list()
+    while not Replay.is_finished():
+        played_delta_times.append(Replay._get_delta_time())
+        played_masks.append(Replay._get_pressed_keys_mask())
+        Replay._end_frame(played_delta_times[-1], played_masks[-1])
+    assert played_delta_times == delta_times
+    assert played_masks == masks
+    Replay._mode = ReplayMode.NONE
+
+
+def test_playback_requires_the_same_key_bindings(engine, tmp_path):
+    path = tmp_path / "session.replay"
+    Replay.start_recording(["K_a", "K_b"])
+    Replay._end_frame(0.016, 1)
+    Replay.stop_recording(path)
+    with pytest.raises(ValueError):
+        Replay.start_playback(path, ["K_b", "K_a"])
+
+
+def test_recording_refuses_event_driven_input(engine):
+    Input.event_driven = True
+    with pytest.raises(RuntimeError):
+        Replay.start_recording(Input.get_key_names())
+    assert Replay.get_mode() == ReplayMode.NONE
+
+
+def test_playback_feeds_the_recorded_keys(engine, tmp_path):
+    path = tmp_path / "session.replay"
+    key_names = Input.get_key_names()
+    masks = [0, 2, 2, 6, 0]
+    Replay.start_recording(key_names)
+    for mask in masks:
+        Replay._end_frame(0.016, mask)
+    Replay.stop_recording(path)
+
+    # The stop predicate runs at the start of each frame, so it sees the keys of the previous frame
+    played_masks: list[int] = list()
+
+    def record_pressed_keys() -> bool:
+        played_masks.append(Input.get_pressed_keys_mask())
+        return False
+
+    Replay.start_playback(path, key_names)
+    GameLoop.run(stop_predicate=record_pressed_keys)
+    assert played_masks[1:] == masks
+    Replay._mode = ReplayMode.NONE
+
+
+def test_loads_are_handed_over_on_the_next_frame_while_replaying(engine):
+    loaded: list[int] = list()
+
+    def load():
+        time.sleep(0.05)
+        return 42
+
+    Streaming.load_async(load, loaded.append)
+    Streaming._tick()
+    assert loaded == []
+    Streaming._tick(wait_for_loads=True)
+    assert loaded == [42]
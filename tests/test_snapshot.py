@@ -0,0 +1,49 @@
+from conftest import step
+from engine.math import Vec2
+from engine.input import Input, InputEventType
+from engine.entity import Entity, EntitySpawner
+from engine.components import RigidBodyComponent
+from engine.snapshot import Snapshot
+
+
+class BodyEntity(Entity):
+    def __init__(self, priority: int = 0):
+        super().__init__(priority)
+        self._is_ticking = True
+        self.body = self.add_component(RigidBodyComponent(Vec2(8, 8)))
+
+
+def test_restore_rolls_back_bodies(engine):
+    entity = EntitySpawner.spawn_entity(BodyEntity)
+    entity.body.set_velocity(Vec2(60.0, 0.0))
+    step()
+
+    snapshot = Snapshot()
+    snapshot.save()
+    saved_position = entity.get_transform().get_position().copy()
+    step(10)
+    assert entity.get_transform().get_position() != saved_position
+
+    snapshot.restore()
+    assert entity.get_transform().get_position() == saved_position
+    assert entity.body.get_velocity() == Vec2(60.0, 0.0)
+
+
+def test_restore_keeps_pressed_keys(engine):
+    quick_load_mask = 1 << Input.get_key_names().index("K_F9")
+    snapshot = Snapshot()
+    snapshot.save()
+
+    restore_count = 0
+
+    def on_input_event(input_event):
+        nonlocal restore_count
+        if input_event.name == "quick_load" and input_event.type == InputEventType.PRESSED:
+            snapshot.restore()
+            restore_count += 1
+
+    Input.on_input_event += on_input_event
+    step(10, pressed_keys_mask=quick_load_mask)
+
+    assert restore_count == 1
+    assert Input.get_pressed_keys_mask() == quick_load_mask
@@ -0,0 +1,72 @@
+import threading
+
+from conftest import step
+from engine.entity import Entity, EntitySpawner
+from engine.streaming import Streaming
+
+
+def wait_for_loads():
+    Streaming._tick(wait_for_loads=True)
+
+
+def test_results_are_handed_over_in_submission_order(engine):
+    loaded: list[int] = list()
+    for value in range(4):
+        Streaming.load_async(lambda value=value: value, loaded.append)
+    wait_for_loads()
+    assert loaded == [0, 1, 2, 3]
+    assert Streaming.is_idle()
+    assert Streaming.get_stats().completed_loads == 4
+
+
+def test_failed_load_is_done_and_reported(engine):
+    failures: list[BaseException] = list()
+
+    def load():
+        raise OSError("missing level")
+
+    request = Streaming.load_async(load, on_failed=failures.append)
+    wait_for_loads()
+    assert request.is_done()
+    assert request.is_failed()
+    assert isinstance(failures[0], OSError)
+    assert Streaming.get_stats().failed_loads == 1
+
+
+def test_failed_load_without_handler_does_not_raise(engine, capsys):
+    def load():
+        raise OSError("missing level")
+
+    request = Streaming.load_async(load, lambda result: None)
+    wait_for_loads()
+    assert request.is_done()
+    assert "missing level" in capsys.readouterr().err
+
+
+def test_cancelled_load_is_done(engine):
+    Streaming._shutdown()
+    Streaming.init(spawn_budget=4, worker_count=1)
+    release = threading.Event()
+    Streaming.load_async(release.wait)  # Keeps the worker busy
+    loaded: list[int] = list()
+    request = Streaming.load_async(lambda: 1, loaded.append)
+    assert request.cancel()
+    release.set()
+    wait_for_loads()
+    assert request.is_done()
+    assert not request.is_failed()
+    assert loaded == []
+
+
+def test_streamed_entities_enter_play_within_the_spawn_budget(engine):
+    Streaming.spawn_budget = 2
+    entities = [Entity() for _ in range(5)]
+    for entity in entities:
+        Streaming.add_entity(entity)
+
+    in_play_counts: list[int] = list()
+    for _ in range(3):
+        step()
+        in_play_counts.append(sum(entity.is_in_play() for entity in entities))
+    assert in_play_counts == [2, 4, 5]
+    assert list(EntitySpawner.get_entities()) == entities
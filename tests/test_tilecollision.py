@@ -0,0 +1,79 @@
+from engine.math import Vec2
+from engine.time import Time
+from engine.physics import Physics
+from engine.tilemap import Tilemap
+from engine.entity import Entity, EntitySpawner
+from engine.components import RigidBodyComponent, TileColliderComponent
+from engine.tilecollision import TileCollision, TileContact
+
+
+def make_tilemap(solid_cells: list[tuple[int, int]]) -> Tilemap:
+    tiles = {f"{x};{y}": {"type": "grass", "variant": 0, "pos": [x, y]} for x, y in solid_cells}
+    return Tilemap.from_dict({"tilemap": tiles, "tile_size": 16, "offgrid": []})
+
+
+class BodyEntity(Entity):
+    def __init__(self, priority: int = 0):
+        super().__init__(priority)
+        self._is_ticking = True
+        self.body = self.add_component(RigidBodyComponent(Vec2(8, 8), collides_with_tiles=True))
+
+
+def test_move_stops_at_wall(engine):
+    tilemap = make_tilemap([(0, 0), (4, 0)])
+    TileCollision.set_tilemap(tilemap, ["grass"])
+    cell_size = tilemap.cell_size
+
+    dx, dy, contacts = TileCollision._move(cell_size, 0.0, 8.0, 8.0, cell_size * 10.0, 0.0)
+    assert dx == cell_size * 4.0 - (cell_size + 8.0)
+    assert dy == 0.0
+    assert contacts == TileContact.WALL_RIGHT
+
+    dx, _, contacts = TileCollision._move(cell_size * 2.0, 0.0, 8.0, 8.0, -cell_size * 10.0, 0.0)
+    assert dx == -cell_size
+    assert contacts == TileContact.WALL_LEFT
+
+
+def test_move_lands_on_ground(engine):
+    tilemap = make_tilemap([(x, 2) for x in range(4)])
+    TileCollision.set_tilemap(tilemap, ["grass"])
+    cell_size = tilemap.cell_size
+
+    _, dy, contacts = TileCollision._move(cell_size, 0.0, 8.0, 8.0, 0.0, cell_size * 5.0)
+    assert dy == cell_size * 2.0 - 8.0
+    assert contacts == TileContact.GROUND
+
+    # Resting on the ground is still a contact, and sliding along it is not blocked
+    dx, dy, contacts = TileCollision._move(cell_size, cell_size * 2.0 - 8.0, 8.0, 8.0, 4.0, 1.0)
+    assert (dx, dy) == (4.0, 0.0)
+    assert contacts == TileContact.GROUND
+
+
+def test_move_ignores_cells_outside_of_the_tilemap_and_non_solid_types(engine):
+    tilemap = make_tilemap([(0, 0)])
+    TileCollision.set_tilemap(tilemap, ["stone"])
+    assert TileCollision._move(0.0, 0.0, 8.0, 8.0, 100.0, 100.0) == (100.0, 100.0, TileContact.NONE)
+    assert not TileCollision.is_solid(-1, 0)
+
+
+def test_contacts_are_kept_over_the_ticks_of_a_frame(engine):
+    tilemap = make_tilemap([(3, 0)])
+    entity = EntitySpawner.spawn_entity(BodyEntity)
+    entity.add_component(TileColliderComponent(tilemap, ["grass"]))
+    EntitySpawner._resolve_entity_spawn_requests()
+    entity.get_transform().teleport(Vec2(tilemap.cell_size * 3.0 - 9.0, 0.0))
+    entity.body.set_velocity(Vec2(4.0 / Physics.fixed_delta_time, 0.0))  # 4 units per tick
+
+    # The first tick hits the wall, and the later ticks do not move
+    Time.set_time_scale(1.0)
+    Physics._accumulator = 0.0
+    Physics._tick(EntitySpawner.get_tickable_entities(), Physics.fixed_delta_time * 3.0)
+    assert Physics.get_substep_count() == 3
+    assert entity.body.get_tile_contacts() == TileContact.WALL_RIGHT
+    assert entity.body.get_velocity().x == 0.0
+
+    # The next frame that ticks starts over
+    Physics._accumulator = 0.0
+    Physics._tick(EntitySpawner.get_tickable_entities(), Physics.fixed_delta_time)
+    assert Physics.get_substep_count() == 1
+    assert entity.body.get_tile_contacts() == TileContact.NONE
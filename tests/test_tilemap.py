@@ -0,0 +1,57 @@
+import pygame
+
+from engine.math import Vec2
+from engine.graphics import Display, Graphics
+from engine.tilemap import Tilemap, CHUNK_SIZE
+
+
+def make_map_data() -> dict:
+    tiles = {f"{x};{y}": {"type": "grass", "variant": x % 2, "pos": [x, y]} for x in range(-2, 10) for y in (3, 4)}
+    tiles["0;0"] = {"type": "stone", "variant": 1, "pos": [0, 0]}
+    offgrid = [{"type": "decor", "variant": 0, "pos": [5.0, 6.0]}]
+    return {"tilemap": tiles, "tile_size": 16, "offgrid": offgrid}
+
+
+def make_tile_images() -> dict[str, list[pygame.Surface]]:
+    size = int(16 * Graphics.scale)
+    return {tile_type: [pygame.Surface((size, size)), pygame.Surface((size, size))] for tile_type in ("grass", "stone", "decor")}
+
+
+def test_from_dict_stores_the_tiles_in_dense_grids(engine):
+    tilemap = Tilemap.from_dict(make_map_data())
+    assert tilemap.origin == (-2, 0)
+    assert (tilemap.width, tilemap.height) == (12, 5)
+    assert tilemap.get_tile(0, 0) == ("stone", 1)
+    assert tilemap.get_tile(-1, 3) == ("grass", 1)
+    assert tilemap.get_tile(0, 1) is None
+    assert tilemap.get_tile(100, 100) is None
+    assert tilemap.get_type_grid().shape == (5, 12)
+    assert tilemap.offgrid[0].position == Vec2(5.0, 6.0) * Graphics.scale
+
+
+def test_world_rect_and_tile_coordinates(engine):
+    tilemap = Tilemap.from_dict(make_map_data())
+    cell_size = tilemap.cell_size
+    assert tilemap.get_world_rect() == pygame.Rect(-2 * cell_size, 0, 12 * cell_size, 5 * cell_size)
+    assert tilemap.world_to_tile(Vec2(-0.5 * cell_size, 3.5 * cell_size)) == (-1, 3)
+
+
+def test_bake_only_creates_chunks_with_tiles(engine):
+    tilemap = Tilemap.from_dict(make_map_data())
+    tilemap.bake(make_tile_images())
+    chunks_x = (tilemap.width + CHUNK_SIZE - 1) // CHUNK_SIZE
+    assert len(tilemap._chunks) == chunks_x  # The grid is a single chunk tall
+    assert len(tilemap._offgrid_render_proxies) == 1
+
+
+def test_rebake_keeps_the_proxies_registered(engine):
+    tilemap = Tilemap.from_dict(make_map_data())
+    tilemap.bake(make_tile_images())
+    tilemap._add_render_proxies("default", "default")
+    count = Display.get_render_proxy_count()
+    tilemap.bake(make_tile_images())
+    assert Display.get_render_proxy_count() == count
+    assert all(proxy.is_registered() for proxy in tilemap._chunks.values())
+
+    tilemap._remove_render_proxies()
+    assert Display.get_render_proxy_count() == count - len(tilemap._chunks) - 1